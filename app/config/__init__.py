@@ -0,0 +1 @@
+""" 애플리케이션 공통 설정 """
@@ -0,0 +1,11 @@
+# app_path.py
+
+import os
+from pathlib import Path
+
+# 프로젝트 루트 (app 폴더의 상위)
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+
+# 💡 데이터 루트 (note: git 저장소, index: Whoosh, db: SQLite, run: 워커 락/큐)
+# 부하 테스트 등 격리 실행 시 NOTE_DATA_DIR 환경 변수로 통째로 바꿀 수 있습니다.
+DATA_DIR = Path(os.getenv("NOTE_DATA_DIR") or BASE_DIR / "data")
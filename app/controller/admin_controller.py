@@ -0,0 +1,106 @@
+import hmac
+import os
+from typing import Literal, Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, status
+from pydantic import BaseModel, Field
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database.note_mng.connection import get_db
+from app.middleware.request_timing_middleware import PROFILE_HEADER, PROFILE_TOKEN_ENV
+from app.service.admission.admission_control import admission_control
+from app.service.job_queue.note_job_queue import NoteJobQueue
+from app.service.git_manage_service.git_shard_router import ROOT_SHARD
+from app.service.job_queue.note_job_worker import note_job_worker
+from app.service.lang_analyzer.search_manager import NoteSearchManager, ANALYZER_VERSIONS
+from app.service.maintenance.storage_maintenance import storage_maintenance
+from app.service.metrics.request_tracer import run_in_executor
+from app.spec.constant.ModelEnums import JobStatusEnum
+
+router = APIRouter(prefix="/admin", tags=["admin"])
+
+
+def require_admin_token(token: Optional[str] = Header(default=None, alias=PROFILE_HEADER)):
+    """ 상태를 바꾸는 관리자 API 는 프로파일러와 같은 토큰(NOTE_PROFILE_TOKEN)을 헤더로 보낸 요청만 허용 (토큰 미설정 시 거부) """
+    expected = os.getenv(PROFILE_TOKEN_ENV)
+    if not expected or not hmac.compare_digest((token or "").encode(), expected.encode()):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin token required")
+
+
+@router.get("/storage")
+async def get_storage_stats():
+    """ git 저장소(샤드별) object/pack 통계, 검색 색인 세그먼트 수, 마지막 유지보수 결과 """
+    return await run_in_executor(storage_maintenance.collect_stats)
+
+
+@router.post("/storage/maintenance", status_code=status.HTTP_202_ACCEPTED,
+             dependencies=[Depends(require_admin_token)])
+async def request_storage_maintenance():
+    """ 시간대와 무관하게 리더의 다음 유지보수 주기에 실행 요청 (쓰기가 몰리는 중이면 미룸) """
+    storage_maintenance.request_run()
+    return {"status": "accepted"}
+
+
+@router.get("/jobs")
+async def get_jobs(job_status: JobStatusEnum | None = Query(default=None, alias="status"),
+                   limit: int = Query(default=100, ge=1, le=1000), db: AsyncSession = Depends(get_db)):
+    """ 커밋 이후 작업 큐: 종류/상태별 건수와 최근 작업 목록 (status=FAILED 로 실패 작업만) """
+    queue = NoteJobQueue(db)
+    return {"summary": await queue.summary(), "items": await queue.list_jobs(job_status, limit)}
+
+
+@router.post("/jobs/{job_id}/retry", dependencies=[Depends(require_admin_token)])
+async def retry_job(job_id: int, db: AsyncSession = Depends(get_db)):
+    """ FAILED 작업을 다시 대기 상태로 """
+    if not await NoteJobQueue(db).retry(job_id):
+        raise HTTPException(status_code=404, detail=f"Failed job not found: {job_id}")
+    note_job_worker.notify()
+    return {"status": "accepted", "id": job_id}
+
+
+@router.get("/search/partitions")
+async def get_search_partitions():
+    """ 검색 색인 분석기 모드와 파티션별 문서 수/세그먼트 수/재색인 여부 (파티션을 끄면 단일 색인 하나) """
+
+    def collect():
+        manager = NoteSearchManager()
+        return {"partitioned": manager.partitioned,
+                "analyzer": f"{manager.analyzer}-v{ANALYZER_VERSIONS[manager.analyzer]}",
+                "items": [{"namespace": partition.namespace, "name": partition.label,
+                           "doc_count": partition.ix.doc_count(), "segments": partition.segment_count(),
+                           "rebuilding": partition.rebuilding} for partition in manager.partitions()]}
+
+    return await run_in_executor(collect)
+
+
+@router.post("/search/partitions/{namespace}/rebuild", status_code=status.HTTP_202_ACCEPTED,
+             dependencies=[Depends(require_admin_token)])
+async def rebuild_search_partition(namespace: str):
+    """ 한 네임스페이스(최상위 폴더)의 색인 파티션만 저장소 파일로 다시 만든다. 루트 노트는 '(root)' (리더가 백그라운드로 실행) """
+    manager = NoteSearchManager()
+    if not manager.partitioned:
+        raise HTTPException(status_code=409, detail="검색 색인 파티션이 꺼져 있습니다. (NOTE_SEARCH_PARTITIONS=1)")
+    manager.request_rebuild(ROOT_SHARD if namespace == "(root)" else namespace)
+    return {"status": "accepted", "namespace": namespace}
+
+
+class AdmissionLimitUpdate(BaseModel):
+    max_concurrent: Optional[int] = Field(default=None, ge=1)
+    max_queue: Optional[int] = Field(default=None, ge=0)
+    queue_timeout: Optional[float] = Field(default=None, ge=0)
+
+
+@router.get("/admission")
+async def get_admission():
+    """ 엔드포인트 종류별 제한값과 이 워커의 실행/대기 중인 요청 수 """
+    return admission_control.snapshot()
+
+
+@router.put("/admission/{endpoint_class}", dependencies=[Depends(require_admin_token)])
+async def update_admission(endpoint_class: Literal["write", "search", "history", "read"],
+                           request: AdmissionLimitUpdate):
+    """ 제한값 변경 (모든 워커에 1초 안에 반영) """
+    return admission_control.update(endpoint_class, **request.model_dump())
+
+
+admin_controller = router
@@ -0,0 +1,15 @@
+from fastapi import APIRouter, Response
+
+from app.service.metrics.note_metrics import render_metrics
+
+router = APIRouter(tags=["metrics"])
+
+
+@router.get("/metrics", include_in_schema=False)
+async def get_metrics():
+    """ Prometheus 스크랩 엔드포인트 """
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
+
+
+metrics_controller = router
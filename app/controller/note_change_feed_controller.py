@@ -0,0 +1,81 @@
+import asyncio
+import json
+from typing import List
+
+from fastapi import APIRouter, Query, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+
+from app.service.change_feed.change_feed_hub import change_feed_hub, LAGGED
+
+router = APIRouter(prefix="/notes/changes", tags=["note-change-feed"])
+
+# 연결 유지/끊김 감지를 위한 heartbeat 주기 (프록시 idle timeout 보다 짧게)
+HEARTBEAT_SECONDS = 15.0
+
+
+@router.get("/sse")
+async def stream_changes_sse(request: Request,
+                             folder: List[str] = Query(default=[], description="구독할 폴더 (없으면 전체)")):
+    """
+    Server-Sent Events 변경 피드.
+    event: note.changed (저장/가져오기/동기화 커밋 후), resync (구독자가 밀려 끊김 -> 다시 조회 후 재연결)
+    """
+
+    async def event_stream():
+        subscription = change_feed_hub.subscribe(folder)
+        try:
+            yield f"retry: 3000\n: subscribed {json.dumps(subscription.folders, ensure_ascii=False)}\n\n"
+            while not await request.is_disconnected():
+                event = await subscription.next_event(HEARTBEAT_SECONDS)
+                if event is None:
+                    yield ": heartbeat\n\n"
+                    continue
+                yield f"event: {event['event']}\ndata: {json.dumps(event, ensure_ascii=False)}\n\n"
+                if event is LAGGED:
+                    break
+        finally:
+            change_feed_hub.unsubscribe(subscription)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.websocket("/ws")
+async def stream_changes_ws(websocket: WebSocket, folder: List[str] = Query(default=[])):
+    """
+    WebSocket 변경 피드. 연결 후 {"folders": ["a/b", ...]} 를 보내면 구독 폴더를 바꿀 수 있다.
+    밀린 구독자에게는 {"event": "resync"} 를 보내고 연결을 닫는다.
+    """
+    await websocket.accept()
+    subscription = change_feed_hub.subscribe(folder)
+
+    async def receive_loop():
+        while True:
+            message = await websocket.receive_json()
+            if isinstance(message, dict) and isinstance(message.get("folders"), list):
+                subscription.set_folders([str(f) for f in message["folders"]])
+                await websocket.send_json({"event": "subscribed", "folders": subscription.folders})
+
+    receiver = asyncio.create_task(receive_loop())
+    try:
+        await websocket.send_json({"event": "subscribed", "folders": subscription.folders})
+        while not receiver.done():
+            event = await subscription.next_event(HEARTBEAT_SECONDS)
+            if event is None:
+                await websocket.send_json({"event": "ping"})
+                continue
+            await websocket.send_json(event)
+            if event is LAGGED:
+                await websocket.close(code=1013)  # Try Again Later
+                break
+    except (WebSocketDisconnect, RuntimeError):
+        pass
+    finally:
+        receiver.cancel()
+        change_feed_hub.unsubscribe(subscription)
+
+
+note_change_feed_controller = router
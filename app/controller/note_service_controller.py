@@ -1,33 +1,52 @@
-from fastapi import HTTPException, APIRouter, Depends, status, BackgroundTasks
+from typing import List, Literal
+from urllib.parse import quote, urlencode
 
-from app.exception.NoteServiceException import NoteConflictError, NoteNotFoundError, NoteFileNotFoundError
+from fastapi import HTTPException, APIRouter, Depends, status, UploadFile, File, Form, Query, \
+    Header, Response, Request
+from fastapi.responses import StreamingResponse, HTMLResponse
+
+from app.exception.NoteServiceException import NoteConflictError, NoteNotFoundError, NoteFileNotFoundError, \
+    NotePatchError, NoteServiceError, NoteRangeNotSatisfiableError, NoteImportLimitError
 from app.service.note_mng.note_mng_biz_service import NoteService, get_note_service
-from app.spec.endpoint.note_service_file_response_ivo import NoteSaveRequest
+from app.service.note_mng.note_raw_content import parse_byte_range
+from app.service.note_mng.note_title_suggester import note_title_suggester
+from app.spec.endpoint.note_batch_request_ivo import NoteBatchRequest
+from app.spec.endpoint.note_import_request_ivo import NoteImportRequest
+from app.spec.endpoint.note_json_response import NoteJSONResponse
+from app.spec.endpoint.note_service_file_response_ivo import NoteSaveRequest, NotePatchSaveRequest
 from app.spec.endpoint.note_service_file_tree_response_ivo import NoteServiceFileTreeResponseIVO
 
-router = APIRouter(prefix="/notes", tags=["note"])
+router = APIRouter(prefix="/notes", tags=["note"], default_response_class=NoteJSONResponse)
 
 
 @router.get("")
 async def get_notes(keyword: str = None, page: int = 1, size: int = 20,
+                    tag: List[str] = Query(default=[], description="frontmatter 태그 (여러 개면 모두 포함)"),
+                    attr: List[str] = Query(default=[], description="frontmatter 속성 '키:값' (예: status:draft)"),
+                    folder: str = Query(default=None, description="이 폴더(하위 포함) 안에서만 검색 (예: 팀A/회의)"),
                     service: NoteService = Depends(get_note_service)):
-    items, total_count = await service.get_notes_with_complex_search(keyword, page, size)
+    attrs = []
+    for item in attr:
+        key, sep, value = item.partition(":")
+        if not sep or not key.strip():
+            raise HTTPException(status_code=422, detail=f"attr 는 '키:값' 형식이어야 합니다: {item}")
+        attrs.append((key, value.strip()))
+
+    items, total_count = await service.get_notes_with_complex_search(keyword, page, size, tags=tag, attrs=attrs,
+                                                                     folder=folder)
     # items, total_count = await service.get_notes_with_pagination(keyword, page, size)
 
     # 전체 페이지 수 계산
     total_pages = (total_count + size - 1) // size
 
-    # 다음/이전 페이지 URL 생성
+    # 다음/이전 페이지 URL 생성 (검색어/필터가 있었다면 URL에도 붙여줌)
     base_url = "/notes"
-    next_page = f"{base_url}?page={page + 1}&size={size}" if page < total_pages else None
-    prev_page = f"{base_url}?page={page - 1}&size={size}" if page > 1 else None
+    params = [("size", size)] + ([("keyword", keyword)] if keyword else []) + [("tag", t) for t in tag] + \
+             [("attr", a) for a in attr] + ([("folder", folder)] if folder else [])
+    next_page = f"{base_url}?{urlencode([('page', page + 1)] + params)}" if page < total_pages else None
+    prev_page = f"{base_url}?{urlencode([('page', page - 1)] + params)}" if page > 1 else None
 
-    # 검색어가 있었다면, URL에도 붙여줌
-    if keyword:
-        if next_page: next_page += f"&keyword={keyword}"
-        if prev_page: prev_page += f"&keyword={keyword}"
-
-    return {
+    return NoteJSONResponse({
         "status": "success",
         "metadata": {
             "total_count": total_count,
@@ -38,18 +57,50 @@ async def get_notes(keyword: str = None, page: int = 1, size: int = 20,
             "prev_link": prev_page,
         },
         "items": items,
-    }
+    })
+
+
+@router.get("/suggest")
+async def suggest_notes(q: str = "", limit: int = Query(default=10, ge=1, le=50)):
+    """ 제목/경로 자동완성 (메모리 색인, 입력 중인 한글 자모도 매칭) """
+    return {"query": q, "items": note_title_suggester.suggest(q, limit)}
+
+
+@router.get("/facets")
+async def get_note_facets(limit: int = Query(default=100, ge=1, le=1000),
+                          service: NoteService = Depends(get_note_service)):
+    """ 태그/속성 사이드바용 노트 수 (사전 집계) """
+    return await service.get_facets(limit)
+
+
+@router.get("/history-search")
+async def search_note_history(q: str, limit: int = Query(default=20, ge=1, le=200),
+                              change: Literal["added", "removed"] | None = None,
+                              service: NoteService = Depends(get_note_service)):
+    """ 삭제된 문구까지 포함한 과거 버전 검색 (결과마다 문구가 추가/삭제된 커밋 해시) """
+    results = await service.search_history(q, limit, change)
+    if results is None:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                            detail="이력 색인이 비활성화되어 있습니다. (NOTE_HISTORY_INDEX=1)")
+    return {"query": q, "items": results}
+
+
+@router.get("/duplicates")
+async def get_duplicate_notes(threshold: float = Query(default=0.8, ge=0.1, le=1.0),
+                              limit: int = Query(default=100, ge=1, le=1000),
+                              service: NoteService = Depends(get_note_service)):
+    """ 거의 같은 내용의 노트 쌍 (폴더가 달라도 검출) """
+    return await service.get_duplicate_report(threshold, limit)
 
 
 @router.get("/folder-tree")
-async def get_folder_tree(service: NoteService = Depends(get_note_service)):
+async def get_folder_tree(accept_encoding: str | None = Header(default=None),
+                          if_none_match: str | None = Header(default=None),
+                          service: NoteService = Depends(get_note_service)):
+    """ 폴더 트리 (직렬화/압축 결과를 캐시, ETag 로 재검증) """
     try:
-        tree_data = await service.get_folder_tree_data()
-        return NoteServiceFileTreeResponseIVO(
-            success=True,
-            data=tree_data,
-            message="Folder tree retrieved successfully",
-        )
+        body = await service.get_folder_tree_body()
+        return body.to_response(accept_encoding, if_none_match)
     except Exception as e:
         return NoteServiceFileTreeResponseIVO(
             success=False,
@@ -68,9 +119,42 @@ async def get_note_by_path(file_path: str, service: NoteService = Depends(get_no
         raise HTTPException(status_code=500, detail="Database out of sync: File missing")
 
 
+@router.post("/batch")
+async def get_notes_batch(request: NoteBatchRequest, service: NoteService = Depends(get_note_service)):
+    """ 여러 노트를 한 번에 조회 (폴더 열기/검색 결과 페이지용). 항목별로 meta/content 또는 error """
+    items = await service.get_notes_batch(request.ids, request.paths, request.include_content)
+    return NoteJSONResponse({
+        "items": items,
+        "found": sum(1 for item in items if "error" not in item),
+        "errors": sum(1 for item in items if "error" in item),
+    })
+
+
+@router.get("/export")
+async def export_notes(rev: str = "HEAD", path: str = None, format: Literal["tar", "tar.gz", "zip"] = "tar",
+                       service: NoteService = Depends(get_note_service)):
+    """ 특정 리비전의 git tree 를 tar/zip 으로 스트리밍합니다. (저장 중에도 일관된 스냅샷) """
+    try:
+        commit_hash, chunks = await service.export_notes(rev, path, format)
+    except NoteNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+    media_types = {"tar": "application/x-tar", "tar.gz": "application/gzip", "zip": "application/zip"}
+    folder_suffix = f"-{path.strip('/').replace('/', '_')}" if path and path.strip("/") else ""
+    file_name = f"notes-{commit_hash[:12]}{folder_suffix}.{format}"
+
+    return StreamingResponse(
+        chunks,
+        media_type=media_types[format],
+        headers={
+            "Content-Disposition": f"attachment; filename*=UTF-8''{quote(file_name)}",
+            "X-Note-Commit": commit_hash,
+        },
+    )
+
+
 @router.post("/save")
-async def save_note(request: NoteSaveRequest, background_tasks: BackgroundTasks,
-                    service: NoteService = Depends(get_note_service)):
+async def save_note(request: NoteSaveRequest, service: NoteService = Depends(get_note_service)):
     try:
         # 핵심 로직 실행
         result = await service.save_or_update_note(
@@ -80,14 +164,7 @@ async def save_note(request: NoteSaveRequest, background_tasks: BackgroundTasks,
             user_name=request.user_name,
             last_hash=request.last_hash,
         )
-
-        # 2. 무거운 색인 작업은 백그라운드에서 실행
-        background_tasks.add_task(
-            service.search_manager.update_index,
-            request.title,
-            request.content,
-        )
-
+        # 무거운 색인/HTML 렌더링 작업은 저장 트랜잭션에서 작업 큐에 적재되어 워커가 실행 (내용 변경이 없으면 생략)
         return {
             "status": "success",
             **result,
@@ -99,7 +176,7 @@ async def save_note(request: NoteSaveRequest, background_tasks: BackgroundTasks,
             detail={
                 "error_code": "NOTE_CONFLICT",
                 "message": "편집 중 다른 사용자가 내용을 수정했습니다.",
-                "conflict_data": ne.conflict_data.dict()
+                "conflict_data": ne.conflict_data.model_dump(mode="json")
             }
         )
 
@@ -108,12 +185,179 @@ async def save_note(request: NoteSaveRequest, background_tasks: BackgroundTasks,
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
 
 
+@router.post("/save-patch")
+async def save_note_patch(request: NotePatchSaveRequest, service: NoteService = Depends(get_note_service)):
+    try:
+        result, _ = await service.save_patch_note(
+            title=request.title,
+            file_path=request.file_path,
+            user_name=request.user_name,
+            last_hash=request.last_hash,
+            patch=request.patch,
+            ops=request.ops,
+        )
+        return {
+            "status": "success",
+            **result,
+        }
+    except NoteConflictError as ne:
+        print(f"❌ NoteConflictError in save_note_patch: {str(ne)}")
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail={
+                "error_code": "NOTE_CONFLICT",
+                "message": "편집 중 다른 사용자가 내용을 수정했습니다.",
+                "conflict_data": ne.conflict_data.model_dump(mode="json")
+            }
+        )
+    except NoteNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except NotePatchError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail={"error_code": "NOTE_PATCH_REJECTED", "message": str(e)}
+        )
+    except Exception as e:
+        print(f"❌ Error in save_note_patch: {str(e)}")
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
+
+
+@router.post("/import")
+async def import_notes(request: NoteImportRequest, service: NoteService = Depends(get_note_service)):
+    """ JSON 배열로 받은 노트들을 단일 커밋으로 가져옵니다. """
+    results = await service.import_notes(request.notes, request.user_name)
+    return _import_response(results)
+
+
+@router.post("/import/archive")
+async def import_notes_archive(file: UploadFile = File(...),
+                               user_name: str = Form(...), service: NoteService = Depends(get_note_service)):
+    """ zip/tar 아카이브의 .md 파일들을 단일 커밋으로 가져옵니다. """
+    try:
+        results = await service.import_archive(file.file, file.filename, user_name)
+    except NoteImportLimitError as e:
+        raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=str(e))
+    except NoteServiceError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return _import_response(results)
+
+
+def _import_response(results):
+    # 색인은 작업 큐에서 노트 묶음 단위(writer 세션 한 번)로 처리
+    summary = {}
+    for r in results:
+        summary[r["status"]] = summary.get(r["status"], 0) + 1
+
+    return {
+        "status": "success",
+        "summary": summary,
+        "results": results,
+    }
+
+
 @router.get("/{title}/history")
 async def get_note_history(title: str, service: NoteService = Depends(get_note_service)):
     detail = await service.get_note_detail(title)
     if not detail:
         raise HTTPException(status_code=404, detail="Not Found")
-    return detail
+    return NoteJSONResponse(detail)
+
+
+@router.get("/{note_id}/html", response_class=HTMLResponse)
+async def get_note_html(note_id: str, if_none_match: str | None = Header(default=None),
+                        service: NoteService = Depends(get_note_service)):
+    """ 렌더링된 HTML (리비전별 캐시, ETag 로 재검증) """
+    try:
+        etag, html = await service.get_note_html(note_id, if_none_match)
+    except NoteNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except NoteFileNotFoundError:
+        raise HTTPException(status_code=500, detail="File lost on server")
+
+    headers = {"Cache-Control": "no-cache"}
+    if etag:
+        headers["ETag"] = etag
+    if html is None:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return HTMLResponse(html, headers=headers)
+
+
+@router.api_route("/{note_id}/raw", methods=["GET", "HEAD"])
+async def get_note_raw(note_id: str, request: Request, range_header: str | None = Header(default=None, alias="range"),
+                       if_range: str | None = Header(default=None), if_none_match: str | None = Header(default=None),
+                       service: NoteService = Depends(get_note_service)):
+    """ 노트 원문(markdown) 스트리밍. Range(206) 로 이어 받기/부분 읽기, 커밋 해시 ETag 로 재검증 """
+    try:
+        raw = await service.open_raw_content(note_id)
+    except NoteNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except NoteFileNotFoundError:
+        raise HTTPException(status_code=500, detail="File lost on server")
+
+    media_type = "text/markdown; charset=utf-8"
+    headers = {"ETag": raw.etag, "Accept-Ranges": "bytes", "Cache-Control": "no-cache"}
+    if if_none_match and raw.etag in [t.strip() for t in if_none_match.split(",")]:
+        await raw.close()
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    try:
+        # If-Range 가 현재 리비전과 다르면 (그사이 저장됨) 범위를 무시하고 전체를 보낸다. (약한 ETag 는 항상 불일치)
+        range_valid = not if_range or (if_range.strip() == raw.etag and not raw.etag.startswith("W/"))
+        byte_range = parse_byte_range(range_header, raw.size) if range_valid else None
+    except NoteRangeNotSatisfiableError as e:
+        await raw.close()
+        return Response(status_code=416, headers={**headers, "Content-Range": f"bytes */{e.size}"})
+
+    start, end = byte_range or (0, raw.size - 1)
+    status_code = status.HTTP_206_PARTIAL_CONTENT if byte_range else status.HTTP_200_OK
+    headers["Content-Length"] = str(end - start + 1)
+    if byte_range:
+        headers["Content-Range"] = f"bytes {start}-{end}/{raw.size}"
+    if request.method == "HEAD" or raw.size == 0:
+        await raw.close()
+        return Response(status_code=status_code, headers=headers, media_type=media_type)
+    return StreamingResponse(raw.iter_bytes(start, end), status_code=status_code, headers=headers,
+                             media_type=media_type)
+
+
+@router.get("/{note_id}/compare")
+async def compare_note_revisions(note_id: str,
+                                 from_rev: str = Query(alias="from", description="비교 기준 리비전 (커밋 해시)"),
+                                 to_rev: str | None = Query(default=None, alias="to", description="생략 시 현재 리비전"),
+                                 mode: Literal["line", "word"] = "line",
+                                 service: NoteService = Depends(get_note_service)):
+    """ 두 리비전의 구조화된 diff (줄 / 단어 단위). 같은 비교는 캐시에서 응답 """
+    try:
+        return NoteJSONResponse(await service.compare_revisions(note_id, from_rev, to_rev, mode))
+    except NoteNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+
+@router.get("/{note_id}/similar")
+async def get_similar_notes(note_id: str,
+                            threshold: float = Query(default=0.5, ge=0.1, le=1.0),
+                            limit: int = Query(default=20, ge=1, le=100),
+                            service: NoteService = Depends(get_note_service)):
+    try:
+        return await service.get_similar_notes(note_id, threshold, limit)
+    except NoteNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+
+@router.get("/{note_id}/backlinks")
+async def get_note_backlinks(note_id: str, service: NoteService = Depends(get_note_service)):
+    try:
+        return await service.get_backlinks(note_id)
+    except NoteNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+
+@router.get("/{note_id}/links")
+async def get_note_links(note_id: str, service: NoteService = Depends(get_note_service)):
+    try:
+        return await service.get_outgoing_links(note_id)
+    except NoteNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
 
 
 @router.get("/{note_id}")
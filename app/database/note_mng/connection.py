@@ -1,13 +1,21 @@
 # 1. 경로 설정 (프로젝트 루트의 data 폴더)
 import os
 from pathlib import Path
+from app.config.app_path import DATA_DIR
 from app.database.default_model_mixin import Base
 from typing import AsyncGenerator
 from app.database.note_mng.model.note_model import NoteMetadata
+from app.database.note_mng.model.note_link_model import NoteLink
+from app.database.note_mng.model.note_frontmatter_model import NoteTag, NoteAttr, NoteFacet
+from app.database.note_mng.model.note_similarity_model import NoteMinHash, NoteLshBand
+from app.database.note_mng.model.note_job_model import NoteJob
+from app.database.note_mng.model.note_derived_state_model import NoteDerivedState
+from sqlalchemy import inspect, text
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 
-BASE_DIR = Path(__file__).resolve().parent.parent.parent.parent
-DB_PATH = BASE_DIR / "data" / "db" / "note_poc.db"
+from app.database.note_mng.constant.table_name import TableNames
+
+DB_PATH = DATA_DIR / "db" / "note_poc.db"
 
 # 1. data 폴더가 없으면 생성
 if not DB_PATH.parent.exists():
@@ -54,4 +62,25 @@ async def init_models():
         # 이렇게 하면 Base가 NoteMetadata 클래스를 인지하게 됩니다.
         # 실제 테이블 생성 실행
         await conn.run_sync(Base.metadata.create_all)
+        # create_all 은 기존 테이블에 컬럼을 추가하지 않으므로, 나중에 추가된 컬럼은 여기서 채운다.
+        await conn.run_sync(_add_missing_columns)
     print("✅ [DB] 테이블 생성 프로세스 완료")
+
+
+# 기존 테이블에 나중에 추가된 컬럼 (테이블, 컬럼). 모두 NULL 허용이어야 한다.
+_ADDED_COLUMNS = [
+    (TableNames.NOTE_META, "content_hash"),
+]
+
+
+def _add_missing_columns(sync_conn):
+    """ 이미 만들어진 DB 에 없는 컬럼만 ALTER TABLE ... ADD COLUMN (여러 번 실행해도 안전) """
+    inspector = inspect(sync_conn)
+    for table_name, column_name in _ADDED_COLUMNS:
+        existing = {column["name"] for column in inspector.get_columns(table_name)}
+        if column_name in existing:
+            continue
+        column = Base.metadata.tables[table_name].columns[column_name]
+        column_type = column.type.compile(dialect=sync_conn.dialect)
+        sync_conn.execute(text(f'ALTER TABLE "{table_name}" ADD COLUMN "{column_name}" {column_type}'))
+        print(f"✅ [DB] 컬럼 추가: {table_name}.{column_name}")
@@ -1,4 +1,12 @@
 class TableNames:
     """ 테이블 이름 상수 """
 
-    NOTE_META = "NOTE_META"
\ No newline at end of file
+    NOTE_META = "NOTE_META"
+    NOTE_LINK = "NOTE_LINK"
+    NOTE_TAG = "NOTE_TAG"
+    NOTE_ATTR = "NOTE_ATTR"
+    NOTE_FACET = "NOTE_FACET"
+    NOTE_MINHASH = "NOTE_MINHASH"
+    NOTE_LSH_BAND = "NOTE_LSH_BAND"
+    NOTE_JOB = "NOTE_JOB"
+    NOTE_DERIVED_STATE = "NOTE_DERIVED_STATE"
@@ -0,0 +1,16 @@
+from sqlalchemy import Column, String
+
+from app.database.default_model_mixin import Base, TimestampMixin
+from app.database.note_mng.constant.table_name import TableNames
+
+
+class NoteDerivedState(Base, TimestampMixin):
+    """
+    본문에서 파생되는 테이블(링크/태그/유사도)의 백필 완료 기록.
+    name 별로 마지막으로 전체 노트를 계산한 버전을 남기고, 계산 방식이 바뀌어 버전이 올라가면 그 테이블만 다시 백필한다.
+    (테이블이 비어 있는지로 판단하면 링크/태그가 하나도 없는 저장소는 기동할 때마다 백필하게 된다)
+    """
+    __tablename__ = TableNames.NOTE_DERIVED_STATE
+
+    name = Column(String(40), primary_key=True)
+    version = Column(String(40), nullable=False)
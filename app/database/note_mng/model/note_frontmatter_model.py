@@ -0,0 +1,45 @@
+from sqlalchemy import Column, Integer, String, Index
+
+from app.database.default_model_mixin import Base
+from app.database.note_mng.constant.table_name import TableNames
+
+
+class NoteTag(Base):
+    """ 노트 frontmatter 의 tags 를 정규화한 테이블 (노트 1 : N 태그) """
+    __tablename__ = TableNames.NOTE_TAG
+
+    __table_args__ = (
+        Index("ix_note_tag_tag", "tag", "note_id"),
+        Index("ix_note_tag_note", "note_id"),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    note_id = Column(String(100), nullable=False)
+    tag = Column(String(100), nullable=False)
+
+
+class NoteAttr(Base):
+    """ 노트 frontmatter 의 나머지 스칼라 항목 (owner, status 등). 리스트 값은 값마다 한 행 """
+    __tablename__ = TableNames.NOTE_ATTR
+
+    __table_args__ = (
+        Index("ix_note_attr_kv", "attr_key", "attr_value", "note_id"),
+        Index("ix_note_attr_note", "note_id"),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    note_id = Column(String(100), nullable=False)
+    attr_key = Column(String(100), nullable=False)
+    attr_value = Column(String(255), nullable=False)
+
+
+class NoteFacet(Base):
+    """
+    태그/속성별 노트 수 (사이드바용 사전 집계).
+    facet_key 는 태그면 "tag", 속성이면 속성 이름입니다. 저장/동기화 시 바뀐 값만 다시 집계합니다.
+    """
+    __tablename__ = TableNames.NOTE_FACET
+
+    facet_key = Column(String(100), primary_key=True)
+    facet_value = Column(String(255), primary_key=True)
+    note_count = Column(Integer, nullable=False, default=0)
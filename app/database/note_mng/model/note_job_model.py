@@ -0,0 +1,31 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime, Index, Enum as SqlEnum
+
+from app.database.default_model_mixin import Base, TimestampMixin
+from app.database.note_mng.constant.table_name import TableNames
+from app.spec.constant.ModelEnums import JobStatusEnum
+
+
+class NoteJob(Base, TimestampMixin):
+    """
+    커밋 이후 작업(색인, HTML 캐시 등) 큐. NoteMetadata 변경과 같은 트랜잭션에서 적재되어 프로세스가 죽어도 남는다.
+    idempotency_key(작업 종류:노트:커밋)가 같으면 한 번만 적재된다.
+    """
+    __tablename__ = TableNames.NOTE_JOB
+
+    __table_args__ = (
+        Index("ix_note_job_due", "status", "next_run_at"),
+        Index("ix_note_job_claim", "claim_token"),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    job_type = Column(String(40), nullable=False)
+    idempotency_key = Column(String(300), nullable=False, unique=True)
+    payload = Column(Text, nullable=False, comment="JSON")
+    status = Column(SqlEnum(JobStatusEnum, native_enum=False, length=20), nullable=False,
+                    default=JobStatusEnum.PENDING)
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=5)
+    next_run_at = Column(DateTime, nullable=False, comment="이 시각 이후에 실행 (재시도 backoff)")
+    claim_token = Column(String(40), nullable=True, comment="실행 중인 워커의 claim 토큰")
+    locked_at = Column(DateTime, nullable=True)
+    last_error = Column(Text, nullable=True)
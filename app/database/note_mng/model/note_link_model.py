@@ -0,0 +1,27 @@
+from sqlalchemy import Column, Integer, String, Index
+
+from app.database.default_model_mixin import Base
+from app.database.note_mng.constant.table_name import TableNames
+
+
+class NoteLink(Base):
+    """
+    노트 간 링크(edge). 저장/동기화 시 원본 노트의 링크를 통째로 다시 계산해 교체합니다.
+    - link_type: wiki ([[제목]]) / markdown ([텍스트](경로.md))
+    - target_key: wiki 는 제목, markdown 은 저장소 기준 상대 경로
+    - dst_note_id: target_key 로 찾은 대상 노트 ID (아직 없는 노트면 NULL, 대상이 생기면 채워짐)
+    """
+    __tablename__ = TableNames.NOTE_LINK
+
+    __table_args__ = (
+        Index("ix_note_link_src", "src_note_id"),
+        Index("ix_note_link_dst", "dst_note_id"),
+        Index("ix_note_link_target", "link_type", "target_key"),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    src_note_id = Column(String(100), nullable=False)
+    dst_note_id = Column(String(100), nullable=True)
+    link_type = Column(String(20), nullable=False)
+    target_key = Column(String(500), nullable=False)
+    link_text = Column(String(500), nullable=True)
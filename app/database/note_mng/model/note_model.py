@@ -17,4 +17,5 @@ class NoteMetadata(Base, ObjIdMixin, UseMixin, AuditMixin, TimestampMixin, Recor
     title = Column(String(255), nullable=False, unique=True)
     file_path = Column(String(500), unique=True, nullable=False)
     last_commit_hash = Column(String(100))
+    content_hash = Column(String(64), comment="본문 SHA-256 (변경 없는 저장 감지용)")
     last_modified_by = Column(String, nullable=False)
@@ -0,0 +1,28 @@
+from sqlalchemy import Column, Integer, String, LargeBinary, BigInteger, Index
+
+from app.database.default_model_mixin import Base
+from app.database.note_mng.constant.table_name import TableNames
+
+
+class NoteMinHash(Base):
+    """ 노트 본문 토큰 집합의 MinHash 시그니처 (array('Q') 바이트, 노트당 1KB) """
+    __tablename__ = TableNames.NOTE_MINHASH
+
+    note_id = Column(String(100), primary_key=True)
+    signature = Column(LargeBinary, nullable=False)
+    token_count = Column(Integer, nullable=False, default=0)
+
+
+class NoteLshBand(Base):
+    """ LSH 버킷 (밴드 번호, 밴드 해시) -> 노트. 같은 버킷의 노트만 유사 후보로 비교 """
+    __tablename__ = TableNames.NOTE_LSH_BAND
+
+    __table_args__ = (
+        Index("ix_note_lsh_bucket", "band_no", "band_hash"),
+        Index("ix_note_lsh_note", "note_id"),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    note_id = Column(String(100), nullable=False)
+    band_no = Column(Integer, nullable=False)
+    band_hash = Column(BigInteger, nullable=False)
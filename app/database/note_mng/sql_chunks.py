@@ -0,0 +1,13 @@
+# sql_chunks.py
+
+from typing import Iterator, List
+
+# IN 절 한 번에 넣는 값 개수.
+# SQLite 바인드 파라미터 한도는 3.32 부터 32766 (번들 SQLite 3.40), 그 이전 빌드는 999 이다.
+# 어느 쪽에서도 한도를 넘지 않고 문장 하나가 너무 커지지 않도록 500 개씩 나눠서 실행한다.
+IN_CHUNK_SIZE = 500
+
+
+def in_chunks(values: list, size: int = IN_CHUNK_SIZE) -> Iterator[List]:
+    for i in range(0, len(values), size):
+        yield values[i:i + size]
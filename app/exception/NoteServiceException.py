@@ -22,3 +22,21 @@ class NoteNotFoundError(NoteServiceError):
 class NoteFileNotFoundError(NoteServiceError):
     """DB에는 있으나 실제 물리 파일이 없을 때"""
     pass
+
+
+class NotePatchError(NoteServiceError):
+    """패치(diff/op)가 기준 리비전 본문에 적용되지 않을 때"""
+    pass
+
+
+class NoteRangeNotSatisfiableError(NoteServiceError):
+    """요청한 바이트 범위(Range)가 파일 크기를 벗어날 때"""
+
+    def __init__(self, size: int):
+        self.size = size
+        super().__init__(f"Range not satisfiable (size: {size})")
+
+
+class NoteImportLimitError(NoteServiceError):
+    """가져오기 아카이브가 파일 수/전체 크기 한도를 넘을 때"""
+    pass
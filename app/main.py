@@ -1,3 +1,4 @@
+import asyncio
 import logging
 from contextlib import asynccontextmanager
 
@@ -7,11 +8,29 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from starlette.middleware.cors import CORSMiddleware
 from watchfiles import awatch
 
+from app.controller.admin_controller import admin_controller
+from app.controller.metrics_controller import metrics_controller
+from app.controller.note_change_feed_controller import note_change_feed_controller
 from app.controller.note_service_controller import note_service_controller
-from app.database.note_mng.connection import init_models, get_db, AsyncSessionLocal
+from app.database.note_mng.connection import init_models, get_db, AsyncSessionLocal, engine
 from app.database.note_mng.model.note_model import NoteMetadata
+from app.middleware.admission_middleware import AdmissionMiddleware
+from app.middleware.compression_middleware import CompressionMiddleware
+from app.middleware.request_timing_middleware import RequestTimingMiddleware
+from app.service.change_feed.change_feed_hub import change_feed_hub
 from app.service.git_manage_service.git_poc import GitService
+from app.service.job_queue.note_job_queue import JOB_INDEX, JOB_HTML_WARM, JOB_SIMILARITY
+from app.service.job_queue.note_job_worker import note_job_worker
+from app.service.lang_analyzer.history_search_manager import NoteHistorySearchManager, HISTORY_INDEX_ENABLED
+from app.service.lang_analyzer.search_manager import NoteSearchManager
+from app.service.maintenance.storage_maintenance import storage_maintenance
+from app.service.metrics.note_metrics import NOTE_SYNC_SECONDS
+from app.service.metrics.request_tracer import instrument_sqlalchemy
 from app.service.note_mng.note_mng_biz_service import NoteService, get_note_service
+from app.service.note_mng.note_post_commit_jobs import run_index_jobs, run_similarity_jobs, run_html_warm_jobs
+from app.service.note_mng.note_title_suggester import note_title_suggester
+from app.service.note_mng.note_tree_cache import note_tree_cache
+from app.service.worker_coord.worker_coordinator import worker_coordinator
 
 # 로거 설정
 logger = logging.getLogger(__name__)
@@ -34,19 +53,60 @@ async def lifespan(app: FastAPI):
     await init_models()
     print("✅ PoC용 SQLite 테이블 생성 완료")
 
-    print(f"start sync files & Index")
+    # 💡 멀티 워커 실행 시 전체 동기화/재색인은 리더 워커 1개만 수행
+    if worker_coordinator.try_acquire_leadership():
+        print(f"start sync files & Index")
+        async with AsyncSessionLocal() as session:
+            service = NoteService(session)
+            # 별도 쓰레드나 동기 방식으로 실행
+            with NOTE_SYNC_SECONDS.labels(target="index").time():
+                service.sync_all_files_to_index()
+            with NOTE_SYNC_SECONDS.labels(target="db").time():
+                await service.sync_db_with_file_system()
+    else:
+        print("⏭️ 팔로워 워커: 동기화/색인은 리더에게 맡기고 읽기 요청만 처리합니다.")
+
+    # 자동완성 색인은 워커마다 메모리에 만들고, 이후 변경은 변경 피드(다른 워커 포함)로 반영
     async with AsyncSessionLocal() as session:
-        service = NoteService(session)
-        # 별도 쓰레드나 동기 방식으로 실행
-        service.sync_all_files_to_index()
-        await service.sync_db_with_file_system()
+        suggest_count = await NoteService(session).rebuild_suggest_index()
+    change_feed_hub.add_listener(note_title_suggester.on_change_event)
+    change_feed_hub.add_listener(note_tree_cache.on_change_event)
+    print(f"🔤 자동완성 색인 생성 완료: {suggest_count}건")
+
+    # 리더는 팔로워가 적재한 색인 작업(+ 새 커밋의 이력 색인)을 반영하고, 팔로워는 리더 승계를 계속 시도
+    search_manager = NoteSearchManager()
+    history_manager = NoteHistorySearchManager(git_service.repo_path) if HISTORY_INDEX_ENABLED else None
+
+    def on_leader_tick():
+        search_manager.apply_queued_jobs()
+        if history_manager is not None:
+            history_manager.catch_up()
+
+    coordinator_task = asyncio.create_task(worker_coordinator.run(on_leader_tick))
+    # 다른 워커에서 발생한 노트 변경을 이 워커의 변경 피드 구독자에게 중계 (중계 파일 정리는 리더만)
+    change_feed_task = asyncio.create_task(change_feed_hub.run_relay(lambda: worker_coordinator.is_leader))
+    # 저장 트랜잭션에서 적재된 색인/유사도/캐시 작업 실행 (이전 프로세스가 남긴 작업도 이어서 처리)
+    note_job_worker.register(JOB_INDEX, run_index_jobs)
+    note_job_worker.register(JOB_SIMILARITY, run_similarity_jobs)
+    note_job_worker.register(JOB_HTML_WARM, run_html_warm_jobs)
+    job_worker_task = asyncio.create_task(note_job_worker.run())
+    # git gc/repack/commit-graph, 색인 optimize 는 리더가 사용량이 적은 시간대에만 실행
+    maintenance_task = asyncio.create_task(storage_maintenance.run(lambda: worker_coordinator.is_leader))
 
     yield
     # ========== Shutdown (서버 종료 시) ==========
     print("🛑 서버 종료 중...")
 
+    # 백그라운드 루프를 모두 취소하고 끝날 때까지 기다린다.
+    # (기다리지 않으면 이벤트 루프 종료 중에 취소가 DB 세션 안으로 전달되어 aiosqlite 연결 종료가 멈춘다)
+    background_tasks = [coordinator_task, change_feed_task, maintenance_task, job_worker_task]
+    for task in background_tasks:
+        task.cancel()
+    await asyncio.gather(*background_tasks, return_exceptions=True)
+    worker_coordinator.release()
+
     # 데이터베이스 연결 종료
-    # await database.disconnect()
+    await engine.dispose()
 
     # 백그라운드 작업 정리
     # await cleanup_background_tasks()
@@ -59,6 +119,14 @@ async def lifespan(app: FastAPI):
 
 app = FastAPI(lifespan=lifespan)
 
+# 요청별 Server-Timing 헤더 / 구조화 로그 (DB 쿼리 시간은 엔진 이벤트로 수집)
+instrument_sqlalchemy(engine.sync_engine)
+# 엔드포인트 종류별 동시 실행 제한 (거절 응답에도 Server-Timing/CORS 헤더가 붙도록 타이밍 미들웨어 안쪽에 둔다)
+app.add_middleware(AdmissionMiddleware)
+# JSON/HTML 응답 br/gzip 압축 (스트리밍 응답, 미리 압축해 둔 캐시 응답은 제외)
+app.add_middleware(CompressionMiddleware)
+app.add_middleware(RequestTimingMiddleware)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins="*",
@@ -67,7 +135,11 @@ app.add_middleware(
     allow_headers="*",
 )
 
+# /notes/changes/* 가 /notes/{note_id} 보다 먼저 매칭되도록 먼저 등록
+app.include_router(note_change_feed_controller)
 app.include_router(note_service_controller)
+app.include_router(metrics_controller)
+app.include_router(admin_controller)
 
 if __name__ == '__main__':
     import uvicorn
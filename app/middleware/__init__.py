@@ -0,0 +1 @@
+""" ASGI 미들웨어 """
@@ -0,0 +1,62 @@
+# admission_middleware.py
+
+import json
+import time
+
+from app.service.admission.admission_control import AdmissionControl, admission_control, ADMISSION_ENABLED, \
+    REJECT_QUEUE_FULL
+from app.service.metrics.request_tracer import trace_span
+
+
+class AdmissionMiddleware:
+    """
+    엔드포인트 종류(write/search/history/read)별 동시 실행 수를 제한하고, 넘치는 요청은 짧게 줄 세웠다가 거절한다.
+    - 대기열이 가득 찼거나 기다려도 제시간에 차례가 오지 않을 요청: 바로 429
+    - 대기열에서 queue_timeout 까지 기다렸지만 슬롯을 못 얻은 요청: 503
+    두 경우 모두 Retry-After 를 붙인다. 슬롯은 응답(스트리밍 포함)을 다 보낼 때까지 유지한다.
+    """
+
+    def __init__(self, app, control: AdmissionControl = None):
+        self.app = app
+        self.control = control or admission_control
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not ADMISSION_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        limiter = self.control.limiter_for(scope["method"], scope["path"], scope.get("query_string", b""))
+        if limiter is None:
+            await self.app(scope, receive, send)
+            return
+
+        with trace_span("admission"):
+            rejected = await limiter.acquire()
+        if rejected:
+            await self._send_rejection(send, limiter.name, rejected, limiter.retry_after())
+            return
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            limiter.release(time.perf_counter() - started)
+
+    @staticmethod
+    async def _send_rejection(send, endpoint_class: str, reason: str, retry_after: int):
+        status_code = 429 if reason == REJECT_QUEUE_FULL else 503
+        body = json.dumps({
+            "detail": f"요청이 많아 처리할 수 없습니다. {retry_after}초 후 다시 시도하세요.",
+            "endpoint_class": endpoint_class,
+            "reason": reason,
+        }, ensure_ascii=False).encode("utf-8")
+        await send({
+            "type": "http.response.start",
+            "status": status_code,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(retry_after).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,72 @@
+# compression_middleware.py
+
+from starlette.datastructures import Headers, MutableHeaders
+
+from app.service.metrics.request_tracer import trace_span, run_in_executor
+from app.spec.endpoint.note_json_response import choose_encoding, compress, COMPRESS_MIN_SIZE
+
+# 압축할 응답 종류 (이미 압축된 tar.gz/zip, 이미지 등은 제외)
+_COMPRESSIBLE_TYPES = ("application/json", "text/html", "text/plain", "text/markdown", "text/css",
+                       "application/javascript")
+# 이보다 큰 본문은 이벤트 루프를 막지 않도록 executor 에서 압축
+_EXECUTOR_THRESHOLD = 256 * 1024
+
+
+class CompressionMiddleware:
+    """
+    Accept-Encoding 에 따라 응답 본문을 br(brotli 설치 시) / gzip 으로 압축한다.
+    - minimum_size 이상이고 압축 가능한 Content-Type 인 한 번에 끝나는 응답만 압축
+    - 스트리밍 응답(내보내기, SSE)과 이미 Content-Encoding 이 붙은 응답(미리 압축해 둔 캐시)은 그대로 통과
+    """
+
+    def __init__(self, app, minimum_size: int = COMPRESS_MIN_SIZE):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding"))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+        passthrough = False
+
+        async def send_compressed(message):
+            nonlocal start_message, passthrough
+            if passthrough:
+                await send(message)
+                return
+            if message["type"] == "http.response.start":
+                start_message = message  # 본문 첫 조각을 보고 압축 여부를 정한다
+                return
+
+            body = message.get("body", b"")
+            headers = MutableHeaders(scope=start_message)
+            if message.get("more_body", False) or not self._should_compress(headers, body):
+                passthrough = True
+                await send(start_message)
+                await send(message)
+                return
+
+            with trace_span("compress"):
+                if len(body) >= _EXECUTOR_THRESHOLD:
+                    compressed = await run_in_executor(compress, body, encoding)
+                else:
+                    compressed = compress(body, encoding)
+            headers["Content-Encoding"] = encoding
+            headers["Content-Length"] = str(len(compressed))
+            headers.add_vary_header("Accept-Encoding")
+            await send(start_message)
+            await send({"type": "http.response.body", "body": compressed})
+
+        await self.app(scope, receive, send_compressed)
+
+    def _should_compress(self, headers: MutableHeaders, body: bytes) -> bool:
+        if "content-encoding" in headers or len(body) < self.minimum_size:
+            return False
+        content_type = headers.get("content-type", "").split(";")[0].strip().lower()
+        return content_type in _COMPRESSIBLE_TYPES
@@ -0,0 +1,86 @@
+# request_timing_middleware.py
+
+import os
+import re
+import time
+import uuid
+from pathlib import Path
+
+import structlog
+from starlette.datastructures import Headers, MutableHeaders
+
+from app.config.app_path import DATA_DIR
+from app.service.metrics.request_tracer import start_trace, end_trace, run_in_executor
+from app.service.metrics.sampling_profiler import SamplingProfiler
+
+logger = structlog.get_logger(__name__)
+
+# 프로파일링은 기본 비활성. 환경 변수에 토큰을 설정하고, 같은 값을 요청 헤더로 보낸 요청만 샘플링한다.
+PROFILE_HEADER = "x-note-profile"
+PROFILE_TOKEN_ENV = "NOTE_PROFILE_TOKEN"
+
+
+class RequestTimingMiddleware:
+    """
+    요청별 span(DB, git, 검색, Komoran, 파일 I/O)을 모아
+    - Server-Timing 응답 헤더 (브라우저 개발자 도구에서 바로 확인 가능)
+    - structlog 구조화 로그
+    로 내보내고, 토큰 헤더가 있으면 샘플링 프로파일을 data/profile 에 남긴다.
+    """
+
+    def __init__(self, app, profile_dir: Path = None):
+        self.app = app
+        self.profile_dir = profile_dir or DATA_DIR / "profile"
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        trace, token = start_trace()
+        profiler = self._start_profiler_if_requested(scope)
+        status_code = 500
+
+        async def send_with_timing(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                MutableHeaders(scope=message).append("Server-Timing", trace.server_timing())
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            profile_path = None
+            if profiler is not None:
+                # 샘플러 스레드 join 과 파일 쓰기는 이벤트 루프를 막지 않도록 별도 스레드에서
+                profile_path = await run_in_executor(self._finish_profile, profiler, self._profile_path(scope))
+
+            logger.info(
+                "request_timing",
+                method=scope["method"],
+                path=scope["path"],
+                status=status_code,
+                total_ms=round(trace.elapsed_ms(), 1),
+                spans={name: round(item["dur"], 1) for name, item in trace.summary().items()},
+                profile=str(profile_path) if profile_path else None,
+            )
+            end_trace(token)
+
+    @staticmethod
+    def _start_profiler_if_requested(scope):
+        expected = os.getenv(PROFILE_TOKEN_ENV)
+        if not expected or Headers(scope=scope).get(PROFILE_HEADER) != expected:
+            return None
+        profiler = SamplingProfiler()
+        profiler.start()
+        return profiler
+
+    @staticmethod
+    def _finish_profile(profiler: SamplingProfiler, path: Path) -> Path:
+        profiler.stop()
+        return profiler.write_folded(path)
+
+    def _profile_path(self, scope) -> Path:
+        safe_path = re.sub(r"[^0-9A-Za-z_-]+", "_", scope["path"]).strip("_") or "root"
+        return self.profile_dir / f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:6]}-{scope['method']}-{safe_path}.folded"
@@ -0,0 +1 @@
+""" 엔드포인트 종류별 동시 실행 제한 / 과부하 시 요청 거절 """
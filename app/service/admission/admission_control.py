@@ -0,0 +1,235 @@
+# admission_control.py
+
+import asyncio
+import json
+import math
+import os
+import re
+import time
+from collections import deque
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from app.config.app_path import DATA_DIR
+from app.service.metrics.note_metrics import NOTE_ADMISSION_LIMIT, NOTE_ADMISSION_IN_FLIGHT, NOTE_ADMISSION_QUEUED, \
+    NOTE_ADMISSION_WAIT_SECONDS, NOTE_ADMISSION_REJECTED_TOTAL
+
+# 💡 NOTE_ADMISSION=0 이면 제한 없이 모두 수용 (기존 동작)
+ADMISSION_ENABLED = os.getenv("NOTE_ADMISSION", "1") == "1"
+
+# 엔드포인트 종류
+CLASS_WRITE = "write"  # 저장/패치/가져오기 (git 쓰기 + DB 커밋)
+CLASS_SEARCH = "search"  # 키워드 검색, 유사/중복 노트 (Komoran, Whoosh)
+CLASS_HISTORY = "history"  # 이력/리비전 비교/과거 버전 검색/내보내기 (git 객체 읽기)
+CLASS_READ = "read"  # 그 밖의 조회
+
+REJECT_QUEUE_FULL = "queue_full"
+REJECT_TIMEOUT = "timeout"
+
+# 종류별 기본값: (동시 실행 수, 대기열 길이, 대기 시간 상한(초)). 워커 프로세스마다 적용된다.
+DEFAULT_LIMITS: Dict[str, Tuple[int, int, float]] = {
+    CLASS_WRITE: (4, 32, 5.0),
+    CLASS_SEARCH: (8, 64, 2.0),
+    CLASS_HISTORY: (4, 32, 5.0),
+    CLASS_READ: (32, 256, 2.0),
+}
+
+_SEARCH_PATH = re.compile(r"^/notes/(duplicates|[^/]+/similar)$")
+_READ_POST_PATHS = ("/notes/batch",)  # 조회지만 본문이 필요해서 POST 인 엔드포인트
+_HISTORY_PATH = re.compile(r"^/notes/(history-search|export|[^/]+/history|[^/]+/compare)$")
+_RETRY_AFTER_MAX = 60
+_RELOAD_INTERVAL = 1.0
+
+
+def classify(method: str, path: str, query_string: bytes = b"") -> Optional[str]:
+    """ 요청을 엔드포인트 종류로 분류. 제한 대상이 아니면 None (변경 피드, 관리자/지표 API 등) """
+    if not path.startswith("/notes") or path.startswith("/notes/changes"):
+        return None
+    if method not in ("GET", "HEAD"):
+        return CLASS_READ if path in _READ_POST_PATHS else CLASS_WRITE
+    if _HISTORY_PATH.match(path):
+        return CLASS_HISTORY
+    if _SEARCH_PATH.match(path) or (path.rstrip("/") == "/notes" and b"keyword=" in query_string):
+        return CLASS_SEARCH
+    return CLASS_READ
+
+
+class EndpointLimiter:
+    """
+    한 엔드포인트 종류의 동시 실행 슬롯 + 길이 제한이 있는 FIFO 대기열 (이벤트 루프 하나 안에서만 사용).
+    - 슬롯이 비면 바로 실행, 아니면 대기열에서 queue_timeout 까지 기다린다.
+    - 대기열이 가득 찼거나, 지금까지의 처리 시간으로 볼 때 queue_timeout 안에 차례가 오지 않을 요청은 기다리지 않고 거절한다.
+    - 반납된 슬롯은 대기 중인 요청에 그대로 넘겨 새로 들어온 요청이 새치기하지 않게 한다.
+    """
+
+    def __init__(self, name: str, max_concurrent: int, max_queue: int, queue_timeout: float):
+        self.name = name
+        self.in_flight = 0
+        self._waiters: "deque[asyncio.Future]" = deque()
+        self._service_seconds = 0.05  # 처리 시간 이동 평균 (대기 예상/Retry-After 계산용)
+        self.configure(max_concurrent, max_queue, queue_timeout)
+
+    def configure(self, max_concurrent: int, max_queue: int, queue_timeout: float):
+        self.max_concurrent = max(1, int(max_concurrent))
+        self.max_queue = max(0, int(max_queue))
+        self.queue_timeout = max(0.0, float(queue_timeout))
+        NOTE_ADMISSION_LIMIT.labels(endpoint_class=self.name, kind="concurrency").set(self.max_concurrent)
+        NOTE_ADMISSION_LIMIT.labels(endpoint_class=self.name, kind="queue").set(self.max_queue)
+        # 슬롯이 늘었으면 기다리던 요청부터 채움 (줄었으면 실행 중인 요청이 끝나면서 자연히 맞춰진다)
+        while self.in_flight < self.max_concurrent and self._hand_off():
+            self._set_in_flight(self.in_flight + 1)
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    async def acquire(self) -> Optional[str]:
+        """ 슬롯을 얻으면 None, 거절하면 사유(REJECT_*) """
+        if self.in_flight < self.max_concurrent and not self._waiters:
+            self._set_in_flight(self.in_flight + 1)
+            return None
+        if len(self._waiters) >= self.max_queue or self.expected_wait() > self.queue_timeout:
+            return self._reject(REJECT_QUEUE_FULL)
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self._update_queued()
+        started = time.perf_counter()
+        try:
+            await asyncio.wait({waiter}, timeout=self.queue_timeout)
+        except asyncio.CancelledError:
+            self._abandon(waiter)  # 기다리는 중에 클라이언트가 끊김
+            raise
+        if waiter.done():
+            NOTE_ADMISSION_WAIT_SECONDS.labels(endpoint_class=self.name).observe(time.perf_counter() - started)
+            return None
+        self._abandon(waiter)
+        return self._reject(REJECT_TIMEOUT)
+
+    def release(self, service_seconds: float):
+        self._service_seconds = self._service_seconds * 0.9 + service_seconds * 0.1
+        if self.in_flight <= self.max_concurrent and self._hand_off():
+            return
+        self._set_in_flight(self.in_flight - 1)
+
+    def expected_wait(self) -> float:
+        """ 지금 대기열 맨 뒤에 서면 차례가 오기까지 걸릴 것으로 보이는 시간(초) """
+        return (len(self._waiters) + 1) * self._service_seconds / self.max_concurrent
+
+    def retry_after(self) -> int:
+        return min(_RETRY_AFTER_MAX, max(1, math.ceil(self.expected_wait())))
+
+    def snapshot(self) -> dict:
+        return {
+            "max_concurrent": self.max_concurrent,
+            "max_queue": self.max_queue,
+            "queue_timeout": self.queue_timeout,
+            "in_flight": self.in_flight,
+            "queued": len(self._waiters),
+            "avg_service_ms": round(self._service_seconds * 1000, 1),
+        }
+
+    def _hand_off(self) -> bool:
+        """ 대기 중인 요청 하나에 슬롯을 넘김 (넘길 대상이 없으면 False) """
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(True)
+                self._update_queued()
+                return True
+        self._update_queued()
+        return False
+
+    def _abandon(self, waiter: asyncio.Future):
+        if waiter.done():
+            # 시간 초과/취소와 같은 순간에 슬롯을 넘겨받았으면 다음 요청에 반납
+            self.release(self._service_seconds)
+            return
+        waiter.cancel()
+        self._waiters.remove(waiter)
+        self._update_queued()
+
+    def _reject(self, reason: str) -> str:
+        NOTE_ADMISSION_REJECTED_TOTAL.labels(endpoint_class=self.name, reason=reason).inc()
+        return reason
+
+    def _set_in_flight(self, value: int):
+        self.in_flight = value
+        NOTE_ADMISSION_IN_FLIGHT.labels(endpoint_class=self.name).set(value)
+
+    def _update_queued(self):
+        NOTE_ADMISSION_QUEUED.labels(endpoint_class=self.name).set(len(self._waiters))
+
+
+class AdmissionControl:
+    """
+    엔드포인트 종류별 EndpointLimiter 모음.
+    운영 중 변경한 제한값은 run/admission.json 에 저장하고, 모든 워커가 파일이 바뀐 것을 보고 다시 읽는다.
+    """
+
+    def __init__(self, config_path: Optional[Path] = None):
+        self.config_path = Path(config_path) if config_path else DATA_DIR / "run" / "admission.json"
+        self.limiters = {name: EndpointLimiter(name, *limits) for name, limits in DEFAULT_LIMITS.items()}
+        self._config_mtime = None
+        self._last_reload = 0.0
+        self.reload_if_changed(force=True)
+
+    def limiter_for(self, method: str, path: str, query_string: bytes = b"") -> Optional[EndpointLimiter]:
+        self.reload_if_changed()
+        endpoint_class = classify(method, path, query_string)
+        return self.limiters[endpoint_class] if endpoint_class else None
+
+    def update(self, endpoint_class: str, max_concurrent: Optional[int] = None, max_queue: Optional[int] = None,
+               queue_timeout: Optional[float] = None) -> dict:
+        """ 제한값 변경 (지정한 항목만). 설정 파일에 기록해 다른 워커에도 반영된다. """
+        limiter = self.limiters[endpoint_class]
+        limiter.configure(
+            limiter.max_concurrent if max_concurrent is None else max_concurrent,
+            limiter.max_queue if max_queue is None else max_queue,
+            limiter.queue_timeout if queue_timeout is None else queue_timeout,
+        )
+        config = {name: {key: item.snapshot()[key] for key in ("max_concurrent", "max_queue", "queue_timeout")}
+                  for name, item in self.limiters.items()}
+        self.config_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.config_path.with_name(f".{self.config_path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, "w", encoding="UTF-8") as f:
+            json.dump(config, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.config_path)
+        self._config_mtime = self._mtime()
+        return limiter.snapshot()
+
+    def snapshot(self) -> dict:
+        return {"enabled": ADMISSION_ENABLED, "pid": os.getpid(),
+                "classes": {name: limiter.snapshot() for name, limiter in self.limiters.items()}}
+
+    def reload_if_changed(self, force: bool = False):
+        now = time.monotonic()
+        if not force and now - self._last_reload < _RELOAD_INTERVAL:
+            return
+        self._last_reload = now
+        mtime = self._mtime()
+        if mtime is None or mtime == self._config_mtime:
+            return
+        try:
+            with open(self.config_path, "r", encoding="UTF-8") as f:
+                config = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"[Error] 수용 제어 설정 읽기 실패: {e}")
+            return
+        self._config_mtime = mtime
+        for name, limits in config.items():
+            limiter = self.limiters.get(name)
+            if limiter is not None:
+                limiter.configure(limits.get("max_concurrent", limiter.max_concurrent),
+                                  limits.get("max_queue", limiter.max_queue),
+                                  limits.get("queue_timeout", limiter.queue_timeout))
+
+    def _mtime(self) -> Optional[float]:
+        try:
+            return os.stat(self.config_path).st_mtime
+        except FileNotFoundError:
+            return None
+
+
+# 💡 슬롯/대기열은 이벤트 루프(워커 프로세스) 단위이므로 전역(Global)으로 관리
+admission_control = AdmissionControl()
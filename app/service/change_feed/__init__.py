@@ -0,0 +1 @@
+""" 노트 변경 피드 (WebSocket / SSE 구독) """
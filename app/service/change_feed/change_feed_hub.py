@@ -0,0 +1,195 @@
+# change_feed_hub.py
+
+import asyncio
+import json
+import os
+import re
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Set
+
+from app.config.app_path import DATA_DIR
+from app.service.metrics.note_metrics import NOTE_FEED_SUBSCRIBERS, NOTE_FEED_LAGGED_TOTAL
+from app.spec.biz.NoteChangeEvent import NoteChangeEvent
+
+# 큐가 넘친 구독자에게 마지막으로 전달되는 표식 (클라이언트는 다시 조회 후 재구독)
+LAGGED = {"event": "resync", "reason": "lagged"}
+
+
+class FeedSubscription:
+    """ 구독자 1명의 이벤트 큐. folders 가 비어 있으면 전체 노트를 구독 """
+
+    def __init__(self, folders: List[str], max_queue: int):
+        self.folders: List[str] = []
+        self.set_folders(folders)
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue)
+        self.lagged = False
+
+    def set_folders(self, folders: List[str]):
+        self.folders = [f.replace("\\", "/").strip("/") for f in folders if f and f.strip("/")]
+
+    def matches(self, file_path: str) -> bool:
+        if not self.folders:
+            return True
+        return any(file_path == f or file_path.startswith(f + "/") for f in self.folders)
+
+    async def next_event(self, timeout: float) -> Optional[dict]:
+        """ 다음 이벤트 (timeout 동안 없으면 None -> 호출 측에서 heartbeat 전송) """
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class ChangeFeedHub:
+    """
+    프로세스 내 pub/sub 변경 피드.
+    - 저장/동기화가 커밋된 뒤 NoteService 가 publish 하면 폴더가 맞는 구독자 큐에 넣습니다.
+    - 느린 구독자는 큐(max_queue)가 차는 순간 끊고 resync 표식을 보냅니다. (서버 메모리 보호)
+    - 멀티 워커에서는 relay 파일(append-only)로 다른 워커의 이벤트를 받아 자기 구독자에게 전달합니다.
+      relay 파일은 세대(change-feed.<N>.jsonl)별로 나뉘며, 리더는 파일을 비우는 대신 다음 세대를 만들고
+      한 세대 이전 파일까지는 남겨 두어 팔로워가 남은 줄을 끝까지 읽을 수 있게 합니다.
+    """
+
+    def __init__(self, relay_path: Optional[Path] = None, max_queue: int = 100, relay_interval: float = 0.5,
+                 relay_max_bytes: int = 1024 * 1024):
+        self.relay_path = Path(relay_path) if relay_path else DATA_DIR / "run" / "change-feed.jsonl"
+        self.max_queue = max_queue
+        self.relay_interval = relay_interval
+        self.relay_max_bytes = relay_max_bytes
+        self._subscribers: Set[FeedSubscription] = set()
+        self._listeners: List[Callable[[dict], None]] = []
+        self.relay_path.parent.mkdir(parents=True, exist_ok=True)
+        self._generation_pattern = re.compile(
+            rf"^{re.escape(self.relay_path.stem)}\.(\d+){re.escape(self.relay_path.suffix)}$")
+        # 이 워커가 기록하는 세대 (중계 루프가 더 새 세대를 보면 따라감)
+        self._generation = max(self._generations(), default=0)
+
+    def subscribe(self, folders: Optional[List[str]] = None) -> FeedSubscription:
+        subscription = FeedSubscription(folders or [], self.max_queue)
+        self._subscribers.add(subscription)
+        NOTE_FEED_SUBSCRIBERS.inc()
+        return subscription
+
+    def unsubscribe(self, subscription: FeedSubscription):
+        if subscription in self._subscribers:
+            self._subscribers.discard(subscription)
+            NOTE_FEED_SUBSCRIBERS.dec()
+
+    def add_listener(self, listener: Callable[[dict], None]):
+        """ 서버 내부 구독자 (예: 자동완성 색인). 이 워커와 다른 워커의 모든 이벤트를 받는다. """
+        self._listeners.append(listener)
+
+    def publish(self, event: NoteChangeEvent):
+        """ 이벤트 루프 스레드에서 호출 (NoteService 의 커밋 직후) """
+        event.origin_pid = os.getpid()
+        payload = event.model_dump(mode="json")
+        self._dispatch(payload)
+        self._append_relay(payload)
+
+    def _dispatch(self, payload: dict):
+        for listener in self._listeners:
+            try:
+                listener(payload)
+            except Exception as e:
+                print(f"[Error] 변경 피드 리스너 오류: {e}")
+        for subscription in list(self._subscribers):
+            if not subscription.matches(payload["file_path"]):
+                continue
+            try:
+                subscription.queue.put_nowait(payload)
+            except asyncio.QueueFull:
+                self._drop_lagged(subscription)
+
+    def _drop_lagged(self, subscription: FeedSubscription):
+        """ 밀린 이벤트를 버리고 resync 표식만 남긴 뒤 구독 해제 """
+        subscription.lagged = True
+        while not subscription.queue.empty():
+            subscription.queue.get_nowait()
+        subscription.queue.put_nowait(LAGGED)
+        self.unsubscribe(subscription)
+        NOTE_FEED_LAGGED_TOTAL.inc()
+
+    def _append_relay(self, payload: dict):
+        line = (json.dumps(payload, ensure_ascii=False) + "\n").encode("utf-8")
+        try:
+            # O_APPEND + 한 번의 write 로 기록해 워커 간 줄이 섞이지 않게 함
+            fd = os.open(self._generation_path(self._generation), os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                os.write(fd, line)
+            finally:
+                os.close(fd)
+        except OSError as e:
+            print(f"[Error] 변경 피드 중계 파일 기록 실패: {e}")
+
+    def _generation_path(self, generation: int) -> Path:
+        return self.relay_path.with_name(f"{self.relay_path.stem}.{generation}{self.relay_path.suffix}")
+
+    def _generations(self) -> Dict[int, Path]:
+        """ 남아 있는 relay 세대 파일 {세대: 경로} """
+        generations = {}
+        for path in self.relay_path.parent.iterdir():
+            match = self._generation_pattern.match(path.name)
+            if match:
+                generations[int(match.group(1))] = path
+        return generations
+
+    def _rotate(self, current: int):
+        """ 리더: 다음 세대 파일을 만들고, 두 세대 이전 파일부터 지운다. (직전 세대는 팔로워가 마저 읽도록 남김) """
+        next_generation = current + 1
+        os.close(os.open(self._generation_path(next_generation), os.O_WRONLY | os.O_CREAT, 0o644))
+        self._generation = max(self._generation, next_generation)
+        for generation, path in self._generations().items():
+            if generation < current:
+                path.unlink(missing_ok=True)
+
+    async def run_relay(self, can_rotate: Callable[[], bool] = lambda: False):
+        """
+        다른 워커가 relay 파일에 남긴 이벤트를 읽어 이 워커의 구독자에게 전달하는 루프.
+        남아 있는 세대 파일을 모두 세대별 offset 으로 읽으므로, 세대가 바뀐 직후 이전 세대에 기록된 줄도 놓치지 않는다.
+        can_rotate() 가 True 인 워커(리더)만 현재 세대 파일이 커지면 다음 세대로 넘긴다.
+        """
+        # 기동 이전에 쌓인 이벤트는 건너뜀
+        offsets = {generation: path.stat().st_size for generation, path in self._generations().items()}
+        my_pid = os.getpid()
+
+        while True:
+            await asyncio.sleep(self.relay_interval)
+            try:
+                generations = self._generations()
+                offsets = {generation: offsets.get(generation, 0) for generation in generations}
+                for generation in sorted(generations):
+                    offsets[generation] = self._read_relay(generations[generation], offsets[generation], my_pid)
+
+                current = max(generations, default=self._generation)
+                self._generation = max(self._generation, current)
+                if offsets.get(current, 0) > self.relay_max_bytes and can_rotate():
+                    self._rotate(current)
+            except Exception as e:
+                print(f"[Error] 변경 피드 중계 루프 오류: {e}")
+
+    def _read_relay(self, path: Path, offset: int, my_pid: int) -> int:
+        """ offset 이후에 추가된 완성된 줄을 전달하고 새 offset 을 반환 """
+        try:
+            size = path.stat().st_size
+        except FileNotFoundError:
+            return offset
+        if size <= offset:
+            return offset
+
+        with open(path, "rb") as f:
+            f.seek(offset)
+            chunk = f.read(size - offset)
+        # 아직 쓰는 중인 마지막 줄은 다음 주기에 읽음
+        complete = chunk.rfind(b"\n") + 1
+        for line in chunk[:complete].splitlines():
+            try:
+                payload = json.loads(line)
+            except ValueError:
+                continue
+            if payload.get("origin_pid") != my_pid:
+                self._dispatch(payload)
+        return offset + complete
+
+
+# 💡 구독자 목록은 프로세스 단위로 공유되어야 하므로 전역(Global)으로 관리
+change_feed_hub = ChangeFeedHub()
@@ -2,21 +2,27 @@ import asyncio
 import logging
 import os
 import subprocess
-from pathlib import Path
-from typing import Optional
+import time
+from typing import Dict, Optional
 
 from git import Repo, Actor
 
+from app.config.app_path import DATA_DIR
+from app.service.metrics.note_metrics import NOTE_SAVE_STAGE_SECONDS
+from app.service.metrics.request_tracer import traced
+from app.service.worker_coord.worker_coordinator import worker_coordinator
+
 
 class GitService:
-    def __init__(self, repo_path=None):
+    def __init__(self, repo_path=None, lock_name: str = "git-write"):
         if repo_path is None:
-            # 현재 테스트 폴더는 Root 폴더에 위치함
-            base_dir = Path(__file__).resolve().parent.parent.parent.parent
-            self.repo_path = base_dir / "data" / "note"
-            print(f"base_dir: {base_dir}, repo_path: {str(self.repo_path)}")
+            # 기본값: 프로젝트 루트의 data/note (NOTE_DATA_DIR 로 변경 가능)
+            self.repo_path = DATA_DIR / "note"
+            print(f"data_dir: {DATA_DIR}, repo_path: {str(self.repo_path)}")
         else:
             self.repo_path = repo_path
+        # 쓰기 직렬화 락 이름 (샤드 저장소는 샤드마다 다른 락을 쓴다)
+        self.lock_name = lock_name
 
         # GIT 저장소 초기화
         if not os.path.exists(os.path.join(self.repo_path, ".git")):
@@ -25,6 +31,7 @@ class GitService:
         else:
             self.repo = Repo(self.repo_path)
 
+    @traced("git.log")
     async def get_last_commit_hash(self, file_path: str) -> Optional[str]:
         """
         특정 파일의 최신 커밋 해시(Abbreviated Hash)를 가져옵니다.
@@ -52,6 +59,63 @@ class GitService:
             print(f"Git log error for {file_path}: {e}")
             return None
 
+    @traced("git.rev_parse")
+    async def resolve_archive_tree(self, rev: str, sub_path: Optional[str] = None) -> Optional[tuple]:
+        """
+        내보내기 대상 리비전/폴더를 검증합니다.
+        :return: (커밋 해시, git archive 에 넘길 tree-ish) / 리비전이나 폴더가 없으면 None
+        """
+        commit_hash = await self._run_git("rev-parse", "--verify", "--quiet", f"{rev}^{{commit}}")
+        if not commit_hash:
+            return None
+
+        if not sub_path:
+            return commit_hash, commit_hash
+
+        # <커밋>:<폴더> 형태의 tree-ish 를 쓰면 해당 폴더가 아카이브의 루트가 된다.
+        tree_ish = f"{commit_hash}:{sub_path}"
+        if await self._run_git("cat-file", "-t", tree_ish) != "tree":
+            return None
+        return commit_hash, tree_ish
+
+    async def stream_archive(self, tree_ish: str, archive_format: str = "tar", chunk_size: int = 64 * 1024):
+        """
+        git archive 의 출력을 청크 단위로 그대로 흘려보냅니다. (아카이브 전체를 메모리에 올리지 않음)
+        작업 디렉토리가 아닌 커밋된 tree 에서 만들기 때문에 저장 중에도 일관된 스냅샷이 보장됩니다.
+        """
+        process = await asyncio.create_subprocess_exec(
+            "git", "archive", f"--format={archive_format}", tree_ish,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+            cwd=self.repo_path
+        )
+        try:
+            while True:
+                chunk = await process.stdout.read(chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+            await process.wait()
+        finally:
+            # 클라이언트가 중간에 연결을 끊은 경우 git 프로세스 정리
+            if process.returncode is None:
+                process.kill()
+                await process.wait()
+
+    async def _run_git(self, *args) -> Optional[str]:
+        """ git 명령을 실행하고 성공 시 표준 출력(strip)을, 실패 시 None 을 반환 """
+        process = await asyncio.create_subprocess_exec(
+            "git", *args,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            cwd=self.repo_path
+        )
+        stdout, _ = await process.communicate()
+        if process.returncode != 0:
+            return None
+        return stdout.decode().strip()
+
+    @traced("git.history")
     def get_file_history(self, file_path: str):
         """ 특정 파일의 커밋 히스토리를 반환 """
         try:
@@ -72,12 +136,103 @@ class GitService:
 
     def write_and_commit(self, file_path, content, author_name, message):
         """ 신규 노트 생성 및 커밋 (경로 중복 및 타입 에러 방지) """
+        return self.write_many_and_commit([(file_path, content)], author_name, message)
+
+    @traced("git.write")
+    def write_many_and_commit(self, files, author_name, message):
+        """
+        여러 파일을 한 번에 쓰고 단일 커밋으로 기록합니다. (대량 가져오기용)
+        :param files: (file_path, content) 튜플 리스트
+        :return: 커밋 해시
+        """
+        # 💡 여러 워커가 동시에 커밋하면 .git/index.lock 충돌이 나므로 쓰기~커밋 구간을 프로세스 간 직렬화
+        lock_wait_started = time.perf_counter()
+        with worker_coordinator.repo_write_lock(self.lock_name):
+            NOTE_SAVE_STAGE_SECONDS.labels(stage="lock_wait").observe(time.perf_counter() - lock_wait_started)
+
+            formatted_rel_paths = []
+            previous = {}  # 물리 경로 -> 쓰기 전 파일 bytes (없던 파일은 None). 커밋 실패 시 되돌리기용
+            try:
+                with NOTE_SAVE_STAGE_SECONDS.labels(stage="file_write").time():
+                    for file_path, content in files:
+                        # 1. 경로 정규화 및 최종 물리 경로 (Full Path)
+                        rel_path_str = self._to_rel_path(file_path)
+                        full_path = os.path.join(str(self.repo_path), rel_path_str)
+
+                        # 폴더 생성
+                        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+                        if full_path not in previous:
+                            previous[full_path] = self._read_bytes(full_path)
+
+                        # 2. 파일 쓰기 (임시 파일 -> rename: 읽는 중인 요청/메모리 매핑은 이전 파일을 끝까지 본다)
+                        tmp_path = os.path.join(os.path.dirname(full_path), f".{os.path.basename(full_path)}.{os.getpid()}.tmp")
+                        with open(tmp_path, "w", encoding="UTF-8") as f:
+                            f.write(content)
+                        os.replace(tmp_path, full_path)
+
+                        # Git 인덱스에는 반드시 '/' 형태의 문자열 상대 경로여야 함
+                        # 여기서 str() 변환이 없으면 WindowsPath.replace() 에러가 발생함
+                        formatted_rel_paths.append(rel_path_str.replace("\\", "/"))
+
+                # 3. Git 인덱스 추가 (한 번에 stage)
+                with NOTE_SAVE_STAGE_SECONDS.labels(stage="git_add").time():
+                    self.repo.index.add(formatted_rel_paths)
+
+                # 4. 커밋 수행
+                # 이메일 형식이 Actor 객체 생성 방식에 맞게 수정됨
+                with NOTE_SAVE_STAGE_SECONDS.labels(stage="git_commit").time():
+                    author = Actor(author_name, f"{author_name}@company.com")
+                    commit = self.repo.index.commit(message, author=author)
+            except Exception:
+                # 커밋되지 않은 파일이 작업 디렉토리/인덱스에 남으면 다음 커밋에 섞여 들어가므로 쓰기 전 상태로 되돌린다.
+                self._restore_work_tree(previous, formatted_rel_paths)
+                raise
+
+        return commit.hexsha
+
+    def write_many_and_commit_by_path(self, files, author_name, message) -> Dict[str, str]:
+        """ write_many_and_commit 과 같지만 파일 경로별 커밋 해시를 돌려준다. (GitShardRouter 와 같은 인터페이스) """
+        commit_hash = self.write_many_and_commit(files, author_name, message)
+        return {str(file_path): commit_hash for file_path, _ in files}
 
-        # 0. 입력받은 file_path를 즉시 문자열로 변환 (WindowsPath 에러 방지)
+    @staticmethod
+    def _read_bytes(full_path: str) -> Optional[bytes]:
+        try:
+            with open(full_path, "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def _restore_work_tree(self, previous: Dict[str, Optional[bytes]], rel_paths):
+        """ 커밋 실패 시: 이번에 쓴 파일을 쓰기 전 내용으로 되돌리고(새 파일은 삭제) 인덱스에서도 내린다. """
+        for full_path, content in previous.items():
+            try:
+                if content is None:
+                    if os.path.exists(full_path):
+                        os.remove(full_path)
+                else:
+                    tmp_path = os.path.join(os.path.dirname(full_path), f".{os.path.basename(full_path)}.{os.getpid()}.tmp")
+                    with open(tmp_path, "wb") as f:
+                        f.write(content)
+                    os.replace(tmp_path, full_path)
+            except OSError as e:
+                print(f"[Error] 커밋 실패 후 파일 복구 실패 ({full_path}): {e}")
+        if not rel_paths:
+            return
+        try:
+            if self.repo.head.is_valid():
+                self.repo.git.reset("-q", "HEAD", "--", *rel_paths)
+            else:
+                self.repo.git.rm("-q", "--cached", "--ignore-unmatch", "--", *rel_paths)
+        except Exception as e:
+            print(f"[Error] 커밋 실패 후 git 인덱스 복구 실패: {e}")
+
+    def _to_rel_path(self, file_path) -> str:
+        """ 입력 경로를 repo_path 기준 상대 경로 문자열로 정규화 (경로 중복 및 타입 에러 방지) """
+        # 입력받은 file_path를 즉시 문자열로 변환 (WindowsPath 에러 방지)
         file_path_str = str(file_path)
         repo_path_str = str(self.repo_path)
 
-        # 1. 경로 정규화 (상대 경로 rel_path 추출)
         if os.path.isabs(file_path_str):
             # 절대 경로로 들어온 경우 repo_path 기준 상대 경로 추출
             rel_path = os.path.relpath(file_path_str, repo_path_str)
@@ -85,30 +240,10 @@ class GitService:
             # 상대 경로로 들어온 경우 중복된 repo_path 문자열 제거
             rel_path = file_path_str.replace(repo_path_str, "").lstrip("\\/")
 
-        # 2. 최종 물리 경로 (Full Path) - OS 표준 경로 사용
         # rel_path를 다시 한번 str로 감싸서 확실하게 문자열임을 보장
-        rel_path_str = str(rel_path)
-        full_path = os.path.join(repo_path_str, rel_path_str)
-
-        # 폴더 생성
-        os.makedirs(os.path.dirname(full_path), exist_ok=True)
-
-        # 3. 파일 쓰기
-        with open(full_path, "w", encoding="UTF-8") as f:
-            f.write(content)
-
-        # 4. Git 인덱스 추가 (반드시 '/' 형태의 문자열 상대 경로여야 함)
-        # 여기서 str() 변환이 없으면 WindowsPath.replace() 에러가 발생함
-        formatted_rel_path = rel_path_str.replace("\\", "/")
-        self.repo.index.add([formatted_rel_path])
-
-        # 5. 커밋 수행
-        # 이메일 형식이 Actor 객체 생성 방식에 맞게 수정됨
-        author = Actor(author_name, f"{author_name}@company.com")
-        commit = self.repo.index.commit(message, author=author)
-
-        return commit.hexsha
+        return str(rel_path)
 
+    @traced("git.history")
     def get_history_with_diff(self, file_name):
         """파일의 수정 이력과 실제 변경 내용(diff) 가져오기"""
         try:
@@ -187,6 +322,7 @@ class GitService:
                 if os.path.exists(p):
                     os.remove(p)
 
+    @traced("git.diff")
     def get_file_diff(self, commit_hash: str, file_path: str) -> str:
         """특정 커밋의 변경 사항(Diff)을 안정적으로 가져옵니다."""
         try:
@@ -209,6 +345,26 @@ class GitService:
         except Exception as e:
             return f"Diff 추출 실패: {str(e)}"
 
+    def resolve_commit(self, rev: str, file_path: Optional[str] = None) -> Optional[str]:
+        """ 리비전(약식 해시, HEAD~1 등)을 전체 커밋 해시로. 없으면 None (file_path 는 GitShardRouter 와 인터페이스 맞춤용) """
+        try:
+            return self.repo.commit(rev).hexsha
+        except Exception:
+            return None
+
+    @traced("git.blob")
+    def read_file_at_revision(self, commit_hash: str, file_path: str) -> Optional[str]:
+        """ 특정 커밋 시점의 파일 내용(blob)을 읽어옵니다. 해당 리비전에 파일이 없으면 None """
+        rel_path = str(file_path).replace("\\", "/")
+        try:
+            blob = self.repo.commit(commit_hash).tree / rel_path
+        except Exception as e:
+            print(f"Git blob not found ({commit_hash}:{rel_path}): {e}")
+            return None
+        # git show 와 달리 data_stream 은 마지막 개행을 지우지 않아 원본 그대로 읽힌다.
+        return blob.data_stream.read().decode("UTF-8")
+
+    @traced("file.read")
     def read_file_content(self, file_name: str) -> str:
         """ 현재 워킹 디렉토리의 파일 내용을 읽어옵니다. """
         import os
@@ -0,0 +1,172 @@
+# git_shard_router.py
+
+import os
+import subprocess
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from app.config.app_path import DATA_DIR
+from app.service.git_manage_service.git_poc import GitService
+
+# 💡 샤딩은 선택 기능: NOTE_GIT_SHARDS=1 이면 최상위 폴더(팀 네임스페이스)마다 독립된 git 저장소를 쓴다.
+# 기존 단일 저장소는 먼저 오프라인 분할 도구(git_shard_split.py)로 나눈 뒤 켜야 한다.
+GIT_SHARDING_ENABLED = os.getenv("NOTE_GIT_SHARDS", "0") == "1"
+
+# 폴더 없이 최상위에 있는 노트는 루트 저장소(data/note)에 그대로 둔다.
+ROOT_SHARD = ""
+
+# 레거시(분할 전) 저장소 검사는 프로세스당 저장소 경로별로 한 번만
+_checked_roots = set()
+
+
+def split_namespace(file_path) -> Tuple[str, str]:
+    """
+    노트 경로를 (네임스페이스, 샤드 저장소 기준 상대 경로)로 나눈다.
+    예: "팀A/회의/1월.md" -> ("팀A", "회의/1월.md"), "메모.md" -> ("", "메모.md")
+    """
+    rel_path = str(file_path).replace("\\", "/").lstrip("/")
+    if "/" not in rel_path:
+        return ROOT_SHARD, rel_path
+    namespace, rest = rel_path.split("/", 1)
+    return namespace, rest
+
+
+def list_shard_paths(repo_path: Path) -> List[Tuple[str, Path]]:
+    """ (네임스페이스, 저장소 경로) 목록. 루트 저장소가 항상 먼저 온다. """
+    repo_path = Path(repo_path)
+    shards = [(ROOT_SHARD, repo_path)]
+    if repo_path.exists():
+        for item in sorted(repo_path.iterdir()):
+            if item.is_dir() and not item.name.startswith(".") and (item / ".git").exists():
+                shards.append((item.name, item))
+    return shards
+
+
+class GitShardRouter:
+    """
+    최상위 폴더(팀 네임스페이스) -> 독립 git 저장소 라우터. GitService 와 같은 인터페이스를 제공한다.
+    - 샤드 저장소는 data/note/<네임스페이스>/.git 에 중첩되어 있어 작업 디렉토리 구조(파일 경로)는 그대로다.
+      (폴더 트리, 전체 동기화, 파일 읽기는 기존처럼 data/note 를 훑으면 모든 샤드가 함께 보인다)
+    - 쓰기/이력/diff/리비전 읽기는 경로의 네임스페이스로 해당 샤드에 위임하고,
+      쓰기 락도 샤드별로 분리되어 서로 다른 팀의 커밋은 병렬로 진행된다.
+    - 커밋 해시는 샤드 저장소 기준이므로 같은 해시라도 네임스페이스가 다르면 다른 커밋이다.
+    """
+
+    def __init__(self, repo_path=None):
+        self.repo_path = Path(repo_path) if repo_path is not None else DATA_DIR / "note"
+        self._shards: Dict[str, GitService] = {}
+        self._ensure_split()
+
+    def shard(self, namespace: str) -> GitService:
+        """ 네임스페이스의 GitService (처음 쓰는 네임스페이스면 저장소를 만든다) """
+        service = self._shards.get(namespace)
+        if service is None:
+            if namespace == ROOT_SHARD:
+                service = GitService(repo_path=self.repo_path)
+            else:
+                shard_path = self.repo_path / namespace
+                shard_path.mkdir(parents=True, exist_ok=True)
+                service = GitService(repo_path=shard_path, lock_name=f"git-write-{namespace}")
+            self._shards[namespace] = service
+        return service
+
+    def route(self, file_path) -> Tuple[GitService, str]:
+        namespace, rel_path = split_namespace(file_path)
+        return self.shard(namespace), rel_path
+
+    # --- 쓰기 ---
+
+    def write_and_commit(self, file_path, content, author_name, message):
+        service, rel_path = self.route(file_path)
+        return service.write_and_commit(rel_path, content, author_name, message)
+
+    def write_many_and_commit(self, files, author_name, message):
+        """ 한 샤드에 속한 파일들만 허용 (여러 샤드에 걸치면 write_many_and_commit_by_path 사용) """
+        commit_hashes = set(self.write_many_and_commit_by_path(files, author_name, message).values())
+        if len(commit_hashes) > 1:
+            raise ValueError("여러 샤드에 걸친 쓰기는 커밋 해시가 하나가 아닙니다. write_many_and_commit_by_path 를 사용하세요.")
+        return commit_hashes.pop() if commit_hashes else None
+
+    def write_many_and_commit_by_path(self, files, author_name, message) -> Dict[str, str]:
+        """ 파일을 샤드별로 묶어 샤드마다 한 번씩 커밋하고, 원래 경로 -> 커밋 해시를 돌려준다. """
+        grouped: Dict[str, List[Tuple[str, str, str]]] = {}
+        for file_path, content in files:
+            namespace, rel_path = split_namespace(file_path)
+            grouped.setdefault(namespace, []).append((str(file_path), rel_path, content))
+
+        commit_hashes = {}
+        for namespace, items in grouped.items():
+            commit_hash = self.shard(namespace).write_many_and_commit(
+                [(rel_path, content) for _, rel_path, content in items], author_name, message
+            )
+            commit_hashes.update({file_path: commit_hash for file_path, _, _ in items})
+        return commit_hashes
+
+    # --- 읽기/이력 ---
+
+    async def get_last_commit_hash(self, file_path: str) -> Optional[str]:
+        service, rel_path = self.route(file_path)
+        return await service.get_last_commit_hash(rel_path)
+
+    def get_file_history(self, file_path: str):
+        service, rel_path = self.route(file_path)
+        return service.get_file_history(rel_path)
+
+    def get_history_with_diff(self, file_name):
+        service, rel_path = self.route(file_name)
+        return service.get_history_with_diff(rel_path)
+
+    def get_file_diff(self, commit_hash: str, file_path: str) -> str:
+        service, rel_path = self.route(file_path)
+        return service.get_file_diff(commit_hash, rel_path)
+
+    def read_file_at_revision(self, commit_hash: str, file_path: str) -> Optional[str]:
+        service, rel_path = self.route(file_path)
+        return service.read_file_at_revision(commit_hash, rel_path)
+
+    def resolve_commit(self, rev: str, file_path: Optional[str] = None) -> Optional[str]:
+        service, _ = self.route(file_path or "")
+        return service.resolve_commit(rev)
+
+    def read_file_content(self, file_name: str) -> str:
+        service, rel_path = self.route(file_name)
+        return service.read_file_content(rel_path)
+
+    def merge_contents(self, base_content, local_content, remote_content):
+        # 저장소 상태와 무관한 3-way 병합이므로 루트 저장소에서 실행
+        return self.shard(ROOT_SHARD).merge_contents(base_content, local_content, remote_content)
+
+    # --- 내보내기 ---
+
+    async def resolve_archive_tree(self, rev: str, sub_path: Optional[str] = None) -> Optional[tuple]:
+        """
+        샤드 단위 내보내기. 커밋 해시가 샤드마다 다르므로 폴더를 지정해야 한다. (루트만 지정하면 루트 샤드)
+        :return: (커밋 해시, (네임스페이스, tree-ish)) / 없으면 None
+        """
+        namespace, rest = split_namespace(f"{sub_path}/" if sub_path else "")
+        if namespace != ROOT_SHARD and not (self.repo_path / namespace / ".git").exists():
+            return None
+        resolved = await self.shard(namespace).resolve_archive_tree(rev, rest.strip("/") or None)
+        if not resolved:
+            return None
+        commit_hash, tree_ish = resolved
+        return commit_hash, (namespace, tree_ish)
+
+    def stream_archive(self, tree_ish: tuple, archive_format: str = "tar", chunk_size: int = 64 * 1024):
+        namespace, shard_tree_ish = tree_ish
+        return self.shard(namespace).stream_archive(shard_tree_ish, archive_format, chunk_size)
+
+    def _ensure_split(self):
+        """ 분할 전 단일 저장소(루트가 하위 폴더를 추적 중)에서 샤딩을 켜면 같은 파일을 두 저장소가 추적하게 되므로 막는다. """
+        root_key = str(self.repo_path.resolve())
+        if root_key in _checked_roots or not (self.repo_path / ".git").exists():
+            return
+        result = subprocess.run(["git", "-c", "core.quotePath=false", "ls-tree", "-d", "--name-only", "HEAD"],
+                                cwd=self.repo_path, capture_output=True)
+        tracked_dirs = result.stdout.decode("utf-8", "replace").splitlines() if result.returncode == 0 else []
+        if tracked_dirs:
+            raise RuntimeError(
+                f"루트 저장소가 아직 폴더를 추적하고 있습니다 ({', '.join(tracked_dirs[:5])}). "
+                f"먼저 `python -m app.service.git_manage_service.git_shard_split` 으로 저장소를 분할하세요."
+            )
+        _checked_roots.add(root_key)
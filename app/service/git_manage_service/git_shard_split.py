@@ -0,0 +1,115 @@
+# git_shard_split.py
+"""
+기존 단일 노트 저장소(data/note)를 최상위 폴더(팀 네임스페이스)별 git 저장소로 나누는 오프라인 도구.
+서버를 모두 내린 상태에서 실행한 뒤 NOTE_GIT_SHARDS=1 로 다시 올린다.
+
+    python -m app.service.git_manage_service.git_shard_split [--repo data/note] [--dry-run]
+
+- 폴더마다 해당 폴더를 건드린 커밋만 골라 작성자/시각/메시지를 유지한 채 다시 커밋한다. (git subtree split 과 같은 결과)
+- 새 저장소는 data/note/<폴더>/.git 에 만들어지므로 작업 디렉토리의 파일은 움직이지 않는다.
+- 루트 저장소에서는 폴더들을 추적 해제하는 커밋 하나를 남긴다. (이전 이력은 루트에 그대로 남음)
+- 샤드의 커밋 해시는 새로 만들어지므로 재기동 시 리더의 동기화가 DB 의 커밋 해시를 갱신한다.
+  과거 버전 검색 색인(data/history-index)을 쓰고 있었다면 지우고 다시 만들어야 해시가 맞는다.
+"""
+
+import argparse
+import os
+import subprocess
+from pathlib import Path
+from typing import List, Optional
+
+from app.config.app_path import DATA_DIR
+from app.service.lang_analyzer.history_search_manager import history_index_root
+
+_EMPTY_TREE = "4b825dc642cb6eb9a060e54bf8d69288fbee4904"
+_SPLIT_REF_PREFIX = "refs/shard-split/"
+
+
+def _git(repo_path: Path, *args, env: Optional[dict] = None, check: bool = True) -> str:
+    result = subprocess.run(["git", "-c", "core.quotePath=false", *args], cwd=repo_path, capture_output=True,
+                            env={**os.environ, **env} if env else None)
+    if check and result.returncode != 0:
+        raise RuntimeError(f"git {' '.join(args)} 실패: {result.stderr.decode('utf-8', 'replace').strip()}")
+    return result.stdout.decode("utf-8", "replace").strip() if result.returncode == 0 else ""
+
+
+def list_namespaces(repo_path: Path) -> List[str]:
+    """ 루트 저장소 HEAD 가 추적 중인 최상위 폴더 목록 """
+    if not _git(repo_path, "rev-parse", "--verify", "--quiet", "HEAD", check=False):
+        return []
+    return [name for name in _git(repo_path, "ls-tree", "-d", "--name-only", "HEAD").splitlines()
+            if name and not name.startswith(".")]
+
+
+def split_history(repo_path: Path, namespace: str) -> Optional[str]:
+    """
+    namespace 폴더를 루트로 하는 이력을 루트 저장소의 객체 DB 안에 다시 만든다.
+    :return: 새 이력의 마지막 커밋 해시 (폴더를 건드린 커밋이 없으면 None)
+    """
+    commits = _git(repo_path, "rev-list", "--reverse", "--first-parent", "HEAD", "--", namespace).split()
+    parent = None
+    for commit in commits:
+        tree = _git(repo_path, "rev-parse", "--verify", "--quiet", f"{commit}:{namespace}", check=False) or _EMPTY_TREE
+        fields = _git(repo_path, "log", "-1", "--format=%an%x00%ae%x00%aI%x00%cn%x00%ce%x00%cI%x00%B", commit)
+        author_name, author_email, author_date, committer_name, committer_email, committer_date, message = \
+            fields.split("\x00", 6)
+        env = {
+            "GIT_AUTHOR_NAME": author_name, "GIT_AUTHOR_EMAIL": author_email, "GIT_AUTHOR_DATE": author_date,
+            "GIT_COMMITTER_NAME": committer_name, "GIT_COMMITTER_EMAIL": committer_email,
+            "GIT_COMMITTER_DATE": committer_date,
+        }
+        parent_args = ["-p", parent] if parent else []
+        parent = _git(repo_path, "commit-tree", tree, *parent_args, "-m", message or "(no message)", env=env)
+    return parent
+
+
+def split_repository(repo_path: Path, dry_run: bool = False) -> List[str]:
+    """ 루트 저장소의 최상위 폴더들을 샤드 저장소로 분할하고 분할한 네임스페이스 목록을 돌려준다. """
+    repo_path = Path(repo_path)
+    namespaces = list_namespaces(repo_path)
+    if not namespaces:
+        print(f"분할할 폴더가 없습니다: {repo_path}")
+        return []
+
+    for namespace in namespaces:
+        shard_path = repo_path / namespace
+        if (shard_path / ".git").exists():
+            raise RuntimeError(f"이미 git 저장소가 있는 폴더입니다: {shard_path}")
+
+    print(f"분할 대상 ({len(namespaces)}): {', '.join(namespaces)}")
+    if dry_run:
+        return namespaces
+
+    for namespace in namespaces:
+        shard_path = repo_path / namespace
+        head = split_history(repo_path, namespace)
+        if head is None:
+            continue
+        split_ref = f"{_SPLIT_REF_PREFIX}{namespace}"
+        _git(repo_path, "update-ref", split_ref, head)
+
+        # 루트 저장소 객체 DB 에서 분할한 이력만 가져와 작업 디렉토리(이미 있는 파일)에 맞춰 인덱스를 만든다.
+        _git(shard_path, "init", "-q")
+        branch = _git(shard_path, "symbolic-ref", "--short", "HEAD")
+        _git(shard_path, "fetch", "-q", "--update-head-ok", str(repo_path.resolve()), f"{split_ref}:refs/heads/{branch}")
+        _git(shard_path, "reset", "-q")
+        _git(repo_path, "update-ref", "-d", split_ref)
+        print(f"  {namespace}: {head[:10]} ({_git(shard_path, 'rev-list', '--count', 'HEAD')} commits)")
+
+    # 루트 저장소에서는 폴더 추적을 끊는다. (파일은 지우지 않음)
+    _git(repo_path, "rm", "-r", "-q", "--cached", "--", *namespaces)
+    _git(repo_path, "commit", "-q", "-m", f"Split {len(namespaces)} namespaces into shard repositories",
+         env={"GIT_AUTHOR_NAME": "SYSTEM", "GIT_AUTHOR_EMAIL": "SYSTEM@company.com",
+              "GIT_COMMITTER_NAME": "SYSTEM", "GIT_COMMITTER_EMAIL": "SYSTEM@company.com"})
+    history_index_path = history_index_root()
+    if history_index_path.exists():
+        print(f"[Warn] 과거 버전 검색 색인을 지우고 재기동하세요: {history_index_path}")
+    return namespaces
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="노트 저장소를 최상위 폴더별 git 저장소로 분할")
+    parser.add_argument("--repo", type=Path, default=DATA_DIR / "note", help="분할할 루트 저장소 (기본: data/note)")
+    parser.add_argument("--dry-run", action="store_true", help="분할 대상만 출력")
+    args = parser.parse_args()
+    split_repository(args.repo, dry_run=args.dry_run)
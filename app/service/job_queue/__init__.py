@@ -0,0 +1 @@
+""" 커밋 이후 작업(색인, 캐시 등)의 영속 작업 큐 """
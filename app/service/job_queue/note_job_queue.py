@@ -0,0 +1,91 @@
+# note_job_queue.py
+
+import json
+from datetime import datetime, timezone
+from typing import List, Optional
+
+from sqlalchemy import select, func, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database.note_mng.model.note_job_model import NoteJob
+from app.spec.constant.ModelEnums import JobStatusEnum
+
+# 작업 종류
+JOB_INDEX = "index"  # 검색 색인 갱신 (노트의 현재 리비전 기준)
+JOB_HTML_WARM = "html_warm"  # 렌더링 HTML 캐시 미리 채우기
+JOB_SIMILARITY = "similarity"  # 유사도 시그니처 갱신 (노트의 현재 리비전 기준)
+
+
+def utc_now() -> datetime:
+    """ SQLite CURRENT_TIMESTAMP 와 같은 기준(UTC, tz 없음) """
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+class NoteJobQueue:
+    """
+    NOTE_JOB 테이블 기반 영속 작업 큐 (적재/조회). 실행은 NoteJobWorker 가 담당한다.
+    - enqueue 는 커밋하지 않으므로 호출 측(NoteService)의 NoteMetadata 변경과 같은 트랜잭션에 묶인다.
+    - 같은 idempotency_key 는 한 번만 적재된다. (INSERT OR IGNORE)
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def enqueue(self, job_type: str, idempotency_key: str, payload: dict, max_attempts: int = 5):
+        stmt = sqlite_insert(NoteJob).values(
+            job_type=job_type,
+            idempotency_key=idempotency_key,
+            payload=json.dumps(payload, ensure_ascii=False),
+            status=JobStatusEnum.PENDING,
+            attempts=0,
+            max_attempts=max_attempts,
+            next_run_at=utc_now(),
+        ).on_conflict_do_nothing(index_elements=["idempotency_key"])
+        await self.db.execute(stmt)
+
+    async def enqueue_post_commit(self, note_id: str, file_path: str, commit_hash: Optional[str]):
+        """ 노트 저장 후 작업: 색인 + 유사도 시그니처 + HTML 캐시 (키는 노트/커밋 단위) """
+        await self.enqueue(JOB_INDEX, f"{JOB_INDEX}:{note_id}:{commit_hash}", {"note_id": note_id})
+        await self.enqueue(JOB_SIMILARITY, f"{JOB_SIMILARITY}:{note_id}:{commit_hash}", {"note_id": note_id})
+        if commit_hash:
+            await self.enqueue(JOB_HTML_WARM, f"{JOB_HTML_WARM}:{note_id}:{commit_hash}",
+                               {"file_path": file_path, "commit_hash": commit_hash})
+
+    # --- 관리자 조회 ---
+
+    async def summary(self) -> List[dict]:
+        stmt = select(NoteJob.job_type, NoteJob.status, func.count()).group_by(NoteJob.job_type, NoteJob.status)
+        return [{"job_type": job_type, "status": status, "count": count}
+                for job_type, status, count in (await self.db.execute(stmt)).all()]
+
+    async def list_jobs(self, status: Optional[JobStatusEnum] = None, limit: int = 100) -> List[dict]:
+        stmt = select(NoteJob).order_by(NoteJob.id.desc()).limit(limit)
+        if status is not None:
+            stmt = stmt.where(NoteJob.status == status)
+        return [self._to_dict(job) for job in (await self.db.execute(stmt)).scalars()]
+
+    async def retry(self, job_id: int) -> bool:
+        """ 실패한 작업을 다시 대기 상태로 (시도 횟수 초기화) """
+        result = await self.db.execute(
+            update(NoteJob).where(NoteJob.id == job_id, NoteJob.status == JobStatusEnum.FAILED)
+            .values(status=JobStatusEnum.PENDING, attempts=0, next_run_at=utc_now(), last_error=None)
+        )
+        await self.db.commit()
+        return result.rowcount > 0
+
+    @staticmethod
+    def _to_dict(job: NoteJob) -> dict:
+        return {
+            "id": job.id,
+            "job_type": job.job_type,
+            "idempotency_key": job.idempotency_key,
+            "payload": json.loads(job.payload),
+            "status": job.status,
+            "attempts": job.attempts,
+            "max_attempts": job.max_attempts,
+            "next_run_at": job.next_run_at,
+            "last_error": job.last_error,
+            "crt_dt": job.crt_dt,
+            "mdfy_dt": job.mdfy_dt,
+        }
@@ -0,0 +1,180 @@
+# note_job_worker.py
+
+import asyncio
+import json
+import os
+import time
+import uuid
+from datetime import timedelta
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from sqlalchemy import select, update, delete, func
+
+from app.database.note_mng.connection import AsyncSessionLocal
+from app.database.note_mng.model.note_job_model import NoteJob
+from app.service.job_queue.note_job_queue import utc_now
+from app.service.metrics.note_metrics import NOTE_JOB_TOTAL, NOTE_JOB_SECONDS, NOTE_QUEUE_DEPTH
+from app.spec.constant.ModelEnums import JobStatusEnum
+
+# 핸들러는 같은 종류의 작업 payload 를 한 번에 받는다. (예: 색인은 writer 세션 한 번으로)
+JobHandler = Callable[[List[dict]], Awaitable[None]]
+
+
+class NoteJobWorker:
+    """
+    NOTE_JOB 테이블을 소비하는 워커 풀 (워커 프로세스마다 concurrency 개의 asyncio 태스크).
+    - claim 은 UPDATE ... WHERE status=PENDING 한 문장이라 여러 프로세스가 같은 작업을 가져가지 않는다.
+    - 배치가 실패하면 한 건씩 다시 실행해 실패한 작업만 지수 backoff 로 재시도하고 max_attempts 를 넘으면 FAILED 로 남긴다. (관리자 API 로 재시도)
+    - 실행 중 프로세스가 죽은 작업은 lease 가 지나면 다시 PENDING 으로 회수된다.
+    """
+
+    def __init__(self, concurrency: int = 2, batch_size: int = 50, poll_interval: float = 2.0,
+                 lease_seconds: int = 300, backoff_base: float = 2.0, backoff_max: float = 600.0,
+                 retention_seconds: int = 24 * 3600):
+        self.concurrency = concurrency
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.lease_seconds = lease_seconds
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.retention_seconds = retention_seconds
+        self._handlers: Dict[str, JobHandler] = {}
+        self._wake = asyncio.Event()
+        self._last_cleanup = 0.0
+
+    def register(self, job_type: str, handler: JobHandler):
+        self._handlers[job_type] = handler
+
+    def notify(self):
+        """ 적재한 트랜잭션이 커밋된 뒤 호출: 폴링을 기다리지 않고 바로 실행 """
+        self._wake.set()
+
+    async def run(self):
+        await asyncio.gather(*(self._loop() for _ in range(self.concurrency)))
+
+    async def run_pending(self) -> int:
+        """ 지금 실행 가능한 작업을 모두 처리 (처리한 작업 수 반환) """
+        processed = 0
+        while True:
+            jobs = await self._claim()
+            if not jobs:
+                return processed
+            await self._execute(jobs)
+            processed += len(jobs)
+
+    async def _loop(self):
+        while True:
+            try:
+                await self.run_pending()
+                await self._cleanup_if_due()
+            except Exception as e:
+                print(f"[Error] 작업 큐 워커 오류: {e}")
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+
+    async def _claim(self) -> List[NoteJob]:
+        now = utc_now()
+        token = f"{os.getpid()}-{uuid.uuid4().hex[:12]}"
+        async with AsyncSessionLocal() as session:
+            # 실행 중에 프로세스가 죽어 lease 가 지난 작업 회수
+            await session.execute(
+                update(NoteJob).where(NoteJob.status == JobStatusEnum.RUNNING,
+                                      NoteJob.locked_at < now - timedelta(seconds=self.lease_seconds))
+                .values(status=JobStatusEnum.PENDING, claim_token=None)
+            )
+
+            due = (NoteJob.status == JobStatusEnum.PENDING) & (NoteJob.next_run_at <= now)
+            job_type = (await session.execute(
+                select(NoteJob.job_type).where(due).order_by(NoteJob.id).limit(1)
+            )).scalar()
+            if job_type is None:
+                await session.commit()
+                return []
+
+            ids = select(NoteJob.id).where(due, NoteJob.job_type == job_type).order_by(NoteJob.id) \
+                .limit(self.batch_size).scalar_subquery()
+            await session.execute(
+                update(NoteJob).where(NoteJob.id.in_(ids), NoteJob.status == JobStatusEnum.PENDING)
+                .values(status=JobStatusEnum.RUNNING, claim_token=token, locked_at=now,
+                        attempts=NoteJob.attempts + 1)
+                .execution_options(synchronize_session=False)
+            )
+            await session.commit()
+            return list((await session.execute(select(NoteJob).where(NoteJob.claim_token == token))).scalars())
+
+    async def _execute(self, jobs: List[NoteJob]):
+        job_type = jobs[0].job_type
+        handler = self._handlers.get(job_type)
+        started = time.perf_counter()
+        if handler is None:
+            error = f"RuntimeError: 등록된 핸들러가 없는 작업 종류: {job_type}"
+            errors = {job.id: error for job in jobs}
+        else:
+            error = await self._call(handler, jobs)
+            errors = {job.id: error for job in jobs} if error else {}
+            if error and len(jobs) > 1:
+                # 배치 실패: 한 건씩 다시 실행해서 실패한 payload 의 작업만 재시도/실패로 남긴다
+                errors = {}
+                for job in jobs:
+                    job_error = await self._call(handler, [job])
+                    if job_error:
+                        errors[job.id] = job_error
+        NOTE_JOB_SECONDS.labels(job_type=job_type).observe(time.perf_counter() - started)
+
+        async with AsyncSessionLocal() as session:
+            done_ids = [job.id for job in jobs if job.id not in errors]
+            if done_ids:
+                await session.execute(
+                    update(NoteJob).where(NoteJob.id.in_(done_ids))
+                    .values(status=JobStatusEnum.DONE, claim_token=None, last_error=None)
+                )
+                NOTE_JOB_TOTAL.labels(job_type=job_type, result="done").inc(len(done_ids))
+            for job in jobs:
+                if job.id not in errors:
+                    continue
+                exhausted = job.attempts >= job.max_attempts
+                delay = min(self.backoff_base ** job.attempts, self.backoff_max)
+                await session.execute(
+                    update(NoteJob).where(NoteJob.id == job.id).values(
+                        status=JobStatusEnum.FAILED if exhausted else JobStatusEnum.PENDING,
+                        claim_token=None,
+                        next_run_at=utc_now() + timedelta(seconds=delay),
+                        last_error=errors[job.id][:2000],
+                    )
+                )
+                NOTE_JOB_TOTAL.labels(job_type=job_type, result="failed" if exhausted else "retry").inc()
+            await session.commit()
+
+    @staticmethod
+    async def _call(handler: JobHandler, jobs: List[NoteJob]) -> Optional[str]:
+        """ 핸들러 실행 (실패하면 오류 메시지 반환) """
+        try:
+            await handler([json.loads(job.payload) for job in jobs])
+            return None
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            print(f"[Error] 작업 실패 ({jobs[0].job_type} x{len(jobs)}): {error}")
+            return error
+
+    async def _cleanup_if_due(self):
+        """ 완료된 작업은 보존 기간이 지나면 삭제하고, 대기 건수를 지표로 남긴다. (1분에 한 번) """
+        if time.monotonic() - self._last_cleanup < 60:
+            return
+        self._last_cleanup = time.monotonic()
+        async with AsyncSessionLocal() as session:
+            await session.execute(
+                delete(NoteJob).where(NoteJob.status == JobStatusEnum.DONE,
+                                      NoteJob.mdfy_dt < utc_now() - timedelta(seconds=self.retention_seconds))
+            )
+            pending = (await session.execute(
+                select(func.count()).select_from(NoteJob).where(NoteJob.status == JobStatusEnum.PENDING)
+            )).scalar()
+            await session.commit()
+        NOTE_QUEUE_DEPTH.labels(queue="jobs").set(pending)
+
+
+# 💡 핸들러 등록/깨우기는 프로세스 단위이므로 전역(Global)으로 관리
+note_job_worker = NoteJobWorker()
@@ -0,0 +1,68 @@
+# hangul_jamo.py
+
+import re
+import unicodedata
+
+# 💡 한글 음절(가~힣) = 0xAC00 + (초성 * 21 + 중성) * 28 + 종성
+_HANGUL_BASE = 0xAC00
+_HANGUL_LAST = 0xD7A3
+
+_CHOSEONG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+_JUNGSEONG = "ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ"
+_JONGSEONG = ["", "ㄱ", "ㄲ", "ㄳ", "ㄴ", "ㄵ", "ㄶ", "ㄷ", "ㄹ", "ㄺ", "ㄻ", "ㄼ", "ㄽ", "ㄾ", "ㄿ", "ㅀ", "ㅁ",
+              "ㅂ", "ㅄ", "ㅅ", "ㅆ", "ㅇ", "ㅈ", "ㅊ", "ㅋ", "ㅌ", "ㅍ", "ㅎ"]
+
+# 겹자음/겹모음은 입력 순서대로 풀어야 "닭" 입력 중의 "달" 이 "닭" 의 접두어가 된다.
+_COMPOUND = {
+    "ㄳ": "ㄱㅅ", "ㄵ": "ㄴㅈ", "ㄶ": "ㄴㅎ", "ㄺ": "ㄹㄱ", "ㄻ": "ㄹㅁ", "ㄼ": "ㄹㅂ", "ㄽ": "ㄹㅅ", "ㄾ": "ㄹㅌ",
+    "ㄿ": "ㄹㅍ", "ㅀ": "ㄹㅎ", "ㅄ": "ㅂㅅ",
+    "ㅘ": "ㅗㅏ", "ㅙ": "ㅗㅐ", "ㅚ": "ㅗㅣ", "ㅝ": "ㅜㅓ", "ㅞ": "ㅜㅔ", "ㅟ": "ㅜㅣ", "ㅢ": "ㅡㅣ",
+}
+
+_SPACES = re.compile(r"\s+")
+
+
+def _split_compound(jamo: str) -> str:
+    return _COMPOUND.get(jamo, jamo)
+
+
+def _to_compat_jamo(ch: str) -> str:
+    """ 조합형 자모(U+1100~)를 호환 자모(ㄱ, ㅏ ...)로 변환 """
+    code = ord(ch)
+    if 0x1100 <= code < 0x1100 + len(_CHOSEONG):
+        return _CHOSEONG[code - 0x1100]
+    if 0x1161 <= code < 0x1161 + len(_JUNGSEONG):
+        return _JUNGSEONG[code - 0x1161]
+    if 0x11A8 <= code < 0x11A8 + len(_JONGSEONG) - 1:
+        return _JONGSEONG[code - 0x11A8 + 1]
+    return ch
+
+
+def decompose(text: str) -> str:
+    """
+    한글 음절을 입력 순서의 자모열로 분해합니다. (그 외 문자는 그대로)
+    예: "한글" -> "ㅎㅏㄴㄱㅡㄹ", "닭" -> "ㄷㅏㄹㄱ"
+    """
+    result = []
+    for ch in text:
+        code = ord(ch)
+        if _HANGUL_BASE <= code <= _HANGUL_LAST:
+            offset = code - _HANGUL_BASE
+            result.append(_CHOSEONG[offset // 588])
+            result.append(_split_compound(_JUNGSEONG[(offset % 588) // 28]))
+            result.append(_split_compound(_JONGSEONG[offset % 28]))
+        else:
+            result.append(_split_compound(_to_compat_jamo(ch)))
+    return "".join(result)
+
+
+def normalize_for_match(text: str) -> str:
+    """
+    자동완성 비교용 정규화: 전각/조합형 문자 통일 -> 소문자 -> 공백 정리 -> 자모 분해.
+    입력 중인 "하ㄴ", 완성된 "한" 모두 "ㅎㅏㄴ" 이 되어 "하나"/"한국" 의 접두어로 매칭된다.
+    """
+    # NFKC 는 호환 자모(ㄴ)를 조합형(ᄂ)으로 바꾸므로 호환 자모는 그대로 두고 나머지(전각 문자 등)만 적용
+    text = "".join(ch if 0x3131 <= ord(ch) <= 0x318E else unicodedata.normalize("NFKC", ch) for ch in text or "")
+    # 조합형 자모로 들어온 음절(ᄒ+ᅡ+ᆫ)은 NFC 로 완성형(한)으로 합친 뒤 분해
+    text = unicodedata.normalize("NFC", text).lower()
+    return decompose(_SPACES.sub(" ", text).strip())
@@ -0,0 +1,244 @@
+# history_search_manager.py
+
+import os
+import subprocess
+from urllib.parse import quote
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from whoosh.fields import Schema, ID, TEXT, NUMERIC, STORED
+from whoosh.index import open_dir, create_in, exists_in
+
+from app.config.app_path import DATA_DIR
+from app.service.git_manage_service.git_shard_router import GIT_SHARDING_ENABLED, ROOT_SHARD, list_shard_paths
+from app.service.lang_analyzer.search_manager import ANALYZER_KOMORAN, ANALYZER_NGRAM, ANALYZER_VERSIONS, \
+    SEARCH_ANALYZER, komoran_analyzer, ngram_analyzer
+from app.service.metrics.note_metrics import NOTE_INDEX_COMMIT_SECONDS, NOTE_SEARCH_SECONDS
+from app.service.metrics.request_tracer import traced
+
+# 💡 과거 버전 검색은 선택 기능: NOTE_HISTORY_INDEX=1 일 때만 리더가 색인을 만든다.
+HISTORY_INDEX_ENABLED = os.getenv("NOTE_HISTORY_INDEX", "0") == "1"
+
+CHANGE_ADDED = "added"
+CHANGE_REMOVED = "removed"
+
+# 리더 주기 작업 1회에 반영할 최대 커밋 수 (백필이 길어져도 다른 주기 작업을 막지 않도록)
+_COMMITS_PER_TICK = 200
+_COMMIT_MARK = "\x1e@@NOTE_COMMIT@@"
+
+_HISTORY_WRITE_LOCK = threading.Lock()
+
+
+def history_analyzer(search_analyzer: str = SEARCH_ANALYZER) -> str:
+    """ 이력 색인 분석기: 본문 검색이 ngram 이면 이력도 2-gram (저장 후 커밋을 반영할 때 Komoran/JVM 을 쓰지 않도록) """
+    return ANALYZER_NGRAM if search_analyzer == ANALYZER_NGRAM else ANALYZER_KOMORAN
+
+
+def history_index_root(search_analyzer: str = SEARCH_ANALYZER) -> Path:
+    """ 분석기별 이력 색인 디렉토리 (komoran 은 기존 data/history-index, 새 디렉토리는 cursor 가 없어 전체 이력을 다시 색인) """
+    analyzer = history_analyzer(search_analyzer)
+    if analyzer == ANALYZER_KOMORAN:
+        return DATA_DIR / "history-index"
+    return DATA_DIR / f"history-index-{analyzer}-v{ANALYZER_VERSIONS[analyzer]}"
+
+
+def parse_commit_deltas(show_output: str) -> List[dict]:
+    """
+    `git show --unified=0 --format=<_COMMIT_MARK>%H%x09%an%x09%ct` 출력을 (커밋, 파일, 추가/삭제) 단위로 묶는다.
+    문맥 줄 없이 실제로 추가/삭제된 줄만 모은다.
+    """
+    deltas: Dict[Tuple[str, str, str], dict] = {}
+    commit = None
+    old_path = new_path = None
+    in_header = False  # "diff --git" ~ 첫 "@@" 사이 (본문의 "--- x" 삭제 줄과 헤더를 구분)
+
+    for line in show_output.split("\n"):
+        if line.startswith(_COMMIT_MARK):
+            sha, author, committed = line[len(_COMMIT_MARK):].split("\t", 2)
+            commit = {"sha": sha, "author": author, "committed_at": int(committed)}
+            old_path = new_path = None
+            in_header = False
+        elif commit is None:
+            continue
+        elif line.startswith("diff --git "):
+            old_path = new_path = None
+            in_header = True
+        elif in_header:
+            if line.startswith("--- "):
+                old_path = None if line[4:] == "/dev/null" else line[6:]
+            elif line.startswith("+++ "):
+                new_path = None if line[4:] == "/dev/null" else line[6:]
+            elif line.startswith("@@"):
+                in_header = False
+        elif line.startswith(("+", "-")) and (new_path or old_path):
+            path = new_path or old_path
+            if not path.lower().endswith(".md"):
+                continue
+            kind = CHANGE_ADDED if line[0] == "+" else CHANGE_REMOVED
+            key = (commit["sha"], path, kind)
+            if key not in deltas:
+                deltas[key] = {**commit, "path": path, "kind": kind, "lines": []}
+            deltas[key]["lines"].append(line[1:])
+
+    return [d for d in deltas.values() if any(text.strip() for text in d["lines"])]
+
+
+class NoteHistorySearchManager:
+    """
+    과거 버전 검색용 Whoosh 색인. 본문 전체가 아니라 커밋마다 추가/삭제된 줄만 색인하므로 작게 유지된다.
+    - 색인 대상은 git 커밋 이력 자체: 마지막으로 반영한 커밋(cursor) 이후의 커밋만 리더가 주기적으로 반영
+      (저장/가져오기 커밋은 어느 워커에서 만들어졌든 같은 경로로 들어오고, 최초 실행 시에는 전체 이력 백필)
+    - 검색 결과는 해당 텍스트가 추가되었거나 삭제된 커밋 해시를 함께 돌려준다.
+    - git 샤딩(NOTE_GIT_SHARDS=1) 시에는 샤드 저장소마다 cursor 를 따로 두고 경로에 네임스페이스를 붙여 색인한다.
+    """
+
+    def __init__(self, repo_path: Path, index_dir=None, search_analyzer: str = SEARCH_ANALYZER):
+        self.repo_path = Path(repo_path)
+        self.index_path = Path(index_dir) if index_dir else history_index_root(search_analyzer)
+        if history_analyzer(search_analyzer) == ANALYZER_NGRAM:
+            content = TEXT(analyzer=ngram_analyzer(), multitoken_query="phrase")
+        else:
+            content = TEXT(analyzer=komoran_analyzer())
+
+        if not self.index_path.exists():
+            self.index_path.mkdir(parents=True, exist_ok=True)
+
+        self.schema = Schema(
+            doc_id=ID(unique=True),  # 커밋:경로:종류
+            commit=ID(stored=True),
+            path=ID(stored=True),
+            kind=ID(stored=True),
+            author=STORED,
+            committed_at=NUMERIC(stored=True, sortable=True),
+            content=content,  # 원문은 git 에 있으므로 저장하지 않음
+        )
+
+        if not exists_in(str(self.index_path)):
+            print(f"🔍 [System] 새 이력 색인 생성 중: {self.index_path}")
+            create_in(str(self.index_path), self.schema)
+        self.ix = open_dir(str(self.index_path))
+
+    def catch_up(self, max_commits: int = _COMMITS_PER_TICK) -> int:
+        """ 리더 전용: 저장소(샤드)별 cursor 이후 커밋의 변경분을 색인 (반영한 커밋 수 반환) """
+        sources = list_shard_paths(self.repo_path) if GIT_SHARDING_ENABLED else [(ROOT_SHARD, self.repo_path)]
+        applied = 0
+        for namespace, repo_path in sources:
+            if applied >= max_commits:
+                break
+            applied += self._catch_up_source(namespace, repo_path, max_commits - applied)
+        return applied
+
+    def _catch_up_source(self, namespace: str, repo_path: Path, max_commits: int) -> int:
+        with _HISTORY_WRITE_LOCK:
+            cursor_path = self._cursor_path(namespace)
+            commits = self._pending_commits(repo_path, cursor_path, max_commits)
+            if not commits:
+                return 0
+
+            output = self._git(
+                repo_path, "show", "--unified=0", "--no-color", "--no-renames", "--diff-merges=first-parent",
+                f"--format={_COMMIT_MARK}%H%x09%an%x09%ct", *commits,
+            )
+            if output is None:
+                return 0
+            deltas = parse_commit_deltas(output)
+            if GIT_SHARDING_ENABLED and namespace == ROOT_SHARD:
+                # 분할 전 루트 이력에 남은 폴더 변경분은 샤드 저장소 이력으로 색인되므로 제외
+                deltas = [delta for delta in deltas if "/" not in delta["path"]]
+
+            writer = self.ix.writer()
+            for delta in deltas:
+                path = f"{namespace}/{delta['path']}" if namespace else delta["path"]
+                writer.update_document(
+                    doc_id=f"{delta['sha']}:{path}:{delta['kind']}",
+                    commit=delta["sha"],
+                    path=path,
+                    kind=delta["kind"],
+                    author=delta["author"],
+                    committed_at=delta["committed_at"],
+                    content="\n".join(delta["lines"]),
+                )
+            with NOTE_INDEX_COMMIT_SECONDS.labels(kind="history").time():
+                writer.commit()
+
+            self._write_cursor(cursor_path, commits[-1])
+        print(f"history index {namespace or '(root)'}: {len(commits)} commits ({len(deltas)} deltas) applied")
+        return len(commits)
+
+    def optimize(self) -> int:
+        """ 리더 전용(유지보수): 세그먼트를 하나로 합친다. (합치기 전 세그먼트 수 반환) """
+        with _HISTORY_WRITE_LOCK:
+            segments = self.segment_count()
+            if segments > 1:
+                with NOTE_INDEX_COMMIT_SECONDS.labels(kind="optimize").time():
+                    self.ix.optimize()
+        return segments
+
+    def segment_count(self) -> int:
+        with self.ix.reader() as reader:
+            return len(reader.leaf_readers())
+
+    @traced("search.history")
+    def search(self, keyword: str, limit: int = 20, kind: Optional[str] = None) -> List[dict]:
+        """ 과거 변경분 검색: 텍스트가 추가/삭제된 커밋 목록 (최근 커밋 우선) """
+        from whoosh.qparser import QueryParser
+        from whoosh.query import Term, And
+
+        with NOTE_SEARCH_SECONDS.time(), self.ix.searcher() as searcher:
+            query = QueryParser("content", self.ix.schema).parse(keyword)
+            if kind:
+                query = And([query, Term("kind", kind)])
+            results = searcher.search(query, limit=limit, sortedby="committed_at", reverse=True)
+            return [
+                {
+                    "commit_hash": hit["commit"],
+                    "file_path": hit["path"],
+                    "title": Path(hit["path"]).stem,
+                    "change": hit["kind"],
+                    "author": hit["author"],
+                    "committed_at": datetime.fromtimestamp(hit["committed_at"], tz=timezone.utc),
+                }
+                for hit in results
+            ]
+
+    def _pending_commits(self, repo_path: Path, cursor_path: Path, max_commits: int) -> List[str]:
+        cursor = self._read_cursor(cursor_path)
+        if self._git(repo_path, "rev-parse", "--verify", "--quiet", "HEAD") is None:
+            return []  # 아직 커밋이 없는 저장소
+        rev_range = "HEAD"
+        if cursor:
+            if self._git(repo_path, "merge-base", "--is-ancestor", cursor, "HEAD") is None:
+                print(f"[Warn] 이력 색인 cursor({cursor})가 HEAD 이력에 없어 처음부터 다시 색인합니다.")
+            else:
+                rev_range = f"{cursor}..HEAD"
+        commits = (self._git(repo_path, "rev-list", "--reverse", rev_range) or "").split()
+        return commits[:max_commits]
+
+    def _cursor_path(self, namespace: str) -> Path:
+        # 루트 저장소는 샤딩 도입 전과 같은 파일을 그대로 쓴다.
+        return self.index_path / (f"cursor.{quote(namespace, safe='')}" if namespace else "cursor")
+
+    @staticmethod
+    def _read_cursor(cursor_path: Path) -> Optional[str]:
+        try:
+            return cursor_path.read_text().strip() or None
+        except FileNotFoundError:
+            return None
+
+    @staticmethod
+    def _write_cursor(cursor_path: Path, sha: str):
+        tmp_path = cursor_path.with_name(f"{cursor_path.name}.tmp")
+        tmp_path.write_text(sha)
+        os.replace(tmp_path, cursor_path)
+
+    @staticmethod
+    def _git(repo_path: Path, *args) -> Optional[str]:
+        """ git 명령 실행 (실패 시 None). 한글 경로가 8진수로 이스케이프되지 않도록 quotePath 를 끈다. """
+        result = subprocess.run(["git", "-c", "core.quotePath=false", *args], cwd=repo_path, capture_output=True)
+        if result.returncode != 0:
+            if args[0] == "show":
+                print(f"[Error] git show 실패: {result.stderr.decode('utf-8', 'replace').strip()}")
+            return None
+        return result.stdout.decode("utf-8", "replace")
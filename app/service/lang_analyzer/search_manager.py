@@ -1,14 +1,27 @@
 # search_manager.py
 
+import contextvars
+import os
 import re
+import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from itertools import groupby
 from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import quote, unquote
 
-from PyKomoran import Komoran
 from whoosh.analysis import Tokenizer, LowercaseFilter, Token
 from whoosh.fields import Schema, ID, TEXT
-from whoosh.index import open_dir, create_in, exists_in
+from whoosh.index import open_dir, create_in, exists_in, EmptyIndexError
 
+from app.config.app_path import DATA_DIR
+from app.service.git_manage_service.git_shard_router import split_namespace, ROOT_SHARD
 from app.service.lang_analyzer.synonym_filter import CustomSynonymFilter
+from app.service.metrics.note_metrics import NOTE_TOKENIZE_SECONDS, NOTE_INDEX_COMMIT_SECONDS, NOTE_SEARCH_SECONDS, \
+    NOTE_QUEUE_DEPTH
+from app.service.metrics.request_tracer import trace_span, traced
+from app.service.worker_coord.worker_coordinator import worker_coordinator
 
 # 동의어 사전: 반드시 순수 dict/list 형태로 관리 (dict_keys 사용 금지)
 my_synonyms = {
@@ -17,9 +30,55 @@ my_synonyms = {
     "fastapi": ["파스트api", "백엔드"]
 }
 
-# 💡 1. Komoran 객체를 전역(Global) 영역에서 초기화
+# 💡 1. Komoran 객체는 전역(Global) 영역에서 관리
 # 이렇게 하면 KoEnTokenizer 인스턴스 내부에 포함되지 않아 pickle 에러가 발생하지 않습니다.
-_KOMORAN_INSTANCE = Komoran("EXP")
+# JVM 기동/사전 적재 비용이 커서 import 시점이 아니라 처음 형태소 분석을 할 때 만든다. (ngram 모드는 만들지 않음)
+_KOMORAN_INSTANCE = None
+_KOMORAN_LOCK = threading.Lock()
+
+# 💡 본문 색인 분석기 모드 (NOTE_SEARCH_ANALYZER)
+ANALYZER_KOMORAN = "komoran"  # 형태소 분석으로 명사만 (정확, 느림, Java 필요)
+ANALYZER_NGRAM = "ngram"  # 한글 2-gram + 영어/숫자 단어 (빠름, 순수 파이썬, 조사가 붙은 단어도 부분 일치)
+ANALYZER_HYBRID = "hybrid"  # 두 방식으로 모두 색인하고 어느 쪽이든 맞으면 검색
+SEARCH_ANALYZER = os.getenv("NOTE_SEARCH_ANALYZER", ANALYZER_KOMORAN)
+# 모드별 색인 형식 버전. 토큰 규칙이 바뀌면 올린다.
+# 모드/버전마다 색인 디렉토리가 다르므로 바꾸고 재시작하면 리더의 시작 시 전체 색인으로 새 색인이 만들어진다.
+ANALYZER_VERSIONS = {ANALYZER_KOMORAN: 1, ANALYZER_NGRAM: 1, ANALYZER_HYBRID: 1}
+
+# 💡 NOTE_SEARCH_PARTITIONS=1 이면 최상위 폴더(팀 네임스페이스)마다 독립된 색인(data/index/partitions/<네임스페이스>)을 쓴다.
+# 켠 뒤 재시작하면 리더의 시작 시 전체 색인에서 파티션이 만들어진다. (기존 data/index 의 단일 색인은 더 이상 읽지 않음)
+SEARCH_PARTITIONS_ENABLED = os.getenv("NOTE_SEARCH_PARTITIONS", "0") == "1"
+# 폴더를 지정하지 않은 검색에서 파티션을 동시에 조회할 스레드 수
+SEARCH_FANOUT_WORKERS = int(os.getenv("NOTE_SEARCH_FANOUT_WORKERS", "4"))
+
+# 폴더 없이 최상위에 있는 노트의 파티션 디렉토리 (quote 결과에는 '@' 가 남지 않으므로 팀 이름과 겹치지 않는다)
+_ROOT_PARTITION_DIR = "@root"
+
+# 💡 Whoosh 는 색인 디렉토리마다 writer 를 하나만 허용하므로, 리더 프로세스 안의 스레드(백그라운드 작업)끼리도 직렬화
+# (NoteSearchManager 는 요청마다 새로 만들어지므로 락은 인스턴스가 아니라 디렉토리 경로 기준으로 전역 관리)
+_INDEX_WRITE_LOCKS: Dict[str, threading.Lock] = {}
+_REBUILDING = set()  # 재색인 중인 파티션 경로 (이 동안의 쓰기는 큐로 미뤘다가 교체 후 반영)
+_LOCKS_GUARD = threading.Lock()
+_fanout_pool: Optional[ThreadPoolExecutor] = None
+
+# 💡 열어 둔 파티션도 프로세스 단위로 재사용 (요청마다 open_dir 하지 않도록). Whoosh 색인은 경로로 열리므로
+# 재색인 교체(rename) 뒤에도 같은 객체가 새 색인을 읽는다. 지워진 파티션은 디렉토리가 없으면 다시 연다.
+_OPEN_PARTITIONS: Dict[Tuple[str, str], "NoteIndexPartition"] = {}  # (색인 경로, 분석기) -> 파티션
+# partitions 디렉토리 -> (세대, 파티션 디렉토리 이름들). 세대는 디렉토리 mtime 과 이 프로세스의 생성/삭제 횟수
+_PARTITION_LISTINGS: Dict[str, Tuple[Tuple[int, int], List[str]]] = {}
+_partition_changes = 0
+
+_KO_EN_WORD = re.compile(r"([가-힣]+)|([a-zA-Z0-9]+)")
+
+
+def _komoran():
+    global _KOMORAN_INSTANCE
+    with _KOMORAN_LOCK:
+        if _KOMORAN_INSTANCE is None:
+            from PyKomoran import Komoran
+            print("🔍 [System] Komoran 형태소 분석기 로딩 중...")
+            _KOMORAN_INSTANCE = Komoran("EXP")
+        return _KOMORAN_INSTANCE
 
 
 class KoEnTokenizer(Tokenizer):
@@ -42,7 +101,8 @@ class KoEnTokenizer(Tokenizer):
         # get_plain_text는 '단어/품사' 형태로 반환하믈 명사 (NNG, NNP)만 추출
         # get_nouns는 [FastAPI, 이용, Note, 프로젝트] 같은 결과를 반환하려 하지만
         # 영어는 분석기에 따라 누락될 수 있으르모 명시적 처리가 좋음
-        nouns = _KOMORAN_INSTANCE.get_nouns(value)
+        with NOTE_TOKENIZE_SECONDS.time(), trace_span("komoran"):
+            nouns = _komoran().get_nouns(value)
 
         # 2. 영어 및 숫자 추출
         en_words = self.en_pattern.findall(value)
@@ -58,50 +118,511 @@ class KoEnTokenizer(Tokenizer):
             yield t
 
 
-class NoteSearchManager:
-    def __init__(self, index_dir="data/index"):
-        # 1. 프로젝트 루트 경로 계산
-        self.base_dir = Path(__file__).resolve().parent.parent.parent.parent
-        # 2. 인덱스 저장 경로 저장
-        self.index_path = self.base_dir / index_dir
-        analyzer = KoEnTokenizer() | LowercaseFilter() | CustomSynonymFilter(my_synonyms)
+class KoBigramTokenizer(Tokenizer):
+    """
+    형태소 분석 없이 한글은 2글자씩(2-gram), 영어/숫자는 단어 단위로 자르는 토크나이저 (ngram 모드)
+    예: "배포일정을 FastAPI로" -> 배포, 포일, 일정, 정을, fastapi, 로
+    - 한 글자 한글 단어는 그대로 한 토큰
+    - 단어 사이에는 위치를 한 칸 띄워, 검색어의 2-gram 들이 연달아 나오는지(구문 일치) 볼 때 단어 경계를 넘지 않게 한다.
+    - 색인할 때 동의어 사전의 단어를 만나면 동의어의 2-gram 도 같은 위치부터 함께 낸다.
+      (2-gram 으로 잘린 뒤에는 사전 단어와 맞출 수 없으므로, 검색어 쪽은 확장하지 않는다)
+    """
+
+    def __init__(self, synonyms=None):
+        self.synonyms = {str(k): list(v) for k, v in (synonyms or {}).items()}
+
+    def __call__(self, value, positions=False, chars=False, keeporiginal=False, removestops=True, start_pos=0,
+                 start_char=0, mode="", **kwargs):
+        t = Token(positions, chars, removestops=removestops, mode=mode, **kwargs)
+        pos = start_pos
+        for match in _KO_EN_WORD.finditer(value):
+            word = match.group() if match.lastindex == 1 else match.group().lower()
+            grams = self._grams(word)
+            for i, (text, offset) in enumerate(grams):
+                t.text = text
+                t.boost = 1.0
+                t.stopped = False
+                if positions:
+                    t.pos = pos + i
+                if chars:
+                    t.startchar = start_char + match.start() + offset
+                    t.endchar = t.startchar + len(text)
+                yield t
+            width = len(grams)
+            if mode != "query":
+                for synonym in self.synonyms.get(word, ()):
+                    syn_grams = self._grams(synonym)
+                    for i, (text, _) in enumerate(syn_grams):
+                        t.text = text
+                        if positions:
+                            t.pos = pos + i
+                        yield t
+                    width = max(width, len(syn_grams))
+            pos += width + 1
+
+    @staticmethod
+    def _grams(word: str):
+        """ (토큰, 단어 안 위치) """
+        if len(word) < 2 or not ("가" <= word[0] <= "힣"):
+            return [(word, 0)]
+        return [(word[i:i + 2], i) for i in range(len(word) - 1)]
+
+
+def ngram_analyzer():
+    return KoBigramTokenizer(my_synonyms)
+
+
+def komoran_analyzer():
+    return KoEnTokenizer() | LowercaseFilter() | CustomSynonymFilter(my_synonyms)
+
+
+def build_schema(analyzer: str) -> Schema:
+    """
+    분석기 모드별 스키마. hybrid 는 같은 본문을 두 필드(content: Komoran, ngram: 2-gram)로 색인
+    2-gram 필드는 검색어 한 단어의 2-gram 들이 연달아 나오는 문서만 찾도록(부분 문자열 일치) 구문 검색으로 조회한다.
+    """
+    if analyzer == ANALYZER_NGRAM:
+        return Schema(title=ID(stored=True, unique=True),
+                      content=TEXT(stored=True, analyzer=ngram_analyzer(), multitoken_query="phrase"))
+    schema = Schema(
+        title=ID(stored=True, unique=True),  # 파일 제목 (고유 식별자)
+        content=TEXT(stored=True, analyzer=komoran_analyzer()),
+    )
+    if analyzer == ANALYZER_HYBRID:
+        schema.add("ngram", TEXT(analyzer=ngram_analyzer(), multitoken_query="phrase"))
+    return schema
+
+
+def document_fields(analyzer: str, content: str) -> dict:
+    if analyzer == ANALYZER_HYBRID:
+        return {"content": content, "ngram": content}
+    return {"content": content}
+
+
+def query_parser(analyzer: str, schema: Schema):
+    """ hybrid 는 단어마다 Komoran 필드 또는 2-gram 필드 중 하나라도 맞으면 일치 """
+    from whoosh.qparser import QueryParser, MultifieldParser
+
+    if analyzer == ANALYZER_HYBRID:
+        return MultifieldParser(["content", "ngram"], schema)
+    return QueryParser("content", schema)
 
-        if not self.index_path.exists():
-            self.index_path.mkdir(parents=True, exist_ok=True)
 
-        self.schema = Schema(
-            title=ID(stored=True, unique=True),  # 파일 제목 (고유 식별자)
-            content=TEXT(stored=True, analyzer=analyzer),
-        )
+def index_root(analyzer: str) -> Path:
+    """ 분석기 모드/버전별 색인 디렉토리 (komoran v1 은 기존 data/index 를 그대로 쓴다) """
+    version = ANALYZER_VERSIONS[analyzer]
+    if analyzer == ANALYZER_KOMORAN and version == 1:
+        return DATA_DIR / "index"
+    return DATA_DIR / f"index-{analyzer}-v{version}"
+
+
+def _write_lock(index_path: Path) -> threading.Lock:
+    with _LOCKS_GUARD:
+        return _INDEX_WRITE_LOCKS.setdefault(str(index_path), threading.Lock())
+
+
+def _fanout_executor() -> ThreadPoolExecutor:
+    global _fanout_pool
+    with _LOCKS_GUARD:
+        if _fanout_pool is None:
+            _fanout_pool = ThreadPoolExecutor(max_workers=SEARCH_FANOUT_WORKERS, thread_name_prefix="note-search")
+        return _fanout_pool
+
+
+def _open_partition(namespace: Optional[str], index_path: Path, analyzer: str,
+                    create: bool) -> Optional["NoteIndexPartition"]:
+    """ 캐시된 파티션 (없거나 디렉토리가 지워졌으면 새로 연다). create=False 면 색인이 없을 때 None """
+    key = (str(index_path), analyzer)
+    with _LOCKS_GUARD:
+        partition = _OPEN_PARTITIONS.get(key)
+    if partition is not None and index_path.is_dir():
+        return partition
+
+    existed = index_path.is_dir()
+    try:
+        partition = NoteIndexPartition(namespace, index_path, analyzer, create)
+    except EmptyIndexError:
+        return None  # 아직 리더가 만들지 않았거나 재색인 교체 중
+    with _LOCKS_GUARD:
+        if not existed:
+            _note_partition_change()
+        _OPEN_PARTITIONS[key] = partition
+    return partition
+
+
+def _note_partition_change():
+    """ (_LOCKS_GUARD 안에서) 이 프로세스가 파티션 디렉토리를 만들거나 지웠음 -> 목록 다시 훑기 """
+    global _partition_changes
+    _partition_changes += 1
+
+
+def namespace_note_files(repo_path: Path, namespace: str) -> List[Path]:
+    """ 네임스페이스(최상위 폴더)에 속한 노트 파일 목록. 루트 네임스페이스는 폴더 없이 최상위에 있는 노트만 """
+    repo_path = Path(repo_path)
+    if namespace == ROOT_SHARD:
+        return sorted(repo_path.glob("*.md"))
+    return sorted((repo_path / namespace).glob("**/*.md"))
+
+
+def iter_note_documents(repo_path: Path, md_files: Iterable[Path]):
+    """ 색인할 (제목, 본문, 저장소 기준 상대 경로). 파일은 하나씩 읽어 메모리에 모두 올리지 않는다. """
+    for file_path in md_files:
+        title = file_path.stem
+        try:
+            with open(file_path, "r", encoding="utf-8") as f:
+                yield title, f.read(), file_path.relative_to(repo_path).as_posix()
+        except Exception as e:
+            print(f"[Error] 파일 읽기 실패 ({title}): {e}")
+
+
+class NoteIndexPartition:
+    """
+    Whoosh 색인 디렉토리 하나. 파티션을 끄면 data/index 하나가 전체 색인이다.
+    - 쓰기는 디렉토리별 락으로 직렬화되므로 서로 다른 팀의 색인 갱신은 병렬로 진행된다.
+    - rebuild 는 새 디렉토리에 처음부터 만든 뒤 교체하므로 재색인 중에도 기존 색인으로 검색된다.
+    """
+
+    def __init__(self, namespace: Optional[str], index_path: Path, analyzer: str, create: bool = True):
+        self.namespace = namespace  # 파티션을 끈 단일 색인이면 None
+        self.index_path = Path(index_path)
+        self.analyzer = analyzer
+        self.schema = schema = build_schema(analyzer)
+        self.lock = _write_lock(self.index_path)
 
         # 💡 폴더는 있지만 유효한 인덱스 파일이 없는 경우를 확실히 체크
         if not exists_in(str(self.index_path)):
-            print(f"🔍 [System] 새 인덱스 생성 중: {self.index_path}")
-            create_in(str(self.index_path), self.schema)
+            if not create:
+                raise EmptyIndexError(f"색인이 없습니다: {self.index_path}")
+            with self.lock:  # 재색인 교체와 겹치지 않도록
+                self.index_path.mkdir(parents=True, exist_ok=True)
+                if not exists_in(str(self.index_path)):
+                    print(f"🔍 [System] 새 인덱스 생성 중: {self.index_path}")
+                    create_in(str(self.index_path), schema)
+
+        # Whoosh는 문자열 경로를 받으므로 str 변환
+        self.ix = open_dir(str(self.index_path))
+
+    @property
+    def label(self) -> str:
+        """ 유지보수/관리자 API 표시용 이름 """
+        if self.namespace is None:
+            return "search"
+        return f"search:{self.namespace or '(root)'}"
+
+    @property
+    def rebuilding(self) -> bool:
+        return str(self.index_path) in _REBUILDING
+
+    def write(self, operations: Iterable[Tuple[str, str, Optional[str]]], kind: str) -> int:
+        """ (op, 제목, 본문) 들을 하나의 writer 세션으로 반영 (op: update / delete) """
+        with self.lock:
+            writer = self.ix.writer()
+            count = 0
+            for op, title, content in operations:
+                if op == "delete":
+                    writer.delete_by_term("title", title)
+                else:
+                    writer.update_document(title=title, **document_fields(self.analyzer, content))
+                count += 1
+            with NOTE_INDEX_COMMIT_SECONDS.labels(kind=kind).time():
+                writer.commit()
+        return count
+
+    def rebuild(self, documents: Iterable[Tuple[str, str]]) -> int:
+        """
+        (제목, 본문) 들로 파티션을 새로 만든다. (삭제/이동된 노트의 남은 문서도 함께 정리)
+        만드는 동안 이 파티션의 쓰기는 큐로 미뤄지고, 다른 파티션의 쓰기와 모든 검색은 그대로 진행된다.
+        """
+        key = str(self.index_path)
+        with _LOCKS_GUARD:
+            if key in _REBUILDING:
+                raise RuntimeError(f"이미 재색인 중입니다: {self.label}")
+            _REBUILDING.add(key)
+        try:
+            with self.lock:
+                build_path = self.index_path.with_name(f".{self.index_path.name}.rebuild.{os.getpid()}")
+                shutil.rmtree(build_path, ignore_errors=True)
+                build_path.mkdir(parents=True)
+                writer = create_in(str(build_path), self.schema).writer()
+                count = 0
+                for title, content in documents:
+                    writer.add_document(title=title, **document_fields(self.analyzer, content))
+                    count += 1
+                with NOTE_INDEX_COMMIT_SECONDS.labels(kind="rebuild").time():
+                    writer.commit()
+                self._swap_in(build_path)
+        finally:
+            with _LOCKS_GUARD:
+                _REBUILDING.discard(key)
+        return count
 
-        # 4. 인덱스 열기 (Whoosh는 문자열 경로를 받으므로 str 변환)
+    def _swap_in(self, build_path: Path):
+        """
+        다 만든 색인 디렉토리로 교체. Whoosh 색인은 경로로 열리므로 다른 워커도 다음 검색부터 새 색인을 읽는다.
+        (두 rename 사이의 아주 짧은 순간에 들어온 검색은 이 파티션 결과 없이 끝날 수 있다)
+        """
+        old_path = self.index_path.with_name(f".{self.index_path.name}.old.{os.getpid()}")
+        shutil.rmtree(old_path, ignore_errors=True)
+        os.replace(self.index_path, old_path)
+        os.replace(build_path, self.index_path)
+        shutil.rmtree(old_path, ignore_errors=True)
         self.ix = open_dir(str(self.index_path))
 
-    def update_index(self, title, content):
-        """ 파일 저장/수정 시 호출: 검색 지도를 갱신 합니다. """
-        writer = self.ix.writer()
-        writer.update_document(title=title, content=content)
-        writer.commit()
+    def remove(self):
+        """ 노트가 모두 사라진 네임스페이스의 파티션 삭제 """
+        with self.lock:
+            shutil.rmtree(self.index_path, ignore_errors=True)
+        with _LOCKS_GUARD:
+            _OPEN_PARTITIONS.pop((str(self.index_path), self.analyzer), None)
+            _note_partition_change()
+
+    def optimize(self) -> int:
+        """ 리더 전용(유지보수): 세그먼트를 하나로 합치고 삭제 문서를 정리합니다. (합치기 전 세그먼트 수 반환) """
+        with self.lock:
+            segments = self.segment_count()
+            if segments > 1:
+                with NOTE_INDEX_COMMIT_SECONDS.labels(kind="optimize").time():
+                    self.ix.optimize()
+        return segments
+
+    def segment_count(self) -> int:
+        with self.ix.reader() as reader:
+            return len(reader.leaf_readers())
+
+    def search(self, query, limit: int) -> List[Tuple[float, str]]:
+        """ (점수, 제목) 목록. 재색인 교체 중이라 열 수 없으면 빈 결과 """
+        try:
+            with self.ix.searcher() as searcher:
+                return [(hit.score, hit["title"]) for hit in searcher.search(query, limit=limit)]
+        except (OSError, EmptyIndexError) as e:
+            print(f"[Error] 색인 검색 실패 ({self.label}): {e}")
+            return []
+
+
+class NoteSearchManager:
+    """
+    노트 본문 검색 색인.
+    파티션을 켜면 문서를 경로의 최상위 폴더(네임스페이스)로 나눠 저장하고,
+    폴더를 지정한 검색은 해당 파티션만, 전체 검색은 모든 파티션을 스레드 풀에서 동시에 조회해 점수로 합친다.
+    """
+
+    def __init__(self, index_dir=None, partitioned: bool = SEARCH_PARTITIONS_ENABLED, analyzer: str = SEARCH_ANALYZER):
+        if analyzer not in ANALYZER_VERSIONS:
+            raise ValueError(f"알 수 없는 검색 분석기 모드입니다: {analyzer} ({', '.join(ANALYZER_VERSIONS)})")
+        # 1. 인덱스 저장 경로 (기본값: 데이터 루트의 분석기 모드/버전별 index 폴더)
+        self.index_path = Path(index_dir) if index_dir else index_root(analyzer)
+        self.partitioned = partitioned
+        self.analyzer = analyzer
+        self.schema = build_schema(analyzer)
+
+        # 열어 둔 파티션은 모듈 전역 캐시에 있으므로 요청마다 새로 만드는 인스턴스도 다시 열지 않는다.
+        if partitioned:
+            self.partitions_path = self.index_path / "partitions"
+            self.partitions_path.mkdir(parents=True, exist_ok=True)
+        else:
+            self._single = _open_partition(None, self.index_path, analyzer, create=True)
+
+    # --- 파티션 ---
+
+    def namespace_of(self, file_path: Optional[str]) -> str:
+        """ 경로가 없는 문서(이전 형식의 큐 작업)는 루트 파티션으로 """
+        return split_namespace(file_path)[0] if file_path else ROOT_SHARD
+
+    def partition(self, namespace: str, create: bool = True) -> Optional[NoteIndexPartition]:
+        """ 네임스페이스의 파티션 (파티션을 끄면 항상 단일 색인). create=False 면 색인이 없을 때 None """
+        if not self.partitioned:
+            return self._single
+        dir_name = quote(namespace, safe="") if namespace else _ROOT_PARTITION_DIR
+        return _open_partition(namespace, self.partitions_path / dir_name, self.analyzer, create)
+
+    def partitions(self) -> List[NoteIndexPartition]:
+        """
+        지금 있는 모든 파티션. 디렉토리 목록은 세대(partitions 디렉토리 mtime + 이 프로세스의 생성/삭제 횟수)가
+        바뀌었을 때만 다시 훑는다. (다른 워커/리더가 파티션을 만들거나 지우면 디렉토리 mtime 이 바뀐다)
+        """
+        if not self.partitioned:
+            return [self._single]
+        key = str(self.partitions_path)
+        with _LOCKS_GUARD:
+            generation = (self.partitions_path.stat().st_mtime_ns, _partition_changes)
+            listing = _PARTITION_LISTINGS.get(key)
+        if listing is None or listing[0] != generation:
+            names = sorted(item.name for item in self.partitions_path.iterdir()
+                           if item.is_dir() and not item.name.startswith("."))
+            listing = (generation, names)
+            with _LOCKS_GUARD:
+                _PARTITION_LISTINGS[key] = listing
+
+        partitions = []
+        for name in listing[1]:
+            namespace = ROOT_SHARD if name == _ROOT_PARTITION_DIR else unquote(name)
+            partition = self.partition(namespace, create=False)
+            if partition is not None:
+                partitions.append(partition)
+        return partitions
+
+    # --- 쓰기 ---
+
+    @traced("index.write")
+    def update_index(self, title, content, file_path=None):
+        """ 파일 저장/수정 시 호출: 검색 지도를 갱신 합니다. (팔로워 워커는 리더에게 위임) """
+        self._write([("update", title, content, file_path)], kind="single")
         print(f"index {title} updated")
 
-    def delete_index(self, title):
-        """ 파일 삭제 시 호출: 검색 지도에서 삭제합니다. """
-        writer = self.ix.writer()
-        writer.delete_by_term("title", title)
-        writer.commit()
+    @traced("index.write")
+    def update_many(self, documents):
+        """
+        대량 가져오기 시 호출: 하나의 writer 세션(파티션별)에서 여러 문서를 갱신합니다.
+        :param documents: (제목, 본문, 상대 경로) 들. 같은 네임스페이스끼리 모여 있으면 파티션마다 한 번만 커밋한다.
+        """
+        count = self._write((("update", title, content, file_path) for title, content, file_path in documents),
+                            kind="bulk")
+        print(f"index {count} documents updated")
+
+    def delete_index(self, title, file_path=None):
+        """ 파일 삭제 시 호출: 검색 지도에서 삭제합니다. (팔로워 워커는 리더에게 위임) """
+        self._write([("delete", title, None, file_path)], kind="delete")
         print(f"index {title} deleted")
 
-    def search(self, keyword, limit=10):
-        """ 본문 검색: 키워드가 포함된 파일 제목 리스트를 반환 합니다. """
-        from whoosh.qparser import QueryParser
+    def _write(self, operations, kind: str) -> int:
+        """
+        (op, 제목, 본문, 상대 경로) 들을 파티션별로 반영.
+        팔로워이거나 대상 파티션이 재색인 중이면 큐에 적재해 리더가 다음 주기에 반영하게 한다.
+        (리더는 반영할 때 파일을 다시 읽으므로, 경로가 있는 작업에는 본문을 싣지 않는다)
+        """
+        count = 0
+        leader = worker_coordinator.is_leader
+        for namespace, group in groupby(operations, key=lambda operation: self.namespace_of(operation[3])):
+            partition = self.partition(namespace) if leader else None  # 파티션 디렉토리는 리더만 만든다
+            if partition is not None and not partition.rebuilding:
+                count += partition.write(((op, title, content) for op, title, content, _ in group), kind)
+                continue
+            for op, title, content, file_path in group:
+                job = {"op": op, "title": title, "file_path": file_path}
+                if op != "delete" and not file_path:
+                    job["content"] = content
+                worker_coordinator.enqueue_index_job(job)
+                count += 1
+        return count
+
+    def apply_queued_jobs(self, repo_path=None):
+        """
+        리더 전용: 팔로워들이 적재한 색인 작업을 파티션마다 하나의 writer 세션으로 반영합니다.
+        재색인 중인 파티션의 작업은 큐에 남겨 두었다가 교체가 끝난 뒤 반영합니다.
+        작업은 적재 시점의 본문이 아니라 지금 파일 기준으로 반영하므로, 그 사이 리더가 더 새로운 저장을
+        직접 색인했더라도 오래된 본문으로 덮어쓰지 않습니다.
+        """
+        repo_path = Path(repo_path) if repo_path else DATA_DIR / "note"
+        jobs = worker_coordinator.pending_index_jobs()
+        NOTE_QUEUE_DEPTH.labels(queue="index").set(worker_coordinator.queue_depth())
+        if not jobs:
+            return 0
+
+        by_partition: Dict[str, list] = {}
+        done = []
+        for path, job in jobs:
+            if job["op"] == "rebuild":
+                self.start_rebuild(job["namespace"], job.get("repo_path"))
+                done.append(path)
+                continue
+            by_partition.setdefault(self.namespace_of(job.get("file_path")), []).append((path, job))
+
+        for namespace, items in by_partition.items():
+            partition = self.partition(namespace)
+            if partition.rebuilding:
+                continue
+            partition.write((self._current_operation(job, repo_path) for _, job in items), kind="queue")
+            done.extend(path for path, _ in items)
+
+        worker_coordinator.ack_index_jobs(done)
+        print(f"index {len(done)} queued jobs applied")
+        return len(done)
+
+    @staticmethod
+    def _current_operation(job: dict, repo_path: Path) -> Tuple[str, str, Optional[str]]:
+        """ 큐 작업 -> 지금 파일 기준 (op, 제목, 본문). 파일이 없으면 삭제, 있으면 현재 본문으로 갱신 """
+        file_path = job.get("file_path")
+        if not file_path:
+            return job["op"], job["title"], job.get("content")  # 경로가 없는 이전 형식의 작업
+        try:
+            with open(repo_path / file_path, "r", encoding="utf-8") as f:
+                return "update", job["title"], f.read()
+        except FileNotFoundError:
+            return "delete", job["title"], None
+        except Exception as e:
+            print(f"[Error] 색인 큐 작업의 파일 읽기 실패 ({file_path}): {e}")
+            return job["op"], job["title"], job.get("content")
+
+    # --- 파티션 재색인 ---
+
+    def rebuild_partition(self, namespace: str, documents: Iterable[Tuple[str, str]]) -> int:
+        """ 리더 전용: 한 네임스페이스의 파티션을 (제목, 본문) 들로 새로 만듭니다. 다른 파티션은 영향을 받지 않습니다. """
+        count = self.partition(namespace).rebuild(documents)
+        print(f"index partition {namespace or '(root)'} rebuilt: {count} documents")
+        return count
+
+    def request_rebuild(self, namespace: str, repo_path=None):
+        """ 모든 워커: 리더에게 파티션 재색인을 요청 (리더의 다음 큐 반영 주기에 백그라운드로 시작) """
+        worker_coordinator.enqueue_index_job({"op": "rebuild", "namespace": namespace,
+                                              "repo_path": str(repo_path) if repo_path else None})
+
+    def start_rebuild(self, namespace: str, repo_path=None) -> bool:
+        """ 리더 전용: 저장소의 노트 파일로 파티션 재색인을 별도 스레드에서 시작 (이미 진행 중이면 False) """
+        if not self.partitioned or self.partition(namespace).rebuilding:
+            return False
+        repo_path = Path(repo_path) if repo_path else DATA_DIR / "note"
+
+        def rebuild():
+            try:
+                documents = iter_note_documents(repo_path, namespace_note_files(repo_path, namespace))
+                self.rebuild_partition(namespace, ((title, content) for title, content, _ in documents))
+            except Exception as e:
+                print(f"[Error] 파티션 재색인 실패 ({namespace or '(root)'}): {e}")
+
+        threading.Thread(target=rebuild, name=f"index-rebuild-{namespace or 'root'}", daemon=True).start()
+        return True
+
+    def remove_partitions_except(self, namespaces) -> List[str]:
+        """ 리더 전용(전체 동기화): 노트가 하나도 남지 않은 네임스페이스의 파티션을 지운다. """
+        removed = []
+        for partition in self.partitions():
+            if partition.namespace not in namespaces and not partition.rebuilding:
+                partition.remove()
+                removed.append(partition.namespace)
+        return removed
+
+    # --- 검색 ---
+
+    @traced("search")
+    def search(self, keyword, limit=10, namespace: Optional[str] = None):
+        """
+        본문 검색: 키워드가 포함된 파일 제목 리스트를 반환 합니다.
+        :param namespace: 지정하면 그 네임스페이스(최상위 폴더)의 파티션만 조회 (파티션을 끄면 무시)
+        점수(BM25)는 파티션 안의 통계로 계산되므로, 여러 파티션의 결과를 합친 순위는 근사값이다.
+        """
+        with NOTE_SEARCH_SECONDS.time():
+            # 형태소 분석은 한 번만 하고 같은 쿼리로 모든 파티션을 조회 (스키마가 같음)
+            query = query_parser(self.analyzer, self.schema).parse(keyword)
+            if namespace is not None and self.partitioned:
+                partition = self.partition(namespace, create=False)
+                partitions = [partition] if partition is not None else []
+            else:
+                partitions = self.partitions()
+
+            if len(partitions) <= 1:
+                hits = [hit for partition in partitions for hit in partition.search(query, limit)]
+            else:
+                pool = _fanout_executor()
+                futures = [pool.submit(contextvars.copy_context().run, partition.search, query, limit)
+                           for partition in partitions]
+                hits = [hit for future in futures for hit in future.result()]
 
-        with self.ix.searcher() as searcher:
-            parser = QueryParser("content", self.ix.schema)
-            query = parser.parse(keyword)
-            results = searcher.search(query, limit=limit)
-            return [hit['title'] for hit in results]
+        titles = []
+        seen = set()
+        for _, title in sorted(hits, key=lambda hit: hit[0], reverse=True):
+            if title not in seen:
+                seen.add(title)
+                titles.append(title)
+                if len(titles) >= limit:
+                    break
+        return titles
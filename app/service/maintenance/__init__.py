@@ -0,0 +1 @@
+""" git 저장소 / 검색 색인 유지보수 """
@@ -0,0 +1,279 @@
+# storage_maintenance.py
+
+import asyncio
+import json
+import os
+import shutil
+import subprocess
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from app.config.app_path import DATA_DIR
+from app.service.git_manage_service.git_shard_router import GIT_SHARDING_ENABLED, ROOT_SHARD, list_shard_paths
+from app.service.lang_analyzer.history_search_manager import NoteHistorySearchManager, HISTORY_INDEX_ENABLED
+from app.service.lang_analyzer.search_manager import NoteSearchManager
+from app.service.metrics.note_metrics import NOTE_MAINTENANCE_SECONDS, NOTE_MAINTENANCE_DEFERRED_TOTAL
+from app.service.worker_coord.worker_coordinator import worker_coordinator
+
+# 💡 유지보수는 사용량이 적은 시간대(로컬 시각, "시작시-종료시")에만 돈다. "22-4" 처럼 자정을 넘겨도 되고, 비우면 항상.
+MAINTENANCE_WINDOW = os.getenv("NOTE_MAINT_WINDOW", "2-5")
+# 마지막 쓰기 이후 이 시간(초)이 지나야 작업을 시작 (저장이 몰리는 중에는 미룸)
+_QUIET_SECONDS = int(os.getenv("NOTE_MAINT_QUIET_SECONDS", "300"))
+
+_LOOSE_OBJECT_LIMIT = 500  # 이만큼 쌓이면 loose object 를 pack 으로 묶음 (repack)
+_PACK_LIMIT = 20  # pack 이 이만큼 늘어나면 하나로 합침 (gc)
+_SEGMENT_LIMIT = 8  # Whoosh 세그먼트가 이만큼 늘어나면 optimize
+_GC_INTERVAL = 7 * 24 * 3600
+_COMMIT_GRAPH_INTERVAL = 24 * 3600
+_PAUSE_BETWEEN_JOBS = 5.0  # 작업 사이 쉬는 시간 (디스크 I/O 를 몰아서 쓰지 않도록)
+_JOB_TIMEOUT = 3600
+
+
+def parse_window(text: str) -> Optional[Tuple[int, int]]:
+    """ "2-5" -> (2, 5). 비어 있으면 None (시간대 제한 없음) """
+    if not text or not text.strip():
+        return None
+    start, end = text.split("-", 1)
+    return int(start) % 24, int(end) % 24
+
+
+def in_window(window: Optional[Tuple[int, int]], hour: int) -> bool:
+    if window is None:
+        return True
+    start, end = window
+    if start <= end:
+        return start <= hour < end
+    return hour >= start or hour < end
+
+
+def git_object_stats(repo_path: Path) -> dict:
+    """ `git count-objects -v` + commit-graph 유무 """
+    result = subprocess.run(["git", "count-objects", "-v"], cwd=repo_path, capture_output=True, text=True)
+    stats = {}
+    for line in result.stdout.splitlines():
+        key, _, value = line.partition(":")
+        if value.strip().isdigit():
+            stats[key.strip()] = int(value)
+    info_dir = Path(repo_path) / ".git" / "objects" / "info"
+    return {
+        "loose_objects": stats.get("count", 0),
+        "loose_size_kb": stats.get("size", 0),
+        "packs": stats.get("packs", 0),
+        "packed_objects": stats.get("in-pack", 0),
+        "pack_size_kb": stats.get("size-pack", 0),
+        "garbage": stats.get("garbage", 0),
+        "commit_graph": (info_dir / "commit-graph").exists() or (info_dir / "commit-graphs").exists(),
+    }
+
+
+def _dir_size(path: Path) -> int:
+    return sum(f.stat().st_size for f in Path(path).glob("*") if f.is_file())
+
+
+def _last_modified(path: Path) -> float:
+    try:
+        return os.stat(path).st_mtime
+    except FileNotFoundError:
+        return 0.0
+
+
+def _low_priority_prefix() -> List[str]:
+    """ 유지보수 프로세스의 CPU/I/O 우선순위를 낮춤 (해당 도구가 있는 POSIX 환경에서만) """
+    prefix = []
+    if os.name != "nt":
+        if shutil.which("ionice"):
+            prefix += ["ionice", "-c", "3"]
+        if shutil.which("nice"):
+            prefix += ["nice", "-n", "19"]
+    return prefix
+
+
+class StorageMaintenance:
+    """
+    git 저장소(샤드 포함)와 Whoosh 색인의 유지보수 스케줄러. 리더 워커에서만 작업을 실행한다.
+    - git: loose object 가 쌓이면 repack, pack 이 늘어나거나 주기가 되면 gc, 이후 commit-graph 갱신
+      (commit-graph 의 changed-paths 필터 덕분에 파일별 이력(iter_commits(paths=...))이 커밋 수에 덜 민감해진다)
+    - Whoosh: 세그먼트가 늘어나면 optimize 로 하나로 합침 (검색 색인은 파티션별)
+    - 설정한 시간대에만, 최근 쓰기가 없을 때만 실행하고 낮은 우선순위 + 작업 사이 휴식으로 I/O 를 제한한다.
+    - 마지막 실행 결과는 run/maintenance.json 에 남겨 어느 워커에서든 조회할 수 있다.
+    """
+
+    def __init__(self, repo_path: Optional[Path] = None, run_dir: Optional[Path] = None, poll_interval: float = 60.0):
+        self.repo_path = Path(repo_path) if repo_path else DATA_DIR / "note"
+        self.run_dir = Path(run_dir) if run_dir else DATA_DIR / "run"
+        self.state_path = self.run_dir / "maintenance.json"
+        self.request_path = self.run_dir / "maintenance-request"
+        self.window = parse_window(MAINTENANCE_WINDOW)
+        self.poll_interval = poll_interval
+        self._index_managers = None
+
+    # --- 조회 (모든 워커) ---
+
+    def collect_stats(self) -> dict:
+        repositories = []
+        for namespace, repo_path in self._repositories():
+            if (repo_path / ".git").exists():
+                repositories.append({"namespace": namespace, **git_object_stats(repo_path)})
+
+        indexes = []
+        for name, manager in self._indexes():
+            indexes.append({
+                "name": name,
+                "segments": manager.segment_count(),
+                "doc_count": manager.ix.doc_count(),
+                "size_bytes": _dir_size(manager.index_path),
+            })
+
+        return {
+            "window": MAINTENANCE_WINDOW,
+            "in_window": in_window(self.window, datetime.now().hour),
+            "repositories": repositories,
+            "indexes": indexes,
+            "last_runs": self._read_state(),
+            "pending_request": self.request_path.exists(),
+        }
+
+    def request_run(self):
+        """ 시간대와 무관하게 다음 주기에 리더가 유지보수를 돌도록 요청 (쓰기 중이면 여전히 미룸) """
+        self.request_path.touch()
+
+    # --- 실행 (리더) ---
+
+    def run_due_jobs(self, forced: bool = False) -> List[dict]:
+        """ 조건을 만족한 작업을 순서대로 실행하고 결과 목록을 돌려준다. forced 면 주기 조건을 무시 """
+        state = self._read_state()
+        now = time.time()
+        results = []
+
+        for namespace, repo_path in self._repositories():
+            if not (repo_path / ".git").exists():
+                continue
+            stats = git_object_stats(repo_path)
+            if not stats["loose_objects"] and not stats["packed_objects"]:
+                continue  # 아직 커밋이 없는 저장소
+            target = namespace or "(root)"
+            jobs = []
+            if stats["loose_objects"] >= _LOOSE_OBJECT_LIMIT or (forced and stats["loose_objects"]):
+                jobs.append(("git_repack", ["repack", "-d", "-l", "-q"]))
+            if stats["packs"] >= _PACK_LIMIT or self._older_than(state, "git_gc", target, _GC_INTERVAL, now) or forced:
+                jobs.append(("git_gc", ["gc", "--quiet"]))
+            if jobs or not stats["commit_graph"] \
+                    or self._older_than(state, "git_commit_graph", target, _COMMIT_GRAPH_INTERVAL, now):
+                jobs.append(("git_commit_graph", ["commit-graph", "write", "--reachable", "--changed-paths"]))
+
+            for job, args in jobs:
+                if not self._is_quiet(repo_path / ".git" / "index"):
+                    NOTE_MAINTENANCE_DEFERRED_TOTAL.labels(job=job).inc()
+                    print(f"[Maintenance] {job} ({target}) 미룸: 최근 {_QUIET_SECONDS}초 안에 커밋이 있었습니다.")
+                    break
+                results.append(self._record(state, job, target, lambda: self._run_git(repo_path, args)))
+
+        for name, manager in self._indexes():
+            if manager.segment_count() < (2 if forced else _SEGMENT_LIMIT):
+                continue
+            if worker_coordinator.queue_depth() or not self._is_quiet(manager.index_path) \
+                    or getattr(manager, "rebuilding", False):
+                NOTE_MAINTENANCE_DEFERRED_TOTAL.labels(job="index_optimize").inc()
+                print(f"[Maintenance] index_optimize ({name}) 미룸: 색인 쓰기가 진행 중입니다.")
+                continue
+            results.append(self._record(state, "index_optimize", name,
+                                        lambda: f"{manager.optimize()} segments merged"))
+
+        self._write_state(state)
+        return results
+
+    async def run(self, is_leader: Callable[[], bool]):
+        """ 워커 수명 동안 도는 루프. 리더만 시간대 안에서(또는 요청이 있을 때) 작업을 실행한다. """
+        loop = asyncio.get_event_loop()
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            try:
+                if not is_leader():
+                    continue
+                forced = self._consume_request()
+                if forced or in_window(self.window, datetime.now().hour):
+                    await loop.run_in_executor(None, self.run_due_jobs, forced)
+            except Exception as e:
+                print(f"[Error] 유지보수 루프 오류: {e}")
+
+    def _record(self, state: dict, job: str, target: str, action: Callable[[], str]) -> dict:
+        started = time.perf_counter()
+        try:
+            with NOTE_MAINTENANCE_SECONDS.labels(job=job).time():
+                result = action()
+            ok = True
+        except Exception as e:
+            result, ok = str(e), False
+        entry = {
+            "job": job,
+            "target": target,
+            "ok": ok,
+            "result": result,
+            "seconds": round(time.perf_counter() - started, 3),
+            "finished_at": time.time(),
+        }
+        state[f"{job}:{target}"] = entry
+        print(f"[Maintenance] {job} ({target}) {'완료' if ok else '실패'}: {result} ({entry['seconds']}s)")
+        time.sleep(_PAUSE_BETWEEN_JOBS)
+        return entry
+
+    @staticmethod
+    def _run_git(repo_path: Path, args: List[str]) -> str:
+        # pack.threads=1: repack 이 CPU 를 전부 쓰지 않도록 / gc.autoDetach=false: 백그라운드로 떨어지지 않고 끝까지 기다림
+        command = _low_priority_prefix() + ["git", "-c", "pack.threads=1", "-c", "gc.autoDetach=false", *args]
+        result = subprocess.run(command, cwd=repo_path, capture_output=True, text=True, timeout=_JOB_TIMEOUT)
+        if result.returncode != 0:
+            raise RuntimeError(result.stderr.strip() or f"exit {result.returncode}")
+        return "ok"
+
+    @staticmethod
+    def _is_quiet(path: Path) -> bool:
+        return time.time() - _last_modified(path) >= _QUIET_SECONDS
+
+    @staticmethod
+    def _older_than(state: dict, job: str, target: str, interval: float, now: float) -> bool:
+        last = state.get(f"{job}:{target}")
+        return last is None or now - last["finished_at"] >= interval
+
+    def _repositories(self) -> List[Tuple[str, Path]]:
+        return list_shard_paths(self.repo_path) if GIT_SHARDING_ENABLED else [(ROOT_SHARD, self.repo_path)]
+
+    def _indexes(self):
+        """ (이름, 색인) 목록. 검색 색인은 파티션마다 따로 (리더가 새로 만든 파티션도 매번 다시 찾는다) """
+        if self._index_managers is None:
+            self._index_managers = [("search", NoteSearchManager())]
+            if HISTORY_INDEX_ENABLED:
+                self._index_managers.append(("history", NoteHistorySearchManager(self.repo_path)))
+        indexes = []
+        for name, manager in self._index_managers:
+            if isinstance(manager, NoteSearchManager):
+                indexes.extend((partition.label, partition) for partition in manager.partitions())
+            else:
+                indexes.append((name, manager))
+        return indexes
+
+    def _consume_request(self) -> bool:
+        try:
+            os.remove(self.request_path)
+            return True
+        except FileNotFoundError:
+            return False
+
+    def _read_state(self) -> Dict[str, dict]:
+        try:
+            with open(self.state_path, "r", encoding="UTF-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _write_state(self, state: dict):
+        tmp_path = self.state_path.with_name(f".{self.state_path.name}.tmp")
+        with open(tmp_path, "w", encoding="UTF-8") as f:
+            json.dump(state, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.state_path)
+
+
+# 💡 리더 승계 시에도 같은 상태 파일을 이어 쓰도록 프로세스당 하나만 둔다.
+storage_maintenance = StorageMaintenance()
@@ -0,0 +1 @@
+""" 서비스 운영 지표 (Prometheus) """
@@ -0,0 +1,160 @@
+# note_metrics.py
+
+import os
+
+from prometheus_client import Counter, Histogram, Gauge, CollectorRegistry, REGISTRY, CONTENT_TYPE_LATEST, \
+    generate_latest, multiprocess
+
+# 💡 Prometheus 지표는 프로세스 전역에서 한 번만 등록해야 하므로 모듈 전역으로 관리합니다.
+# (NoteService는 요청마다 새로 생성되기 때문에 인스턴스 변수로 두면 중복 등록 에러가 발생합니다.)
+
+# 대부분의 단계가 수 ms ~ 수 초 사이이므로 기본 버킷보다 촘촘하게 설정
+_LATENCY_BUCKETS = (.0005, .001, .0025, .005, .01, .025, .05, .1, .25, .5, 1, 2.5, 5, 10, 30)
+
+# ===== 저장 파이프라인 =====
+NOTE_SAVE_SKIPPED_TOTAL = Counter(
+    "note_save_skipped_total",
+    "내용 변경이 없어 커밋/색인을 생략한 저장 요청 수",
+)
+
+NOTE_SAVE_STAGE_SECONDS = Histogram(
+    "note_save_stage_seconds",
+    "노트 저장 단계별 소요 시간 (conflict_check, lock_wait, file_write, git_add, git_commit, db_commit)",
+    ["stage"],
+    buckets=_LATENCY_BUCKETS,
+)
+
+NOTE_CONFLICT_TOTAL = Counter(
+    "note_conflict_total",
+    "last_hash 불일치로 거절된 저장 요청 수",
+)
+
+# ===== 검색 파이프라인 =====
+NOTE_INDEX_COMMIT_SECONDS = Histogram(
+    "note_index_commit_seconds",
+    "Whoosh writer commit 소요 시간 (single, bulk, delete, queue, history, optimize)",
+    ["kind"],
+    buckets=_LATENCY_BUCKETS,
+)
+
+NOTE_SEARCH_SECONDS = Histogram(
+    "note_search_seconds",
+    "Whoosh 본문 검색 소요 시간",
+    buckets=_LATENCY_BUCKETS,
+)
+
+NOTE_TOKENIZE_SECONDS = Histogram(
+    "note_tokenize_seconds",
+    "Komoran 형태소 분석(명사 추출) 소요 시간",
+    buckets=_LATENCY_BUCKETS,
+)
+
+# ===== 동기화 / 캐시 / 큐 =====
+NOTE_SYNC_SECONDS = Histogram(
+    "note_sync_seconds",
+    "기동 시 동기화 소요 시간 (index, db)",
+    ["target"],
+    buckets=_LATENCY_BUCKETS,
+)
+
+NOTE_CACHE_REQUESTS_TOTAL = Counter(
+    "note_cache_requests_total",
+    "캐시 조회 결과 (result: hit, miss)",
+    ["cache", "result"],
+)
+
+NOTE_QUEUE_DEPTH = Gauge(
+    "note_queue_depth",
+    "대기 중인 작업 수",
+    ["queue"],
+    multiprocess_mode="max",
+)
+
+# ===== 변경 피드 =====
+NOTE_FEED_SUBSCRIBERS = Gauge(
+    "note_feed_subscribers",
+    "변경 피드(WebSocket/SSE) 구독자 수",
+    multiprocess_mode="livesum",
+)
+
+NOTE_FEED_LAGGED_TOTAL = Counter(
+    "note_feed_lagged_total",
+    "큐가 넘쳐 resync 후 끊긴 느린 구독자 수",
+)
+
+# ===== 작업 큐 =====
+NOTE_JOB_TOTAL = Counter(
+    "note_job_total",
+    "커밋 이후 작업 실행 결과 (result: done, retry, failed)",
+    ["job_type", "result"],
+)
+
+NOTE_JOB_SECONDS = Histogram(
+    "note_job_seconds",
+    "커밋 이후 작업 배치 실행 소요 시간",
+    ["job_type"],
+    buckets=_LATENCY_BUCKETS,
+)
+
+# ===== 저장소 유지보수 =====
+NOTE_MAINTENANCE_SECONDS = Histogram(
+    "note_maintenance_seconds",
+    "유지보수 작업 소요 시간 (git_repack, git_gc, git_commit_graph, index_optimize)",
+    ["job"],
+    buckets=_LATENCY_BUCKETS,
+)
+
+NOTE_MAINTENANCE_DEFERRED_TOTAL = Counter(
+    "note_maintenance_deferred_total",
+    "쓰기가 몰리는 중이라 미룬 유지보수 작업 수",
+    ["job"],
+)
+
+# ===== 요청 수용 제어 =====
+NOTE_ADMISSION_LIMIT = Gauge(
+    "note_admission_limit",
+    "엔드포인트 종류별 설정값 (kind: concurrency, queue)",
+    ["endpoint_class", "kind"],
+    multiprocess_mode="max",
+)
+
+NOTE_ADMISSION_IN_FLIGHT = Gauge(
+    "note_admission_in_flight",
+    "실행 중인 요청 수",
+    ["endpoint_class"],
+    multiprocess_mode="livesum",
+)
+
+NOTE_ADMISSION_QUEUED = Gauge(
+    "note_admission_queued",
+    "실행 슬롯을 기다리는 요청 수",
+    ["endpoint_class"],
+    multiprocess_mode="livesum",
+)
+
+NOTE_ADMISSION_WAIT_SECONDS = Histogram(
+    "note_admission_wait_seconds",
+    "수용된 요청이 슬롯을 기다린 시간",
+    ["endpoint_class"],
+    buckets=_LATENCY_BUCKETS,
+)
+
+NOTE_ADMISSION_REJECTED_TOTAL = Counter(
+    "note_admission_rejected_total",
+    "거절한 요청 수 (reason: queue_full, timeout)",
+    ["endpoint_class", "reason"],
+)
+
+
+
+def render_metrics():
+    """
+    /metrics 응답 본문 생성.
+    PROMETHEUS_MULTIPROC_DIR 가 설정된 멀티 워커 환경에서는 모든 워커의 지표를 합산한다.
+    :return: (본문 bytes, content-type)
+    """
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
@@ -0,0 +1,122 @@
+# request_tracer.py
+
+import asyncio
+import contextvars
+import functools
+import inspect
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+
+# 💡 요청 단위 span 수집기. contextvars 로 관리하므로 동시 요청끼리 섞이지 않는다.
+_CURRENT_TRACE: contextvars.ContextVar[Optional["RequestTrace"]] = contextvars.ContextVar(
+    "note_request_trace", default=None
+)
+
+
+class RequestTrace:
+    """ 한 요청 동안 발생한 span(이름, 소요 ms)을 모아 Server-Timing 헤더와 로그로 변환 """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.spans: List[Tuple[str, float]] = []
+        # executor 스레드에서도 span 이 추가되므로 보호
+        self._lock = threading.Lock()
+
+    def add(self, name: str, duration_ms: float):
+        with self._lock:
+            self.spans.append((name, duration_ms))
+
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self.started) * 1000
+
+    def summary(self) -> Dict[str, dict]:
+        """ 같은 이름의 span 은 합산 (예: db 쿼리 여러 번 -> db;dur=합계) """
+        with self._lock:
+            spans = list(self.spans)
+        result = {}
+        for name, duration_ms in spans:
+            item = result.setdefault(name, {"dur": 0.0, "count": 0})
+            item["dur"] += duration_ms
+            item["count"] += 1
+        return result
+
+    def server_timing(self) -> str:
+        parts = []
+        for name, item in self.summary().items():
+            desc = f';desc="{item["count"]} calls"' if item["count"] > 1 else ""
+            parts.append(f"{name};dur={item['dur']:.1f}{desc}")
+        parts.append(f"total;dur={self.elapsed_ms():.1f}")
+        return ", ".join(parts)
+
+
+def start_trace() -> Tuple[RequestTrace, contextvars.Token]:
+    trace = RequestTrace()
+    return trace, _CURRENT_TRACE.set(trace)
+
+
+def end_trace(token: contextvars.Token):
+    _CURRENT_TRACE.reset(token)
+
+
+@contextmanager
+def trace_span(name: str):
+    """ 현재 요청에 span 기록 (요청 컨텍스트 밖이면 아무것도 하지 않음) """
+    trace = _CURRENT_TRACE.get()
+    if trace is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        trace.add(name, (time.perf_counter() - started) * 1000)
+
+
+def traced(name: str):
+    """ 함수 전체를 span 으로 기록하는 데코레이터 (동기/비동기 모두 지원) """
+
+    def decorator(func):
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with trace_span(name):
+                    return await func(*args, **kwargs)
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with trace_span(name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+async def run_in_executor(func, *args):
+    """
+    loop.run_in_executor 와 같지만 현재 컨텍스트(요청 trace)를 executor 스레드로 복사한다.
+    (기본 run_in_executor 는 contextvars 를 전달하지 않아 스레드 안의 span 이 유실됨)
+    """
+    loop = asyncio.get_event_loop()
+    ctx = contextvars.copy_context()
+    return await loop.run_in_executor(None, functools.partial(ctx.run, func, *args))
+
+
+def instrument_sqlalchemy(sync_engine):
+    """ DB 커서 실행 시간을 'db' span 으로 기록 (AsyncEngine 은 .sync_engine 을 넘길 것) """
+    from sqlalchemy import event
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("note_trace_started", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info["note_trace_started"].pop()
+        trace = _CURRENT_TRACE.get()
+        if trace is not None:
+            trace.add("db", (time.perf_counter() - started) * 1000)
@@ -0,0 +1,53 @@
+# sampling_profiler.py
+
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+
+
+class SamplingProfiler:
+    """
+    sys._current_frames() 를 주기적으로 샘플링하는 경량 프로파일러.
+    결과는 folded stack 형식(`스택;스택;... 횟수`)으로 저장되며 flamegraph.pl / speedscope 에서 바로 열 수 있다.
+    이벤트 루프 스레드는 다른 요청과 공유되므로, 동시에 처리 중인 요청의 스택도 함께 샘플링될 수 있다.
+    """
+
+    def __init__(self, interval: float = 0.005, max_depth: int = 64):
+        self.interval = interval
+        self.max_depth = max_depth
+        self.samples = Counter()
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="note-sampling-profiler", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+        self._thread.join()
+
+    def _run(self):
+        own_id = threading.get_ident()
+        while not self._stop_event.is_set():
+            thread_names = {t.ident: t.name for t in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                stack = []
+                while frame is not None and len(stack) < self.max_depth:
+                    code = frame.f_code
+                    stack.append(f"{Path(code.co_filename).name}:{code.co_name}")
+                    frame = frame.f_back
+                stack.append(thread_names.get(thread_id, str(thread_id)))
+                self.samples[";".join(reversed(stack))] += 1
+            time.sleep(self.interval)
+
+    def write_folded(self, path: Path) -> Path:
+        os.makedirs(path.parent, exist_ok=True)
+        with open(path, "w", encoding="UTF-8") as f:
+            for stack, count in self.samples.most_common():
+                f.write(f"{stack} {count}\n")
+        return path
@@ -0,0 +1,30 @@
+# note_derived_state_service.py
+
+from typing import List
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database.note_mng.model.note_derived_state_model import NoteDerivedState
+
+
+class NoteDerivedStateService:
+    """
+    파생 테이블 백필 완료 기록(NOTE_DERIVED_STATE) 관리.
+    - 대상 서비스는 DERIVED_NAME(기록 키)과 DERIVED_VERSION(계산 방식 버전)을 가집니다.
+    - 커밋은 호출하는 쪽(NoteService)의 트랜잭션에 맡깁니다. (백필 결과와 완료 기록이 함께 확정되도록)
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def outdated(self, services: list) -> List:
+        """ 백필 기록이 없거나 기록된 버전이 현재 버전과 다른 서비스 목록 """
+        rows = await self.db.execute(select(NoteDerivedState.name, NoteDerivedState.version))
+        recorded = {name: version for name, version in rows.all()}
+        return [service for service in services if recorded.get(service.DERIVED_NAME) != service.DERIVED_VERSION]
+
+    async def mark_current(self, services: list):
+        """ 전체 노트 백필을 마친 서비스의 현재 버전을 기록 """
+        for service in services:
+            await self.db.merge(NoteDerivedState(name=service.DERIVED_NAME, version=service.DERIVED_VERSION))
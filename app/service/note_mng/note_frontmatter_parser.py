@@ -0,0 +1,78 @@
+# note_frontmatter_parser.py
+
+import datetime
+import re
+from typing import Dict, List, NamedTuple
+
+import yaml
+
+# 문서 맨 앞의 --- ... --- 블록만 frontmatter 로 인정
+_FRONTMATTER = re.compile(r"\A\ufeff?---[ \t]*\r?\n(.*?)\r?\n(?:---|\.\.\.)[ \t]*(?:\r?\n|\Z)", re.DOTALL)
+
+_TAG_KEYS = ("tags", "tag")
+_MAX_KEY_LEN = 100
+_MAX_VALUE_LEN = 255
+
+
+class Frontmatter(NamedTuple):
+    tags: List[str]
+    attrs: Dict[str, List[str]]
+
+
+def _normalize_tag(value) -> str:
+    return str(value).strip().lstrip("#").strip().lower()[:_MAX_KEY_LEN]
+
+
+def _scalar_to_str(value):
+    """ 필터/집계에 쓸 수 있는 스칼라만 문자열로 변환 (dict 등은 None) """
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (str, int, float)):
+        text = str(value).strip()
+        return text[:_MAX_VALUE_LEN] if text else None
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.isoformat()
+    return None
+
+
+def parse_frontmatter(content: str) -> Frontmatter:
+    """
+    노트 본문의 YAML frontmatter 에서 태그와 속성을 추출합니다.
+    - tags: 리스트 또는 "a, b" / "a b" 형태 문자열 모두 허용, 소문자로 정규화
+    - 그 외 최상위 항목: 스칼라 또는 스칼라 리스트만 속성으로 저장 (키는 소문자)
+    YAML 이 깨져 있으면 frontmatter 가 없는 것으로 취급합니다.
+    """
+    match = _FRONTMATTER.match(content or "")
+    if not match:
+        return Frontmatter([], {})
+
+    try:
+        data = yaml.safe_load(match.group(1))
+    except yaml.YAMLError:
+        return Frontmatter([], {})
+    if not isinstance(data, dict):
+        return Frontmatter([], {})
+
+    tags, attrs = [], {}
+    for key, value in data.items():
+        key = str(key).strip().lower()[:_MAX_KEY_LEN]
+        if not key or value is None:
+            continue
+
+        if key in _TAG_KEYS:
+            raw = value if isinstance(value, list) else re.split(r"[,\s]+", str(value))
+            for item in raw:
+                tag = _normalize_tag(item) if _scalar_to_str(item) is not None else ""
+                if tag and tag not in tags:
+                    tags.append(tag)
+            continue
+
+        values = []
+        for item in (value if isinstance(value, list) else [value]):
+            text = _scalar_to_str(item)
+            if text is not None and text not in values:
+                values.append(text)
+        if values:
+            attrs[key] = values
+
+    return Frontmatter(tags, attrs)
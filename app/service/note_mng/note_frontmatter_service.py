@@ -0,0 +1,141 @@
+# note_frontmatter_service.py
+
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import select, delete, insert, func, literal
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database.note_mng.model.note_frontmatter_model import NoteTag, NoteAttr, NoteFacet
+from app.database.note_mng.model.note_model import NoteMetadata
+from app.database.note_mng.sql_chunks import in_chunks
+from app.service.note_mng.note_frontmatter_parser import parse_frontmatter
+from app.spec.constant.ModelEnums import UseStatEnum
+
+# 태그 집계 행의 facet_key (속성은 속성 이름을 그대로 facet_key 로 사용)
+TAG_FACET_KEY = "tag"
+
+
+class NoteFrontmatterService:
+    """
+    frontmatter 태그/속성 테이블과 사전 집계(NOTE_FACET) 관리.
+    - 노트가 저장될 때 그 노트의 태그/속성만 교체하고, 영향 받은 (키, 값)의 집계만 다시 계산합니다.
+    - 커밋은 호출하는 쪽(NoteService)의 트랜잭션에 맡깁니다.
+    """
+
+    # 백필 완료 기록 (frontmatter 해석 규칙이 바뀌면 버전을 올려서 전체 노트를 다시 계산)
+    DERIVED_NAME = "frontmatter"
+    DERIVED_VERSION = "1"
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def replace_bulk(self, notes_with_content: Iterable[Tuple[NoteMetadata, str]]):
+        """ 노트들의 태그/속성을 본문 frontmatter 기준으로 교체 (note.id 가 채워진 상태여야 함) """
+        parsed = [(note.id, parse_frontmatter(content)) for note, content in notes_with_content]
+        if not parsed:
+            return
+
+        # 1. 기존 값 (집계 갱신 대상) 조회 후 삭제
+        affected: Set[Tuple[str, str]] = set()
+        for note_ids in in_chunks([note_id for note_id, _ in parsed]):
+            old_tags = await self.db.execute(select(NoteTag.tag).where(NoteTag.note_id.in_(note_ids)))
+            affected.update((TAG_FACET_KEY, tag) for tag in old_tags.scalars())
+            old_attrs = await self.db.execute(
+                select(NoteAttr.attr_key, NoteAttr.attr_value).where(NoteAttr.note_id.in_(note_ids))
+            )
+            affected.update((key, value) for key, value in old_attrs.all())
+
+            await self.db.execute(delete(NoteTag).where(NoteTag.note_id.in_(note_ids)))
+            await self.db.execute(delete(NoteAttr).where(NoteAttr.note_id.in_(note_ids)))
+
+        # 2. 새 값 추가
+        rows = []
+        for note_id, frontmatter in parsed:
+            for tag in frontmatter.tags:
+                rows.append(NoteTag(note_id=note_id, tag=tag))
+                affected.add((TAG_FACET_KEY, tag))
+            for key, values in frontmatter.attrs.items():
+                for value in values:
+                    rows.append(NoteAttr(note_id=note_id, attr_key=key, attr_value=value))
+                    affected.add((key, value))
+        self.db.add_all(rows)
+        await self.db.flush()
+
+        # 3. 영향 받은 집계만 재계산
+        await self.refresh_facets(affected)
+
+    async def refresh_facets(self, pairs: Optional[Set[Tuple[str, str]]] = None):
+        """
+        (facet_key, facet_value) 별 사용 가능 노트 수를 다시 계산합니다.
+        pairs 가 없으면 전체 재계산 (동기화 시)
+        """
+        if pairs is None:
+            await self.db.execute(delete(NoteFacet))
+            await self._insert_counts(self._tag_counts(), self._attr_counts())
+            return
+
+        by_key: Dict[str, List[str]] = {}
+        for key, value in pairs:
+            by_key.setdefault(key, []).append(value)
+
+        for key, values in by_key.items():
+            for chunk in in_chunks(values):
+                await self.db.execute(
+                    delete(NoteFacet).where(NoteFacet.facet_key == key, NoteFacet.facet_value.in_(chunk))
+                )
+                if key == TAG_FACET_KEY:
+                    await self._insert_counts(self._tag_counts().where(NoteTag.tag.in_(chunk)))
+                else:
+                    await self._insert_counts(
+                        self._attr_counts().where(NoteAttr.attr_key == key, NoteAttr.attr_value.in_(chunk))
+                    )
+
+    async def get_facets(self, limit: int = 100) -> dict:
+        """ 사이드바용 집계: 태그와 속성별 상위 값 (NOTE_FACET 만 조회) """
+        stmt = select(NoteFacet).where(NoteFacet.note_count > 0).order_by(
+            NoteFacet.facet_key, NoteFacet.note_count.desc(), NoteFacet.facet_value
+        )
+        tags, attrs = [], {}
+        for facet in (await self.db.execute(stmt)).scalars():
+            bucket = tags if facet.facet_key == TAG_FACET_KEY else attrs.setdefault(facet.facet_key, [])
+            if len(bucket) < limit:
+                bucket.append({"value": facet.facet_value, "count": facet.note_count})
+        return {"tags": tags, "attrs": attrs}
+
+    @staticmethod
+    def filter_conditions(tags: Optional[List[str]] = None, attrs: Optional[List[Tuple[str, str]]] = None) -> list:
+        """ NoteMetadata 쿼리에 붙일 조건 목록 (여러 개면 모두 만족해야 함) """
+        conditions = []
+        for tag in tags or []:
+            conditions.append(NoteMetadata.id.in_(
+                select(NoteTag.note_id).where(NoteTag.tag == tag.strip().lstrip("#").lower())
+            ))
+        for key, value in attrs or []:
+            conditions.append(NoteMetadata.id.in_(
+                select(NoteAttr.note_id).where(NoteAttr.attr_key == key.strip().lower(), NoteAttr.attr_value == value)
+            ))
+        return conditions
+
+    @staticmethod
+    def _tag_counts():
+        return (
+            select(literal(TAG_FACET_KEY), NoteTag.tag, func.count(func.distinct(NoteTag.note_id)))
+            .join(NoteMetadata, NoteMetadata.id == NoteTag.note_id)
+            .where(NoteMetadata.use_stat_cd == UseStatEnum.USABLE)
+            .group_by(NoteTag.tag)
+        )
+
+    @staticmethod
+    def _attr_counts():
+        return (
+            select(NoteAttr.attr_key, NoteAttr.attr_value, func.count(func.distinct(NoteAttr.note_id)))
+            .join(NoteMetadata, NoteMetadata.id == NoteAttr.note_id)
+            .where(NoteMetadata.use_stat_cd == UseStatEnum.USABLE)
+            .group_by(NoteAttr.attr_key, NoteAttr.attr_value)
+        )
+
+    async def _insert_counts(self, *count_queries):
+        for query in count_queries:
+            await self.db.execute(
+                insert(NoteFacet).from_select(["facet_key", "facet_value", "note_count"], query)
+            )
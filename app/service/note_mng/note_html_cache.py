@@ -0,0 +1,150 @@
+# note_html_cache.py
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional
+
+import markdown
+
+from app.config.app_path import DATA_DIR
+from app.service.metrics.note_metrics import NOTE_CACHE_REQUESTS_TOTAL
+from app.service.metrics.request_tracer import trace_span
+from app.service.note_mng.note_html_sanitizer import sanitize_html
+
+# 렌더링 옵션이 바뀌면 올려서 기존 캐시를 무효화 (2: 원시 HTML 이스케이프 + 허용 목록 정리)
+RENDER_VERSION = "2"
+_MARKDOWN_EXTENSIONS = ["extra", "sane_lists", "toc"]
+
+
+def render_markdown(content: str) -> str:
+    """
+    노트 본문을 HTML 로 렌더링 (표, 코드 블록, 목차 앵커 포함)
+    같은 출처에서 text/html 로 서비스되므로 본문의 원시 HTML 은 글자 그대로 보이게 이스케이프하고,
+    렌더링 결과도 허용 목록으로 한 번 더 정리한다. (attr_list 로 붙인 이벤트 속성, javascript: 링크 등)
+    """
+    with trace_span("markdown.render"):
+        md = markdown.Markdown(extensions=_MARKDOWN_EXTENSIONS, output_format="html")
+        md.preprocessors.deregister("html_block")
+        md.inlinePatterns.deregister("html")
+        return sanitize_html(md.convert(content))
+
+
+class NoteHtmlCache:
+    """
+    렌더링된 노트 HTML 캐시. 키는 (파일 경로, 커밋 해시) 이므로 같은 리비전은 한 번만 렌더링합니다.
+    - 메모리: 워커별 LRU (항목 수 제한)
+    - 디스크: 워커 간 공유, 전체 용량 제한 (초과 시 오래 쓰이지 않은 파일부터 삭제)
+    """
+
+    def __init__(self, cache_dir: Optional[Path] = None, memory_items: int = 256,
+                 disk_max_bytes: int = 256 * 1024 * 1024):
+        self.cache_dir = Path(cache_dir or DATA_DIR / "cache" / "html")
+        self.memory_items = memory_items
+        self.disk_max_bytes = disk_max_bytes
+
+        self._memory: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk_bytes: Optional[int] = None  # 첫 저장 시 한 번 계산
+
+    @staticmethod
+    def cache_key(file_path: str, commit_hash: Optional[str], content_hash: Optional[str] = None) -> Optional[str]:
+        """ 리비전을 식별할 수 없으면 (커밋/본문 해시 모두 없음) None -> 캐시하지 않음 """
+        revision = commit_hash or (f"sha256:{content_hash}" if content_hash else None)
+        if revision is None:
+            return None
+        return hashlib.sha1(f"{RENDER_VERSION}:{revision}:{file_path}".encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def etag(key: str) -> str:
+        return f'"{key}"'
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            html = self._memory.get(key)
+            if html is not None:
+                self._memory.move_to_end(key)
+                NOTE_CACHE_REQUESTS_TOTAL.labels(cache="html_memory", result="hit").inc()
+                return html
+        NOTE_CACHE_REQUESTS_TOTAL.labels(cache="html_memory", result="miss").inc()
+
+        path = self._disk_path(key)
+        try:
+            html = path.read_text(encoding="utf-8")
+            os.utime(path)  # LRU 삭제 기준 갱신
+        except OSError:
+            NOTE_CACHE_REQUESTS_TOTAL.labels(cache="html_disk", result="miss").inc()
+            return None
+
+        NOTE_CACHE_REQUESTS_TOTAL.labels(cache="html_disk", result="hit").inc()
+        self._remember(key, html)
+        return html
+
+    def render_and_store(self, key: Optional[str], content: str) -> str:
+        html = render_markdown(content)
+        if key is not None:
+            self._remember(key, html)
+            self._write_disk(key, html)
+        return html
+
+    def _remember(self, key: str, html: str):
+        with self._lock:
+            self._memory[key] = html
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_items:
+                self._memory.popitem(last=False)
+
+    def _disk_path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.html"
+
+    def _write_disk(self, key: str, html: str):
+        path = self._disk_path(key)
+        data = html.encode("utf-8")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # 다른 워커가 반쯤 쓴 파일을 읽지 않도록 임시 파일에 쓰고 교체
+            tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp_path.write_bytes(data)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"[Error] HTML 캐시 저장 실패 ({path}): {e}")
+            return
+
+        with self._lock:
+            if self._disk_bytes is None:
+                self._disk_bytes = sum(f.stat().st_size for f in self.cache_dir.glob("*/*.html"))
+            else:
+                self._disk_bytes += len(data)
+            over_limit = self._disk_bytes > self.disk_max_bytes
+        if over_limit:
+            self._evict_disk()
+
+    def _evict_disk(self):
+        """ 용량 한도의 80% 까지 오래 쓰이지 않은 파일부터 삭제 """
+        files = []
+        for f in self.cache_dir.glob("*/*.html"):
+            try:
+                stat = f.stat()
+            except OSError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, f))
+        files.sort()
+
+        total = sum(size for _, size, _ in files)
+        target = int(self.disk_max_bytes * 0.8)
+        for _, size, f in files:
+            if total <= target:
+                break
+            try:
+                f.unlink()
+                total -= size
+            except OSError:
+                pass
+
+        with self._lock:
+            self._disk_bytes = total
+
+
+note_html_cache = NoteHtmlCache()
@@ -0,0 +1,89 @@
+# note_html_sanitizer.py
+
+import re
+from html import escape
+from html.parser import HTMLParser
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+# 마크다운(extra, sane_lists, toc)이 만드는 태그만 허용
+_ALLOWED_TAGS: FrozenSet[str] = frozenset({
+    "p", "br", "hr", "h1", "h2", "h3", "h4", "h5", "h6", "strong", "em", "b", "i", "code", "pre", "blockquote",
+    "ul", "ol", "li", "a", "img", "table", "thead", "tbody", "tr", "th", "td", "dl", "dt", "dd", "abbr",
+    "sup", "sub", "div", "span", "del", "ins",
+})
+_VOID_TAGS = frozenset({"br", "hr", "img"})
+# 내용까지 통째로 버리는 태그
+_DROP_CONTENT_TAGS = frozenset({"script", "style", "iframe", "object", "embed", "template", "noscript", "textarea"})
+
+# 태그별 허용 속성 ("*" 는 모든 허용 태그 공통). 목차 앵커(id), 각주/코드 언어(class), 표 정렬(align/style)
+_ALLOWED_ATTRS: Dict[str, FrozenSet[str]] = {
+    "*": frozenset({"id", "class", "title"}),
+    "a": frozenset({"href"}),
+    "img": frozenset({"src", "alt"}),
+    "ol": frozenset({"start"}),
+    "th": frozenset({"align", "style"}),
+    "td": frozenset({"align", "style"}),
+}
+_URL_ATTRS = frozenset({"href", "src"})
+_SAFE_SCHEMES = ("http", "https", "mailto")
+_SCHEME = re.compile(r"^([a-zA-Z][a-zA-Z0-9+.\-]*):")
+_CONTROL_CHARS = re.compile(r"[\x00-\x20\x7f]+")
+_TEXT_ALIGN_STYLE = re.compile(r"^text-align:\s*(left|right|center);?$")
+
+
+def _safe_url(value: str) -> bool:
+    """ 상대 경로/앵커와 http(s)/mailto 만 허용 (javascript:, data: 등 차단) """
+    match = _SCHEME.match(_CONTROL_CHARS.sub("", value))
+    return match is None or match.group(1).lower() in _SAFE_SCHEMES
+
+
+class _Sanitizer(HTMLParser):
+    """ 파싱한 토큰에서 허용된 태그/속성만 다시 직렬화 (원문을 고치는 게 아니라 새로 만들어서 우회 여지를 줄임) """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.out: List[str] = []
+        self._drop_depth = 0
+
+    def handle_starttag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]):
+        if tag in _DROP_CONTENT_TAGS:
+            self._drop_depth += 1
+            return
+        if self._drop_depth or tag not in _ALLOWED_TAGS:
+            return
+        allowed = _ALLOWED_ATTRS["*"] | _ALLOWED_ATTRS.get(tag, frozenset())
+        rendered = []
+        for name, value in attrs:
+            value = value or ""
+            if name not in allowed:
+                continue
+            if name in _URL_ATTRS and not _safe_url(value):
+                continue
+            if name == "style" and not _TEXT_ALIGN_STYLE.match(value.strip()):
+                continue
+            rendered.append(f' {name}="{escape(value, quote=True)}"')
+        self.out.append(f"<{tag}{''.join(rendered)}>")
+
+    def handle_startendtag(self, tag: str, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag in _DROP_CONTENT_TAGS:
+            self._drop_depth -= 1
+
+    def handle_endtag(self, tag: str):
+        if tag in _DROP_CONTENT_TAGS:
+            self._drop_depth = max(0, self._drop_depth - 1)
+            return
+        if not self._drop_depth and tag in _ALLOWED_TAGS and tag not in _VOID_TAGS:
+            self.out.append(f"</{tag}>")
+
+    def handle_data(self, data: str):
+        if not self._drop_depth:
+            self.out.append(escape(data, quote=False))
+
+
+def sanitize_html(html: str) -> str:
+    """ 렌더링된 노트 HTML 에서 허용 목록 밖의 태그/속성/URL 을 제거 (주석, 스크립트, 이벤트 핸들러 등) """
+    sanitizer = _Sanitizer()
+    sanitizer.feed(html)
+    sanitizer.close()
+    return "".join(sanitizer.out)
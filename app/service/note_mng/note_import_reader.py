@@ -0,0 +1,88 @@
+# note_import_reader.py
+
+import os
+import tarfile
+import zipfile
+from typing import BinaryIO, List, Tuple
+
+from app.exception.NoteServiceException import NoteServiceError, NoteImportLimitError
+
+# 💡 아카이브 가져오기 한도 (압축을 푼 .md 본문 합계 / .md 파일 수). 압축 폭탄이나 과도한 요청이 메모리를 다 쓰지 않도록
+IMPORT_MAX_TOTAL_BYTES = int(os.getenv("NOTE_IMPORT_MAX_BYTES", str(64 * 1024 * 1024)))
+IMPORT_MAX_FILES = int(os.getenv("NOTE_IMPORT_MAX_FILES", "5000"))
+
+
+class _ImportBudget:
+    """ 읽은 .md 파일 수와 바이트 합계를 세다가 한도를 넘으면 NoteImportLimitError """
+
+    def __init__(self, max_total_bytes: int, max_files: int):
+        self.max_total_bytes = max_total_bytes
+        self.max_files = max_files
+        self.remaining = max_total_bytes
+        self.files = 0
+
+    def read(self, member) -> bytes:
+        self.files += 1
+        if self.files > self.max_files:
+            raise NoteImportLimitError(f"아카이브의 .md 파일이 {self.max_files}개를 넘습니다.")
+        # 헤더의 크기는 믿지 않고 남은 한도 + 1 바이트까지만 실제로 읽어 본다.
+        data = member.read(self.remaining + 1)
+        if len(data) > self.remaining:
+            raise NoteImportLimitError(f"아카이브의 .md 파일 합계가 {self.max_total_bytes} bytes 를 넘습니다.")
+        self.remaining -= len(data)
+        return data
+
+
+def read_notes_from_archive(fileobj: BinaryIO, filename: str, max_total_bytes: int = IMPORT_MAX_TOTAL_BYTES,
+                            max_files: int = IMPORT_MAX_FILES) -> List[Tuple[str, bytes]]:
+    """
+    zip / tar(.gz, .bz2, .xz) 아카이브에서 .md 파일만 추출합니다.
+    아카이브 자체는 메모리에 올리지 않고 멤버 단위로 순차적으로 읽습니다.
+    .md 파일 수가 max_files 를 넘거나 압축을 푼 합계가 max_total_bytes 를 넘으면 NoteImportLimitError
+    :return: (아카이브 내 경로, 원본 bytes) 리스트 - 디코딩은 노트별로 호출 측에서 수행
+    """
+    budget = _ImportBudget(max_total_bytes, max_files)
+    name = (filename or "").lower()
+    if name.endswith(".zip") or zipfile.is_zipfile(fileobj):
+        fileobj.seek(0)
+        return _read_zip(fileobj, budget)
+
+    fileobj.seek(0)
+    try:
+        return _read_tar(fileobj, budget)
+    except tarfile.TarError as e:
+        raise NoteServiceError(f"지원하지 않는 아카이브 형식입니다 ({filename}): {e}")
+
+
+def _is_note_member(path: str) -> bool:
+    """ 숨김 경로(.git, __MACOSX 등)를 제외한 .md 파일만 대상 """
+    parts = path.replace("\\", "/").split("/")
+    return path.lower().endswith(".md") and not any(p.startswith((".", "__")) for p in parts)
+
+
+def _read_zip(fileobj: BinaryIO, budget: _ImportBudget) -> List[Tuple[str, bytes]]:
+    notes = []
+    with zipfile.ZipFile(fileobj) as zf:
+        members = [info for info in zf.infolist() if not info.is_dir() and _is_note_member(info.filename)]
+        # 중앙 디렉토리만으로 알 수 있는 초과는 압축을 풀기 전에 거절
+        if len(members) > budget.max_files:
+            raise NoteImportLimitError(f"아카이브의 .md 파일이 {budget.max_files}개를 넘습니다.")
+        if sum(info.file_size for info in members) > budget.max_total_bytes:
+            raise NoteImportLimitError(f"아카이브의 .md 파일 합계가 {budget.max_total_bytes} bytes 를 넘습니다.")
+        for info in members:
+            with zf.open(info) as member:
+                notes.append((info.filename, budget.read(member)))
+    return notes
+
+
+def _read_tar(fileobj: BinaryIO, budget: _ImportBudget) -> List[Tuple[str, bytes]]:
+    notes = []
+    # "r|*" 스트림 모드: 앞에서부터 순차적으로만 읽는다. (seek 불가 스트림도 지원)
+    with tarfile.open(fileobj=fileobj, mode="r|*") as tf:
+        for member in tf:
+            if not member.isfile() or not _is_note_member(member.name):
+                continue
+            extracted = tf.extractfile(member)
+            if extracted is not None:
+                notes.append((member.name, budget.read(extracted)))
+    return notes
@@ -0,0 +1,60 @@
+# note_link_extractor.py
+
+import posixpath
+import re
+from typing import List, NamedTuple
+from urllib.parse import unquote
+
+LINK_TYPE_WIKI = "wiki"
+LINK_TYPE_MARKDOWN = "markdown"
+
+# [[제목]], [[제목|별칭]], [[제목#섹션]]
+_WIKI_LINK = re.compile(r"\[\[([^\[\]|#]+)(?:#[^\[\]|]*)?(?:\|([^\[\]]*))?\]\]")
+# [텍스트](경로.md), [텍스트](경로.md#섹션 "툴팁"), 이미지(![...](...))는 제외
+_MARKDOWN_LINK = re.compile(r"(?<!!)\[([^\[\]]*)\]\(\s*(?:<([^>\n]+)>|([^)\s]+))(?:\s+\"[^\"]*\")?\s*\)")
+# 코드 블록/인라인 코드 안의 링크는 링크가 아님
+_FENCED_CODE = re.compile(r"```.*?```|~~~.*?~~~", re.DOTALL)
+_INLINE_CODE = re.compile(r"`[^`\n]*`")
+
+
+class ExtractedLink(NamedTuple):
+    link_type: str
+    target_key: str
+    link_text: str
+
+
+def extract_links(content: str, source_path: str) -> List[ExtractedLink]:
+    """
+    노트 본문에서 다른 노트를 가리키는 링크를 추출합니다. (같은 대상은 한 번만)
+    :param content: 노트 본문
+    :param source_path: 원본 노트의 저장소 기준 상대 경로 (markdown 상대 링크 해석 기준)
+    """
+    text = _INLINE_CODE.sub("", _FENCED_CODE.sub("", content))
+    source_dir = posixpath.dirname(source_path.replace("\\", "/"))
+
+    links, seen = [], set()
+
+    for match in _WIKI_LINK.finditer(text):
+        title = match.group(1).strip()
+        if title and (LINK_TYPE_WIKI, title) not in seen:
+            seen.add((LINK_TYPE_WIKI, title))
+            links.append(ExtractedLink(LINK_TYPE_WIKI, title, (match.group(2) or title).strip()))
+
+    for match in _MARKDOWN_LINK.finditer(text):
+        target = unquote((match.group(2) or match.group(3)).split("#", 1)[0])
+        # 외부 URL, 메일, 페이지 내 앵커, .md 가 아닌 첨부파일은 제외
+        if not target or re.match(r"^[a-zA-Z][a-zA-Z0-9+.-]*:", target) or not target.lower().endswith(".md"):
+            continue
+
+        if target.startswith("/"):
+            resolved = posixpath.normpath(target.lstrip("/"))
+        else:
+            resolved = posixpath.normpath(posixpath.join(source_dir, target))
+        if resolved.startswith(".."):
+            continue
+
+        if (LINK_TYPE_MARKDOWN, resolved) not in seen:
+            seen.add((LINK_TYPE_MARKDOWN, resolved))
+            links.append(ExtractedLink(LINK_TYPE_MARKDOWN, resolved, match.group(1).strip()))
+
+    return links
@@ -0,0 +1,130 @@
+# note_link_service.py
+
+from typing import Iterable, List, Optional, Tuple
+
+from sqlalchemy import select, delete, update, case
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database.note_mng.model.note_link_model import NoteLink
+from app.database.note_mng.model.note_model import NoteMetadata
+from app.database.note_mng.sql_chunks import in_chunks
+from app.service.note_mng.note_link_extractor import extract_links, LINK_TYPE_WIKI, LINK_TYPE_MARKDOWN
+from app.spec.constant.ModelEnums import UseStatEnum
+
+
+class NoteLinkService:
+    """
+    노트 링크 그래프(NOTE_LINK) 관리.
+    - 원본 노트가 저장될 때마다 그 노트의 링크만 다시 계산해 교체합니다. (전체 재계산 X)
+    - 대상 노트가 생기거나 이름/경로가 바뀌면 refresh_targets 로 dst_note_id 를 다시 맞춥니다.
+    - 커밋은 호출하는 쪽(NoteService)의 트랜잭션에 맡깁니다.
+    """
+
+    # 백필 완료 기록 (링크 추출 규칙이 바뀌면 버전을 올려서 전체 노트를 다시 계산)
+    DERIVED_NAME = "link"
+    DERIVED_VERSION = "1"
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def replace_links(self, note: NoteMetadata, content: str):
+        await self.replace_links_bulk([(note, content)])
+
+    async def replace_links_bulk(self, notes_with_content: Iterable[Tuple[NoteMetadata, str]]):
+        """ 원본 노트들의 기존 링크를 지우고 본문에서 다시 추출한 링크로 교체 (note.id 가 채워진 상태여야 함) """
+        extracted = [(note.id, extract_links(content, note.file_path)) for note, content in notes_with_content]
+        if not extracted:
+            return
+
+        for src_ids in in_chunks([src_id for src_id, _ in extracted]):
+            await self.db.execute(delete(NoteLink).where(NoteLink.src_note_id.in_(src_ids)))
+
+        # 대상 노트를 종류별로 한 번에 조회
+        titles = list({link.target_key for _, links in extracted for link in links if link.link_type == LINK_TYPE_WIKI})
+        paths = list({link.target_key for _, links in extracted for link in links if link.link_type == LINK_TYPE_MARKDOWN})
+        title_to_id = await self._resolve(NoteMetadata.title, titles)
+        path_to_id = await self._resolve(NoteMetadata.file_path, paths)
+
+        rows = []
+        for src_id, links in extracted:
+            for link in links:
+                lookup = title_to_id if link.link_type == LINK_TYPE_WIKI else path_to_id
+                rows.append(NoteLink(
+                    src_note_id=src_id,
+                    dst_note_id=lookup.get(link.target_key),
+                    link_type=link.link_type,
+                    target_key=link.target_key,
+                    link_text=link.link_text[:500],
+                ))
+        self.db.add_all(rows)
+
+    async def refresh_targets(self, keys: Optional[List[str]] = None, note_ids: Optional[List[str]] = None):
+        """
+        target_key 로 dst_note_id 를 다시 해석합니다.
+        - keys/note_ids 를 주면 해당 키를 가리키거나 해당 노트를 가리키던 링크만 갱신 (저장 시)
+        - 둘 다 없으면 전체 갱신 (동기화 시)
+        """
+        def _match(column):
+            return select(NoteMetadata.id).where(
+                column == NoteLink.target_key,
+                NoteMetadata.use_stat_cd == UseStatEnum.USABLE,
+            ).limit(1).scalar_subquery()
+
+        stmt = update(NoteLink).values(dst_note_id=case(
+            (NoteLink.link_type == LINK_TYPE_WIKI, _match(NoteMetadata.title)),
+            else_=_match(NoteMetadata.file_path),
+        ))
+
+        if keys is None and note_ids is None:
+            await self.db.execute(stmt)
+            return
+
+        for chunk in in_chunks(list(keys or [])):
+            await self.db.execute(stmt.where(NoteLink.target_key.in_(chunk)))
+        for chunk in in_chunks(list(note_ids or [])):
+            await self.db.execute(stmt.where(NoteLink.dst_note_id.in_(chunk)))
+
+    async def get_backlinks(self, note_id: str) -> List[dict]:
+        """ note_id 를 가리키는 노트 목록 """
+        stmt = (
+            select(NoteMetadata.id, NoteMetadata.title, NoteMetadata.file_path, NoteLink.link_type, NoteLink.link_text)
+            .join(NoteMetadata, NoteMetadata.id == NoteLink.src_note_id)
+            .where(NoteLink.dst_note_id == note_id, NoteMetadata.use_stat_cd == UseStatEnum.USABLE)
+            .order_by(NoteMetadata.title)
+        )
+        rows = (await self.db.execute(stmt)).all()
+        return [
+            {"id": r.id, "title": r.title, "file_path": r.file_path, "link_type": r.link_type, "link_text": r.link_text}
+            for r in rows
+        ]
+
+    async def get_outgoing_links(self, note_id: str) -> List[dict]:
+        """ note_id 가 가리키는 링크 목록 (아직 없는 노트를 가리키는 링크는 resolved=False) """
+        stmt = (
+            select(NoteLink.link_type, NoteLink.target_key, NoteLink.link_text,
+                   NoteMetadata.id, NoteMetadata.title, NoteMetadata.file_path)
+            .outerjoin(NoteMetadata, NoteMetadata.id == NoteLink.dst_note_id)
+            .where(NoteLink.src_note_id == note_id)
+            .order_by(NoteLink.id)
+        )
+        rows = (await self.db.execute(stmt)).all()
+        return [
+            {
+                "link_type": r.link_type,
+                "target_key": r.target_key,
+                "link_text": r.link_text,
+                "resolved": r.id is not None,
+                "id": r.id,
+                "title": r.title,
+                "file_path": r.file_path,
+            }
+            for r in rows
+        ]
+
+    async def _resolve(self, column, keys: List[str]) -> dict:
+        mapping = {}
+        for chunk in in_chunks(keys):
+            stmt = select(column, NoteMetadata.id).where(column.in_(chunk),
+                                                         NoteMetadata.use_stat_cd == UseStatEnum.USABLE)
+            mapping.update({key: note_id for key, note_id in (await self.db.execute(stmt)).all()})
+        return mapping
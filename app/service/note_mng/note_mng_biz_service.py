@@ -1,32 +1,72 @@
 # note_mng_biz_service.py
 
 import asyncio
+import hashlib
+import posixpath
 from http.client import HTTPException
+from itertools import groupby
 from pathlib import Path
-from typing import List, Optional, Set, Dict
+from typing import List, Optional, Set, Dict, Tuple
 
 import aiofiles
 from fastapi import Depends
-from sqlalchemy import select, func
+from sqlalchemy import select, func, or_
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database.note_mng.connection import get_db
 from app.database.note_mng.model.note_model import NoteMetadata
-from app.exception.NoteServiceException import NoteConflictError, NoteFileNotFoundError, NoteNotFoundError
+from app.exception.NoteServiceException import NoteConflictError, NoteFileNotFoundError, NoteNotFoundError, \
+    NotePatchError
+from app.service.change_feed.change_feed_hub import change_feed_hub
 from app.service.git_manage_service.git_poc import GitService
-from app.service.lang_analyzer.search_manager import NoteSearchManager
+from app.service.git_manage_service.git_shard_router import GitShardRouter, GIT_SHARDING_ENABLED, split_namespace
+from app.service.job_queue.note_job_queue import NoteJobQueue
+from app.service.job_queue.note_job_worker import note_job_worker
+from app.service.lang_analyzer.history_search_manager import NoteHistorySearchManager, HISTORY_INDEX_ENABLED
+from app.service.lang_analyzer.search_manager import NoteSearchManager, iter_note_documents
+from app.service.metrics.note_metrics import NOTE_SAVE_SKIPPED_TOTAL, NOTE_SAVE_STAGE_SECONDS, NOTE_CONFLICT_TOTAL
+from app.service.metrics.request_tracer import run_in_executor, traced
+from app.service.note_mng.note_derived_state_service import NoteDerivedStateService
+from app.service.note_mng.note_frontmatter_service import NoteFrontmatterService
+from app.service.note_mng.note_html_cache import note_html_cache
+from app.service.note_mng.note_import_reader import read_notes_from_archive
+from app.service.note_mng.note_link_service import NoteLinkService
+from app.service.note_mng.note_patch_applier import apply_unified_diff, apply_ops
+from app.service.note_mng.note_raw_content import NoteRawContent
+from app.service.note_mng.note_revision_diff import revision_diff_cache
+from app.service.note_mng.note_similarity_service import NoteSimilarityService
+from app.service.note_mng.note_title_suggester import note_title_suggester
+from app.service.note_mng.note_tree_cache import note_tree_cache
+from app.spec.biz.NoteChangeEvent import NoteChangeEvent
 from app.spec.biz.NoteConflictDetail import NoteConflictDetail
 from app.spec.constant.ModelEnums import UseStatEnum
+from app.spec.endpoint.note_import_request_ivo import NoteImportItem
+from app.spec.endpoint.note_service_file_response_ivo import NotePatchOp
+from app.spec.endpoint.note_json_response import SerializedJSON
 from app.spec.endpoint.note_service_file_tree_data_response_ivo import NoteServiceFileTreeDataResponseIVO, TreeType
+from app.spec.endpoint.note_service_file_tree_response_ivo import NoteServiceFileTreeResponseIVO
+
+
+def compute_content_digest(content: str) -> str:
+    """ 노트 본문의 SHA-256 다이제스트 (변경 없는 저장 감지용) """
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
 
 
 class NoteService:
     def __init__(self, db: AsyncSession):
         self.db = db
-        self.git_service = GitService()
+        # NOTE_GIT_SHARDS=1 이면 최상위 폴더(팀)별 저장소로 라우팅 (인터페이스는 GitService 와 같음)
+        self.git_service = GitShardRouter() if GIT_SHARDING_ENABLED else GitService()
         self.search_manager = NoteSearchManager()
+        self.link_service = NoteLinkService(db)
+        self.frontmatter_service = NoteFrontmatterService(db)
+        self.similarity_service = NoteSimilarityService(db)
+        self.job_queue = NoteJobQueue(db)
+        self.derived_state = NoteDerivedStateService(db)
 
         self.repo_path = self.git_service.repo_path
+        # 과거 버전 검색 색인은 선택 기능 (NOTE_HISTORY_INDEX=1)
+        self.history_manager = NoteHistorySearchManager(self.repo_path) if HISTORY_INDEX_ENABLED else None
 
     async def get_note_content_by_path(self, file_path: str):
         stmt = select(NoteMetadata).where(NoteMetadata.file_path == file_path,
@@ -53,6 +93,141 @@ class NoteService:
 
         return {"meta": note_meta, "content": content}
 
+    async def get_notes_batch(self, note_ids: List[str], file_paths: List[str], include_content: bool = True,
+                              read_concurrency: int = 16) -> List[dict]:
+        """
+        여러 노트를 한 번에 조회 (메타데이터는 IN 쿼리 한 번, 본문은 최대 read_concurrency 개씩 동시에 읽음).
+        요청 순서(ids 다음 paths)대로 항목마다 meta/content 또는 error 를 돌려준다. 일부가 실패해도 나머지는 응답한다.
+        """
+        file_paths = [str(path).replace("\\", "/") for path in file_paths]
+        conditions = []
+        if note_ids:
+            conditions.append(NoteMetadata.id.in_(set(note_ids)))
+        if file_paths:
+            conditions.append(NoteMetadata.file_path.in_(set(file_paths)))
+        stmt = select(NoteMetadata).where(or_(*conditions), NoteMetadata.use_stat_cd == UseStatEnum.USABLE)
+        notes = (await self.db.execute(stmt)).scalars().all()
+        by_id = {str(note.id): note for note in notes}
+        by_path = {str(note.file_path).replace("\\", "/"): note for note in notes}
+
+        requested = [("id", key, by_id.get(key)) for key in note_ids] + \
+                    [("path", key, by_path.get(key)) for key in file_paths]
+        semaphore = asyncio.Semaphore(read_concurrency)
+
+        async def resolve(kind: str, key: str, note: Optional[NoteMetadata]) -> dict:
+            item = {kind: key}
+            if note is None:
+                item["error"] = {"code": "not_found", "message": f"{kind} {key} not found"}
+                return item
+            item["meta"] = note
+            if include_content:
+                try:
+                    async with semaphore:
+                        item["content"] = await self._read_file_content(note.file_path)
+                except (NoteFileNotFoundError, OSError, UnicodeDecodeError) as e:
+                    item["error"] = {"code": "file_unreadable", "message": str(e)}
+            return item
+
+        return list(await asyncio.gather(*(resolve(kind, key, note) for kind, key, note in requested)))
+
+    async def open_raw_content(self, note_id: str) -> NoteRawContent:
+        """
+        노트 원문 파일을 열어 둔 채로 반환 (본문은 읽지 않음, 응답에서 청크 단위로 스트리밍).
+        ETag 는 현재 리비전의 커밋 해시 (연 파일이 DB 다이제스트와 다르면 약한 ETag). 호출 측에서 iter_bytes 로 다 읽거나 close 해야 한다.
+        """
+        note = await self._get_usable_note_by_id(note_id)
+        full_path = self.repo_path / note.file_path
+        if not full_path.exists():
+            raise NoteFileNotFoundError(f"File missing on disk: {note.file_path}")
+        revision = note.last_commit_hash or (f"sha256:{note.content_hash}" if note.content_hash else None)
+        return await NoteRawContent.open(full_path, revision, note.content_hash)
+
+    async def get_note_html(self, note_id: str, if_none_match: Optional[str] = None):
+        """
+        노트를 HTML 로 렌더링해 반환 (같은 리비전은 캐시에서).
+        :param if_none_match: 클라이언트가 보낸 ETag. 현재 리비전과 같으면 HTML 없이 반환
+        :return: (ETag 또는 None, HTML 또는 None)
+        """
+        note = await self._get_usable_note_by_id(note_id)
+        key = note_html_cache.cache_key(note.file_path, note.last_commit_hash, note.content_hash)
+        if key is not None:
+            etag = note_html_cache.etag(key)
+            if if_none_match and etag in [t.strip() for t in if_none_match.split(",")]:
+                return etag, None
+            html = note_html_cache.get(key)
+            if html is not None:
+                return etag, html
+
+        # 캐시 키와 본문이 어긋나지 않도록 커밋 해시 시점의 blob 을 렌더링 (없으면 현재 파일)
+        content = None
+        if note.last_commit_hash:
+            content = await run_in_executor(self.git_service.read_file_at_revision, note.last_commit_hash,
+                                            note.file_path)
+        if content is None:
+            content = await self._read_file_content(note.file_path)
+            if note.last_commit_hash:
+                key = None  # 커밋과 파일이 어긋난 상태는 캐시하지 않음
+        html = await run_in_executor(note_html_cache.render_and_store, key, content)
+        return (note_html_cache.etag(key) if key else None), html
+
+    async def compare_revisions(self, note_id: str, from_rev: str, to_rev: Optional[str] = None,
+                                mode: str = "line"):
+        """
+        노트의 두 리비전 비교 (to 생략 시 현재 리비전). 결과는 (from, to, 경로, 모드) 키로 캐시됩니다.
+        노트의 현재 경로 기준으로 blob 을 읽으므로, 해당 리비전에 파일이 없으면 빈 본문으로 비교합니다.
+        """
+        note = await self._get_usable_note_by_id(note_id)
+        revisions = []
+        for rev in (from_rev, to_rev or note.last_commit_hash):
+            commit_hash = await run_in_executor(self.git_service.resolve_commit, rev, note.file_path) if rev else None
+            if commit_hash is None:
+                raise NoteNotFoundError(f"Revision not found: {rev}")
+            revisions.append(commit_hash)
+        from_hash, to_hash = revisions
+
+        key = (from_hash, to_hash, note.file_path, mode)
+        diff = revision_diff_cache.get(key)
+        if diff is None:
+            # GitPython Repo 는 스레드 간 공유가 안전하지 않으므로 blob 은 순서대로 읽는다.
+            old_text = await run_in_executor(self.git_service.read_file_at_revision, from_hash, note.file_path)
+            new_text = await run_in_executor(self.git_service.read_file_at_revision, to_hash, note.file_path)
+            diff = await run_in_executor(revision_diff_cache.compute_and_store, key, old_text or "", new_text or "")
+        return {"note_id": note.id, "file_path": note.file_path, "from": from_hash, "to": to_hash, **diff}
+
+    async def get_similar_notes(self, note_id: str, threshold: float = 0.5, limit: int = 20):
+        """ 본문 토큰 기준으로 비슷한 노트 (MinHash 추정 유사도) """
+        await self._get_usable_note_by_id(note_id)
+        return await self.similarity_service.find_similar(note_id, threshold, limit)
+
+    async def get_duplicate_report(self, threshold: float = 0.8, limit: int = 100):
+        """ 거의 같은 내용의 노트 쌍 목록 """
+        return await self.similarity_service.duplicate_report(threshold, limit)
+
+    async def search_history(self, keyword: str, limit: int = 20, change: Optional[str] = None):
+        """ 과거 버전 검색: 키워드가 추가/삭제된 커밋 목록 (이력 색인이 꺼져 있으면 None) """
+        if self.history_manager is None:
+            return None
+        return await run_in_executor(self.history_manager.search, keyword, limit, change)
+
+    async def rebuild_suggest_index(self):
+        """ 자동완성 메모리 색인을 DB 기준으로 새로 만든다. (기동 시) """
+        stmt = select(NoteMetadata.id, NoteMetadata.title, NoteMetadata.file_path).where(
+            NoteMetadata.use_stat_cd == UseStatEnum.USABLE
+        )
+        rows = (await self.db.execute(stmt)).all()
+        await run_in_executor(note_title_suggester.rebuild, [(r.id, r.title, r.file_path) for r in rows])
+        return len(rows)
+
+    async def get_backlinks(self, note_id: str):
+        """ note_id 를 가리키는 노트 목록 (링크 테이블 인덱스 조회) """
+        await self._get_usable_note_by_id(note_id)
+        return await self.link_service.get_backlinks(note_id)
+
+    async def get_outgoing_links(self, note_id: str):
+        """ note_id 본문에 있는 링크 목록 """
+        await self._get_usable_note_by_id(note_id)
+        return await self.link_service.get_outgoing_links(note_id)
+
     async def sync_db_with_file_system(self):
         # --- [1] 파일 시스템 스캔 (커밋 해시 포함) ---
         actual_files_map = {}
@@ -66,7 +241,8 @@ class NoteService:
 
             actual_files_map[title] = {
                 "path": relative_path,
-                "hash": commit_hash
+                "hash": commit_hash,
+                "file": f,
             }
 
         actual_paths = {info["path"] for info in actual_files_map.values()}
@@ -83,6 +259,11 @@ class NoteService:
         update_count = 0
         disable_count = 0
 
+        # 링크 그래프 갱신 대상: (노트, 본문) - 변경/이동/신규 노트만 파일을 읽는다.
+        synced_notes = []
+        changed_notes = []
+        feed_items = []  # (노트, action) - 변경 피드용
+
         # --- [3] 동기화 및 해시 업데이트 ---
         for title, info in actual_files_map.items():
             current_path = info["path"]
@@ -91,42 +272,101 @@ class NoteService:
             if current_path in existing_paths:
                 note = db_path_to_note[current_path]
                 # 경로가 같더라도 커밋 해시가 바뀌었다면 업데이트
-                if note.last_commit_hash != current_hash:
+                if note.last_commit_hash != current_hash or note.content_hash is None:
+                    content = self._read_text_file(info["file"])
                     note.last_commit_hash = current_hash
+                    note.content_hash = compute_content_digest(content) if content is not None else None
+                    changed_notes.append((note, content))
+                    feed_items.append((note, "synced"))
                 note.use_stat_cd = UseStatEnum.USABLE
 
             elif title in db_title_to_note:
                 # [위치 이동] 파일명은 같은데 경로가 바뀐 경우
+                content = self._read_text_file(info["file"])
                 note = db_title_to_note[title]
                 note.file_path = current_path
                 note.last_commit_hash = current_hash  # 이동 시점의 해시 갱신
+                note.content_hash = compute_content_digest(content) if content is not None else None
                 note.use_stat_cd = UseStatEnum.USABLE
+                changed_notes.append((note, content))
+                feed_items.append((note, "moved"))
                 update_count += 1
 
             else:
                 # [신규 생성]
-                new_note = NoteMetadata(
+                content = self._read_text_file(info["file"])
+                note = NoteMetadata(
                     title=title,
                     file_path=current_path,
                     last_commit_hash=current_hash,  # 있으면 넣고 없으면 None
+                    content_hash=compute_content_digest(content) if content is not None else None,
                     use_stat_cd=UseStatEnum.USABLE,
                     last_modified_by="SYSTEM",  # 이전 에러 방지용
                     crt_user_id="SYSTEM",
                     mdfy_user_id="SYSTEM",
                     trns_cm="INIT_SYNC"
                 )
-                self.db.add(new_note)
+                self.db.add(note)
+                changed_notes.append((note, content))
+                feed_items.append((note, "created"))
                 new_count += 1
 
+            synced_notes.append((note, info["file"]))
+
         # --- [4] 유령 레코드 처리 생략 (기존과 동일) ---
         # ... (생략)
 
+        # --- [5] 링크 그래프 / frontmatter 갱신 ---
+        # 신규 노트의 ID가 필요하므로 먼저 flush
+        await self.db.flush()
+        readable_notes = [(n, c) for n, c in changed_notes if c is not None]
+        backfill_notes = []
+        outdated = await self.derived_state.outdated(
+            [self.link_service, self.frontmatter_service, self.similarity_service])
+        if outdated:
+            # 백필 기록이 없거나 계산 방식이 바뀐 파생 테이블: 나머지 노트도 한 번 다시 계산
+            changed_ids = {id(note) for note, _ in changed_notes}
+            backfill_notes = [(note, self._read_text_file(f)) for note, f in synced_notes if id(note) not in changed_ids]
+            backfill_notes = [(n, c) for n, c in backfill_notes if c is not None]
+
+        def targets(service):
+            return readable_notes + backfill_notes if service in outdated else readable_notes
+
+        await self.link_service.replace_links_bulk(targets(self.link_service))
+        await self.frontmatter_service.replace_bulk(targets(self.frontmatter_service))
+        await self.similarity_service.replace_signatures(targets(self.similarity_service))
+        # 백필 결과와 같은 트랜잭션에 완료 기록 (중간에 실패하면 다음 기동 때 다시 백필)
+        await self.derived_state.mark_current(outdated)
+        # 이동/신규로 경로·제목·사용 상태가 바뀌었을 수 있으므로 대상 노트와 집계를 전체 재계산
+        await self.link_service.refresh_targets()
+        await self.frontmatter_service.refresh_facets()
+
         await self.db.commit()
+        self._publish_changes(feed_items, "SYSTEM")
         return {"added": new_count, "updated": update_count}
 
     async def get_folder_tree_data(self) -> List[NoteServiceFileTreeDataResponseIVO]:
         return self._build_tree_ivo(self.git_service.repo_path)
 
+    async def get_folder_tree_body(self) -> SerializedJSON:
+        """ 폴더 트리 응답 본문 (직렬화 결과를 캐시해 두고 요청마다 재사용) """
+        body = note_tree_cache.get()
+        if body is not None:
+            return body
+
+        generation = note_tree_cache.generation
+
+        def build():
+            return SerializedJSON.of(NoteServiceFileTreeResponseIVO(
+                success=True,
+                data=self._build_tree_ivo(self.git_service.repo_path),
+                message="Folder tree retrieved successfully",
+            ))
+
+        body = await run_in_executor(build)
+        note_tree_cache.put(body, generation)
+        return body
+
     async def get_notes_with_pagination(self, keyword: str | None = None, page: int = 1, size: int = 20):
 
         skip = (page - 1) * size
@@ -143,7 +383,7 @@ class NoteService:
             count_query = count_query.where(filter_stmt)
 
         # 3. 정렬 및 페이징 적용
-        query = query.order_by(NoteMetadata.updated_at.desc()).offset(skip).limit(size)
+        query = query.order_by(NoteMetadata.mdfy_dt.desc()).offset(skip).limit(size)
 
         # 4. 실행
         total_count_result = await self.db.execute(count_query)
@@ -162,44 +402,74 @@ class NoteService:
         :param content:
         :param user_name:
         :param last_hash: 사용자가 수정한 마지막 git hash 버전
-        :return:
+        :return: action 이 "unchanged" 이면 커밋/색인이 생략된 것
         """
         file_name = f"{title}.md"
 
         # 💡 입력받은 file_path를 즉시 문자열로 정규화
         safe_file_path = str(file_path).replace("\\", "/")
+        content_digest = compute_content_digest(content)
 
         # 1. DB에서 기존 노트 조회
         existing_note = await self._get_note_by_path(safe_file_path)
         if existing_note:
-            await self._check_conflict(existing_note, last_hash)
+            with NOTE_SAVE_STAGE_SECONDS.labels(stage="conflict_check").time():
+                await self._check_conflict(existing_note, last_hash)
+
+            # 💡 자동 저장 등으로 내용이 그대로라면 파일 쓰기/커밋/색인을 모두 생략
+            if await self._is_unchanged(existing_note, title, content_digest):
+                NOTE_SAVE_SKIPPED_TOTAL.inc()
+                return {
+                    "action": "unchanged",
+                    "commit_hash": existing_note.last_commit_hash,
+                    "file_name": file_name,
+                    "author_name": user_name,
+                }
             action = "updated"
         else:
             action = "created"
 
         # 2. Git 서비스 호출 (파일 쓰기 및 커밋)
-        new_hash = self.git_service.write_and_commit(
+        # 다른 워커의 커밋이 끝날 때까지 git 쓰기 락을 기다릴 수 있으므로 이벤트 루프를 막지 않도록 별도 스레드에서 실행
+        new_hash = await run_in_executor(
+            self.git_service.write_and_commit,
             safe_file_path, content, user_name, f"Saev/Update note: {title}"
         )
 
         # 3. DB 메타데이터 처리
         if existing_note:
-            existing_note.title = title
-            existing_note.last_commit_hash = new_hash
-            existing_note.mdfy_user_id = user_name
+            note = existing_note
+            note.title = title
+            note.last_commit_hash = new_hash
+            note.content_hash = content_digest
+            note.mdfy_user_id = user_name
         else:
-            new_node = NoteMetadata(
+            note = NoteMetadata(
                 title=title,
                 file_path=file_path,
                 last_commit_hash=new_hash,
+                content_hash=content_digest,
                 last_modified_by=user_name,
                 crt_user_id=user_name,
                 mdfy_user_id=user_name,
             )
-            self.db.add(new_node)
+            self.db.add(note)
 
-        # 4. 트랜잭션 확정
-        await self.db.commit()
+        # 4. 링크 그래프 갱신 (이 노트의 링크 교체 + 이 노트를 가리키던/가리킬 링크 재해석) 및 태그/속성 교체
+        await self.db.flush()
+        await self.link_service.replace_links(note, content)
+        await self.link_service.refresh_targets(keys=[title, safe_file_path], note_ids=[note.id])
+        await self.frontmatter_service.replace_bulk([(note, content)])
+        # 색인/유사도 시그니처/HTML 캐시는 같은 트랜잭션에 작업으로 적재 (커밋되면 워커가 실행, 실패 시 재시도)
+        await self.job_queue.enqueue_post_commit(note.id, safe_file_path, new_hash)
+
+        # 5. 트랜잭션 확정
+        with NOTE_SAVE_STAGE_SECONDS.labels(stage="db_commit").time():
+            await self.db.commit()
+        note_job_worker.notify()
+
+        # 6. 편집 중인 다른 클라이언트에게 변경 알림 (409 전에 미리 re-base 할 수 있도록)
+        self._publish_changes([(note, action)], user_name)
 
         return {
             "action": action,
@@ -208,44 +478,242 @@ class NoteService:
             "author_name": user_name,
         }
 
+    async def save_patch_note(self, title: str, file_path: str, user_name: str, last_hash: str,
+                              patch: Optional[str] = None, ops: Optional[List[NotePatchOp]] = None):
+        """
+        last_hash 리비전의 본문에 변경분(unified diff 또는 op 리스트)을 적용한 뒤 저장합니다.
+        :return: (save_or_update_note 결과, 패치가 적용된 전체 본문)
+        """
+        if (patch is None) == (ops is None):
+            raise NotePatchError("patch 와 ops 중 하나만 전달해야 합니다.")
+
+        safe_file_path = str(file_path).replace("\\", "/")
+
+        # 1. 기준 노트 조회 및 충돌 검사 (패치는 기존 노트에만 적용 가능)
+        existing_note = await self._get_note_by_path(safe_file_path)
+        if not existing_note:
+            raise NoteNotFoundError(f"Path not found: {file_path}")
+        await self._check_conflict(existing_note, last_hash)
+
+        # 2. 기준 리비전의 blob 을 git 에서 읽어 패치 적용
+        base_content = await run_in_executor(self.git_service.read_file_at_revision, last_hash, safe_file_path)
+        if base_content is None:
+            raise NotePatchError(f"기준 리비전에서 파일을 찾을 수 없습니다: {last_hash}:{safe_file_path}")
+
+        new_content = apply_unified_diff(base_content, patch) if patch is not None else apply_ops(base_content, ops)
+
+        # 3. 이후 과정(다이제스트 비교, 커밋, DB 반영)은 일반 저장과 동일
+        result = await self.save_or_update_note(
+            title=title,
+            file_path=safe_file_path,
+            content=new_content,
+            user_name=user_name,
+            last_hash=last_hash,
+        )
+        return result, new_content
+
+    async def import_notes(self, notes: List[NoteImportItem], user_name: str):
+        """
+        여러 노트를 한 번에 가져옵니다. (파일 쓰기 -> 단일 git 커밋 -> DB 일괄 upsert)
+        노트별 오류는 전체를 실패시키지 않고 결과에 기록합니다.
+        :return: 노트별 결과 리스트 (색인 등 후속 작업은 작업 큐에 적재)
+        """
+        results = []
+        accepted = []  # (결과 dict, NoteImportItem, 정규화된 경로, 제목, 다이제스트)
+        seen_paths, seen_titles = set(), set()
+
+        # 1. 경로/제목 검증
+        for item in notes:
+            safe_file_path = self._normalize_import_path(item.file_path)
+            title = item.title or Path(safe_file_path or item.file_path).stem
+            result = {"file_path": safe_file_path or item.file_path, "title": title, "status": "pending"}
+            results.append(result)
+
+            if not safe_file_path:
+                result.update(status="failed", error="저장소 밖을 가리키거나 .md 가 아닌 경로입니다.")
+            elif safe_file_path in seen_paths or title in seen_titles:
+                result.update(status="failed", error="요청 안에서 경로 또는 제목이 중복되었습니다.")
+            else:
+                seen_paths.add(safe_file_path)
+                seen_titles.add(title)
+                accepted.append((result, item, safe_file_path, title, compute_content_digest(item.content)))
+
+        # 2. 기존 메타데이터를 경로/제목 기준으로 한 번에 조회
+        stmt = select(NoteMetadata).where(
+            NoteMetadata.file_path.in_(seen_paths) | NoteMetadata.title.in_(seen_titles)
+        )
+        db_records = (await self.db.execute(stmt)).scalars().all()
+        db_path_to_note = {n.file_path: n for n in db_records}
+        db_title_to_note = {n.title: n for n in db_records}
+
+        to_write = []
+        for result, item, safe_file_path, title, digest in accepted:
+            note = db_path_to_note.get(safe_file_path)
+            other = db_title_to_note.get(title)
+            if other is not None and other is not note:
+                result.update(status="failed", error=f"다른 경로의 노트가 같은 제목을 사용 중입니다: {other.file_path}")
+                continue
+            if note is not None and note.use_stat_cd == UseStatEnum.USABLE \
+                    and await self._is_unchanged(note, title, digest, persist_backfill=False):
+                result.update(status="unchanged", commit_hash=note.last_commit_hash)
+                continue
+            to_write.append((result, item, safe_file_path, title, digest, note))
+
+        if not to_write:
+            await self.db.commit()
+            return results
+
+        # 3. 모든 파일을 쓰고 단일 커밋으로 기록 (샤딩 시에는 샤드마다 한 커밋)
+        try:
+            commit_hashes = await run_in_executor(
+                self.git_service.write_many_and_commit_by_path,
+                [(path, item.content) for _, item, path, _, _, _ in to_write],
+                user_name,
+                f"Import {len(to_write)} notes",
+            )
+        except Exception as e:
+            for result, *_ in to_write:
+                result.update(status="failed", error=f"Git 커밋 실패: {e}")
+            return results
+
+        # 4. DB 메타데이터 일괄 upsert 후 한 번만 커밋
+        new_notes = []
+        written = []  # (노트, 본문) - 링크 그래프 갱신용
+        feed_items = []  # (노트, action) - 변경 피드용
+        for result, item, safe_file_path, title, digest, note in to_write:
+            new_hash = commit_hashes[safe_file_path]
+            if note is not None:
+                note.title = title
+                note.last_commit_hash = new_hash
+                note.content_hash = digest
+                note.mdfy_user_id = user_name
+                note.use_stat_cd = UseStatEnum.USABLE
+                result.update(status="updated", commit_hash=new_hash)
+            else:
+                note = NoteMetadata(
+                    title=title,
+                    file_path=safe_file_path,
+                    last_commit_hash=new_hash,
+                    content_hash=digest,
+                    last_modified_by=user_name,
+                    crt_user_id=user_name,
+                    mdfy_user_id=user_name,
+                    trns_cm="IMPORT",
+                )
+                new_notes.append(note)
+                result.update(status="created", commit_hash=new_hash)
+            written.append((note, item.content))
+            feed_items.append((note, result["status"]))
+        self.db.add_all(new_notes)
+
+        # 5. 링크 그래프 / 태그·속성 일괄 갱신
+        await self.db.flush()
+        await self.link_service.replace_links_bulk(written)
+        await self.link_service.refresh_targets(
+            keys=[key for note, _ in written for key in (note.title, note.file_path)],
+            note_ids=[note.id for note, _ in written],
+        )
+        await self.frontmatter_service.replace_bulk(written)
+        for note, _ in written:
+            await self.job_queue.enqueue_post_commit(note.id, note.file_path, note.last_commit_hash)
+        await self.db.commit()
+        note_job_worker.notify()
+        self._publish_changes(feed_items, user_name)
+
+        return results
+
+    async def import_archive(self, fileobj, filename: str, user_name: str):
+        """ zip/tar 아카이브의 .md 파일들을 가져옵니다. (UTF-8 디코딩 실패 건은 결과에 실패로 기록) """
+        members = await run_in_executor(read_notes_from_archive, fileobj, filename)
+
+        items, decode_failures = [], []
+        for member_path, raw in members:
+            try:
+                items.append(NoteImportItem(file_path=member_path, content=raw.decode("utf-8")))
+            except UnicodeDecodeError as e:
+                decode_failures.append({
+                    "file_path": member_path,
+                    "title": Path(member_path).stem,
+                    "status": "failed",
+                    "error": f"UTF-8 디코딩 실패: {e}",
+                })
+
+        results = await self.import_notes(items, user_name)
+        return results + decode_failures
+
+    async def export_notes(self, rev: str = "HEAD", sub_path: Optional[str] = None, archive_format: str = "tar"):
+        """
+        특정 리비전의 노트 저장소(또는 하위 폴더)를 아카이브 스트림으로 내보냅니다.
+        :return: (커밋 해시, 아카이브 청크 async generator)
+        """
+        folder = None
+        if sub_path:
+            folder = posixpath.normpath(str(sub_path).replace("\\", "/")).strip("/")
+            if folder in ("", "."):
+                folder = None
+            elif folder.startswith(".."):
+                raise NoteNotFoundError(f"Invalid export path: {sub_path}")
+
+        resolved = await self.git_service.resolve_archive_tree(rev, folder)
+        if not resolved:
+            raise NoteNotFoundError(f"Revision or folder not found: {rev}:{folder or ''}")
+
+        commit_hash, tree_ish = resolved
+        return commit_hash, self.git_service.stream_archive(tree_ish, archive_format)
+
     async def get_all_notes(self):
         """ DB에 저장된 모든 노트 메타데이터 목록 조회 """
-        query = select(NoteMetadata).order_by(NoteMetadata.updated_at.desc())
+        query = select(NoteMetadata).order_by(NoteMetadata.mdfy_dt.desc())
         resource = await self.db.execute(query)
         return resource.scalars().all()
 
-    async def get_notes_with_complex_search(self, keyword: str, page: int = 1, size: int = 20):
+    async def get_notes_with_complex_search(self, keyword: str, page: int = 1, size: int = 20,
+                                            tags: Optional[List[str]] = None,
+                                            attrs: Optional[List[Tuple[str, str]]] = None,
+                                            folder: Optional[str] = None):
         """
         제목(DB)와 본문 (Whoosh)을 모두 아우르는 복합 검색
         :param keyword:
         :param page:
         :param size:
+        :param tags: frontmatter 태그 필터 (모두 포함하는 노트만)
+        :param attrs: frontmatter 속성 필터 [(키, 값), ...] (모두 만족하는 노트만)
+        :param folder: 이 폴더(하위 포함) 안의 노트만. 본문 검색도 해당 네임스페이스의 색인 파티션만 조회한다.
         :return:
         """
 
         skip = (page - 1) * size
+        folder = folder.strip("/") if folder else None
 
         # 1. Whoosh에서 본문 검색 결과 (제목 리스트) 가져오기
         content_matched_titles = []
         if keyword:
-            content_matched_titles = self.search_manager.search(keyword, limit=100)
+            namespace = split_namespace(f"{folder}/")[0] if folder else None
+            content_matched_titles = await run_in_executor(self.search_manager.search, keyword, 100, namespace)
 
         print(f"keyword:{keyword} content_matched_titles: {content_matched_titles}")
 
-        # 2. DB에서 검색 (제목 검색 + Whoosh에서 넘어온 제목들 포함)
-        query = select(NoteMetadata)
-        search_term = f"%{keyword}%"
-        filter_stmt = (NoteMetadata.title.like(search_term) | NoteMetadata.title.in_(content_matched_titles))
-        query = query.where(filter_stmt)
+        # 2. DB에서 검색 (제목 검색 + Whoosh에서 넘어온 제목들 포함) + 태그/속성 필터를 한 쿼리로
+        conditions = self.frontmatter_service.filter_conditions(tags, attrs)
+        if folder:
+            conditions.append(NoteMetadata.file_path.startswith(f"{folder}/", autoescape=True))
+        if keyword:
+            search_term = f"%{keyword}%"
+            conditions.append(NoteMetadata.title.like(search_term) | NoteMetadata.title.in_(content_matched_titles))
 
-        result = await self.db.execute(query.order_by(NoteMetadata.updated_at.desc()).offset(skip).limit(size))
+        query = select(NoteMetadata).where(*conditions)
+        result = await self.db.execute(query.order_by(NoteMetadata.mdfy_dt.desc()).offset(skip).limit(size))
         items = result.scalars().all()
 
-        count_query = select(func.count()).select_from(NoteMetadata)
+        count_query = select(func.count()).select_from(NoteMetadata).where(*conditions)
         total_count_result = await self.db.execute(count_query)
 
         return items, total_count_result.scalar()
 
+    async def get_facets(self, limit: int = 100):
+        """ 태그/속성별 노트 수 (사전 집계 테이블 조회) """
+        return await self.frontmatter_service.get_facets(limit)
+
     async def get_note_detail(self, title: str):
         """ 특정 노트의 DB 정보와 Git 히스토리를 함께 조회 """
         # 1. DB 메터데이터 조회
@@ -255,10 +723,7 @@ class NoteService:
 
         # 2. Git 서비스로부터 해당 파일의 커밋 로그(이력) 가져오기
         # 동기 함수인 get_file_history를 별도 스레드에서 실행
-        loop = asyncio.get_event_loop()
-        git_history = await loop.run_in_executor(
-            None, self.git_service.get_file_history, note_meta.file_path
-        )
+        git_history = await run_in_executor(self.git_service.get_file_history, note_meta.file_path)
 
         # 3. 각 커밋의 Diff 정보를 비동기 병렬로 추출
         # 실행할 작업 (Task) 리스트 생성
@@ -278,33 +743,35 @@ class NoteService:
     def sync_all_files_to_index(self):
         """
         서버 시작 시 호출하여 기존 모든 파일을 Whoosh에 색인
+        (파티션을 켰으면 네임스페이스별로 파티션을 새로 만들어 삭제/이동된 노트의 남은 문서도 정리)
         :return:
         """
 
         print(f"[System] 기존 파일 검색 색인 시작...")
-        md_files = list(self.git_service.repo_path.glob("**/*.md"))
-
-        # Whoosh writer 오픈
-        writer = self.search_manager.ix.writer()
-        for file_path in md_files:
-            title = file_path.stem
-            try:
-                with open(file_path, "r", encoding="utf-8") as f:
-                    content = f.read()
-                    # 기존 데이터가 있으면 덮어쓰기(Update)
-                    writer.update_document(title=title, content=content)
-            except Exception as e:
-                print(f"[Error] 파일 읽기 실패 ({title}): {e}")
-
-        writer.commit()
+        repo_path = self.git_service.repo_path
+        md_files = sorted(repo_path.glob("**/*.md"))
+
+        if self.search_manager.partitioned:
+            def namespace_of(path: Path) -> str:
+                return split_namespace(path.relative_to(repo_path).as_posix())[0]
+
+            namespaces = []
+            for namespace, files in groupby(sorted(md_files, key=namespace_of), key=namespace_of):
+                documents = iter_note_documents(repo_path, files)
+                self.search_manager.rebuild_partition(namespace, ((title, content) for title, content, _ in documents))
+                namespaces.append(namespace)
+            removed = self.search_manager.remove_partitions_except(namespaces)
+            print(f"[System] 총 {len(md_files)} 개의 문서 색인 완료 (파티션 {len(namespaces)}개, 삭제 {len(removed)}개)")
+            return
+
+        # 하나의 Whoosh writer 세션으로 일괄 색인 (파일은 하나씩 읽어 메모리에 모두 올리지 않음)
+        self.search_manager.update_many(iter_note_documents(repo_path, md_files))
         print(f"[System] 총 {len(md_files)} 개의 문서 색인 완료")
 
     async def _get_diff_async(self, item: dict, file_path: str):
         """ 개별 커밋의 diff를 비동기적으로 가져오는 헬퍼 메서드 """
-        loop = asyncio.get_event_loop()
         # 동기 함수인 get_file_diff를 별도 스레드에서 수행
-        diff_content = await loop.run_in_executor(
-            None,
+        diff_content = await run_in_executor(
             self.git_service.get_file_diff,
             item['hash'],
             file_path
@@ -319,6 +786,13 @@ class NoteService:
         result = await self.db.execute(query)
         return result.scalars().first()
 
+    async def _get_usable_note_by_id(self, note_id: str) -> NoteMetadata:
+        stmt = select(NoteMetadata).where(NoteMetadata.id == note_id, NoteMetadata.use_stat_cd == UseStatEnum.USABLE)
+        note = (await self.db.execute(stmt)).scalars().first()
+        if not note:
+            raise NoteNotFoundError(f"ID {note_id} not found")
+        return note
+
     async def _get_note_by_title_first(self, title: str) -> NoteMetadata:
         """ 내부용: 제목으로 노트 메타데이터 조회 """
         query = select(NoteMetadata).where(NoteMetadata.title == title)
@@ -335,13 +809,63 @@ class NoteService:
             conflict_info = NoteConflictDetail(
                 server_last_hash=note.last_commit_hash,
                 server_content=server_content,
-                updated_at=note.updated_at,
+                updated_at=note.mdfy_dt,
                 modified_by=note.last_modified_by,
             )
 
             # 상세 정보를 예외 객체에 담아 던짐
+            NOTE_CONFLICT_TOTAL.inc()
             raise NoteConflictError(conflict_data=conflict_info)
 
+    async def _is_unchanged(self, note: NoteMetadata, title: str, content_digest: str,
+                            persist_backfill: bool = True) -> bool:
+        """저장 요청이 DB에 기록된 최신 본문과 동일한지 확인"""
+        if note.title != title:
+            return False
+
+        if note.content_hash is None:
+            # 다이제스트 컬럼 도입 이전 레코드: 디스크 파일로 한 번 계산해서 채워둔다.
+            try:
+                note.content_hash = compute_content_digest(await self._read_file_content(note.file_path))
+            except NoteFileNotFoundError:
+                return False
+            if persist_backfill:
+                await self.db.commit()
+
+        return note.content_hash == content_digest
+
+    @staticmethod
+    def _publish_changes(items, author: str):
+        """ 커밋이 확정된 노트들을 변경 피드로 발행 (items: [(노트, action)]) """
+        for note, action in items:
+            change_feed_hub.publish(NoteChangeEvent(
+                action=action,
+                note_id=str(note.id),
+                file_path=str(note.file_path).replace("\\", "/"),
+                title=note.title,
+                commit_hash=note.last_commit_hash,
+                author=author,
+            ))
+
+    @staticmethod
+    def _normalize_import_path(file_path: str) -> Optional[str]:
+        """ 가져오기 경로를 저장소 기준 상대 경로로 정규화 (저장소 밖이거나 .md 가 아니면 None) """
+        normalized = posixpath.normpath(str(file_path).replace("\\", "/")).lstrip("/")
+        if normalized.startswith("..") or not normalized.lower().endswith(".md"):
+            return None
+        if any(part.startswith(".") for part in normalized.split("/")):
+            return None
+        return normalized
+
+    @staticmethod
+    def _read_text_file(file_path: Path) -> Optional[str]:
+        """ 동기화용: 디스크 파일 본문 읽기 (읽기 실패 시 None) """
+        try:
+            return file_path.read_text(encoding="utf-8")
+        except Exception as e:
+            print(f"[Error] 파일 읽기 실패 ({file_path}): {e}")
+            return None
+
     def _build_tree_ivo(self, current_path: Path, parent_id: Optional[str] = None) -> List[
         NoteServiceFileTreeDataResponseIVO]:
 
@@ -390,6 +914,7 @@ class NoteService:
 
         return tree
 
+    @traced("file.read")
     async def _read_file_content(self, relative_path: str) -> str:
         """ 실제 파일 시스템에서 내용을 읽는 공통 내부 메소드 """
         full_path = self.repo_path / relative_path
@@ -0,0 +1,141 @@
+# note_patch_applier.py
+
+import re
+from typing import List
+
+from app.exception.NoteServiceException import NotePatchError
+from app.spec.endpoint.note_service_file_response_ivo import NotePatchOp
+
+# "@@ -시작,길이 +시작,길이 @@" 형태의 hunk 헤더 (길이가 1이면 생략될 수 있음)
+_HUNK_HEADER = re.compile(r"^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@")
+
+
+def _split_lines(text: str) -> List[str]:
+    """ LF 기준으로만 줄을 나눈다. (str.splitlines 는 다른 제어 문자에서도 줄을 나누므로 사용하지 않음) """
+    parts = text.split("\n")
+    lines = [p + "\n" for p in parts[:-1]]
+    if parts[-1]:
+        lines.append(parts[-1])
+    return lines
+
+
+def _strip_newline(text: str) -> str:
+    """ "No newline at end of file" 표시가 붙은 줄의 개행 제거 """
+    if text.endswith("\r\n"):
+        return text[:-2]
+    if text.endswith("\n"):
+        return text[:-1]
+    return text
+
+
+def apply_unified_diff(base: str, diff: str) -> str:
+    """
+    unified diff 를 기준 본문에 적용한다. (fuzz 없이 문맥이 정확히 일치해야 함)
+    :param base: 기준 리비전(last_hash)의 본문
+    :param diff: `diff -u` / `git diff` 형식의 단일 파일 패치
+    :return: 패치가 적용된 본문
+    """
+    base_lines = _split_lines(base)
+    diff_lines = _split_lines(diff)
+
+    result = []
+    cursor = 0  # 다음에 복사할 base 줄 위치
+    hunk_count = 0
+    i = 0
+
+    while i < len(diff_lines):
+        header = _HUNK_HEADER.match(diff_lines[i])
+        i += 1
+        if not header:
+            line = diff_lines[i - 1]
+            if hunk_count and line.startswith(("diff --git ", "--- ", "+++ ")):
+                # 첫 hunk 뒤의 파일 헤더 = 다른 파일의 패치 (hunk 본문은 헤더의 줄 수만큼 읽으므로 본문 줄과 헷갈리지 않음)
+                raise NotePatchError("한 파일의 패치만 적용할 수 있습니다. (여러 파일의 diff)")
+            # 첫 hunk 앞의 '---', '+++', 'diff --git' 등 파일 헤더는 무시
+            continue
+
+        hunk_count += 1
+        old_start, old_len = int(header.group(1)), int(header.group(2) or 1)
+        new_len = int(header.group(4) or 1)
+
+        # 길이가 0인 hunk(순수 추가)는 old_start 줄 "다음"에 삽입된다.
+        start = old_start - 1 if old_len > 0 else old_start
+        if start < cursor or start > len(base_lines):
+            raise NotePatchError(f"hunk #{hunk_count} 위치가 올바르지 않습니다. (line {old_start})")
+
+        # 1. hunk 본문 수집 (헤더에 적힌 줄 수만큼만 읽는다)
+        body = []
+        old_left, new_left = old_len, new_len
+        while old_left > 0 or new_left > 0:
+            if i >= len(diff_lines):
+                raise NotePatchError(f"hunk #{hunk_count} 가 중간에 끝났습니다.")
+            line = diff_lines[i]
+            i += 1
+
+            tag, text = line[:1], line[1:]
+            if tag == "\\":
+                if body:
+                    body[-1][1] = _strip_newline(body[-1][1])
+                continue
+            if line in ("\n", "\r\n"):
+                # 일부 편집기는 빈 문맥 줄의 앞 공백을 지운다.
+                tag, text = " ", line
+
+            if tag == " ":
+                old_left -= 1
+                new_left -= 1
+            elif tag == "-":
+                old_left -= 1
+            elif tag == "+":
+                new_left -= 1
+            else:
+                raise NotePatchError(f"hunk #{hunk_count} 에 알 수 없는 줄이 있습니다: {line!r}")
+            body.append([tag, text])
+
+        if old_left < 0 or new_left < 0:
+            raise NotePatchError(f"hunk #{hunk_count} 의 줄 수가 헤더와 다릅니다.")
+
+        # 마지막 줄 뒤의 '\ No newline at end of file'
+        if i < len(diff_lines) and diff_lines[i].startswith("\\"):
+            if body:
+                body[-1][1] = _strip_newline(body[-1][1])
+            i += 1
+
+        # 2. hunk 적용: 문맥/삭제 줄은 기준 본문과 정확히 일치해야 한다.
+        result.extend(base_lines[cursor:start])
+        cursor = start
+        for tag, text in body:
+            if tag in (" ", "-"):
+                if cursor >= len(base_lines) or base_lines[cursor] != text:
+                    raise NotePatchError(f"hunk #{hunk_count} 가 기준 본문과 일치하지 않습니다. (line {cursor + 1})")
+                cursor += 1
+            if tag in (" ", "+"):
+                result.append(text)
+
+    if hunk_count == 0 and diff.strip():
+        raise NotePatchError("unified diff 에서 hunk(@@)를 찾을 수 없습니다.")
+
+    result.extend(base_lines[cursor:])
+    return "".join(result)
+
+
+def apply_ops(base: str, ops: List[NotePatchOp]) -> str:
+    """
+    편집 op 리스트를 기준 본문에 적용한다.
+    offset 은 모두 "기준 본문" 기준의 문자(code point) 위치이며, 구간이 겹치면 안 된다.
+    """
+    pieces = []
+    cursor = 0
+    for op in sorted(ops, key=lambda o: o.offset):
+        if op.offset < cursor:
+            raise NotePatchError(f"op 구간이 겹칩니다. (offset {op.offset})")
+        end = op.offset + op.delete_count
+        if end > len(base):
+            raise NotePatchError(f"op 가 본문 범위를 벗어났습니다. (offset {op.offset}, delete {op.delete_count})")
+
+        pieces.append(base[cursor:op.offset])
+        pieces.append(op.insert_text)
+        cursor = end
+
+    pieces.append(base[cursor:])
+    return "".join(pieces)
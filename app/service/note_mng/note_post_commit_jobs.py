@@ -0,0 +1,91 @@
+# note_post_commit_jobs.py
+
+from typing import List
+
+from sqlalchemy import select
+
+from app.database.note_mng.connection import AsyncSessionLocal
+from app.database.note_mng.model.note_model import NoteMetadata
+from app.service.git_manage_service.git_poc import GitService
+from app.service.git_manage_service.git_shard_router import GitShardRouter, GIT_SHARDING_ENABLED, split_namespace
+from app.service.lang_analyzer.search_manager import NoteSearchManager
+from app.service.metrics.request_tracer import run_in_executor
+from app.service.note_mng.note_html_cache import note_html_cache
+from app.service.note_mng.note_similarity_service import NoteSimilarityService
+from app.spec.constant.ModelEnums import UseStatEnum
+
+
+def _git_service():
+    return GitShardRouter() if GIT_SHARDING_ENABLED else GitService()
+
+
+async def _load_usable_notes(payloads: List[dict]) -> List[NoteMetadata]:
+    note_ids = list({payload["note_id"] for payload in payloads})
+    async with AsyncSessionLocal() as session:
+        return list((await session.execute(
+            select(NoteMetadata).where(NoteMetadata.id.in_(note_ids), NoteMetadata.use_stat_cd == UseStatEnum.USABLE)
+        )).scalars().all())
+
+
+def _read_current(git_service, note: NoteMetadata) -> str:
+    """ 노트의 현재 리비전 본문 (커밋에서 못 읽으면 디스크 파일) """
+    content = None
+    if note.last_commit_hash:
+        content = git_service.read_file_at_revision(note.last_commit_hash, note.file_path)
+    if content is None:
+        content = git_service.read_file_content(note.file_path)
+    return content
+
+
+async def run_index_jobs(payloads: List[dict]):
+    """
+    색인 작업: payload 의 커밋이 아니라 노트의 '현재' 리비전을 색인한다.
+    재시도가 늦게 끝나도 더 새로운 저장을 덮어쓰지 않으므로 순서와 무관하게 여러 번 실행해도 안전하다.
+    """
+    notes = await _load_usable_notes(payloads)
+    if not notes:
+        return
+
+    def index_notes():
+        git_service = _git_service()
+        documents = [(note.title, _read_current(git_service, note), note.file_path) for note in notes]
+        # 같은 네임스페이스의 문서를 모아 색인 파티션마다 한 번만 커밋
+        documents.sort(key=lambda document: split_namespace(document[2])[0])
+        NoteSearchManager().update_many(documents)
+
+    await run_in_executor(index_notes)
+
+
+async def run_similarity_jobs(payloads: List[dict]):
+    """
+    유사도 시그니처 작업: 형태소 분석(토큰화)을 저장 트랜잭션 밖에서 실행한다.
+    색인 작업과 같이 노트의 '현재' 리비전 기준이라 순서와 무관하게 여러 번 실행해도 안전하다.
+    """
+    notes = await _load_usable_notes(payloads)
+    if not notes:
+        return
+
+    def read_notes():
+        git_service = _git_service()
+        return [(note, _read_current(git_service, note)) for note in notes]
+
+    items = [(note, content) for note, content in await run_in_executor(read_notes) if content is not None]
+    async with AsyncSessionLocal() as session:
+        await NoteSimilarityService(session).replace_signatures(items)
+        await session.commit()
+
+
+async def run_html_warm_jobs(payloads: List[dict]):
+    """ HTML 캐시 작업: (경로, 커밋) 은 불변이므로 이미 캐시에 있으면 아무것도 하지 않는다. """
+
+    def warm():
+        git_service = _git_service()
+        for payload in payloads:
+            key = note_html_cache.cache_key(payload["file_path"], payload["commit_hash"])
+            if note_html_cache.get(key) is not None:
+                continue
+            content = git_service.read_file_at_revision(payload["commit_hash"], payload["file_path"])
+            if content is not None:
+                note_html_cache.render_and_store(key, content)
+
+    await run_in_executor(warm)
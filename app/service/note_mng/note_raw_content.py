@@ -0,0 +1,180 @@
+# note_raw_content.py
+
+import hashlib
+import mmap
+import os
+import re
+import threading
+from collections import OrderedDict
+from typing import AsyncIterator, Optional, Tuple
+
+import aiofiles
+
+from app.exception.NoteServiceException import NoteRangeNotSatisfiableError
+from app.service.metrics.note_metrics import NOTE_CACHE_REQUESTS_TOTAL
+
+# 💡 NOTE_RAW_MMAP=1 이면 자주 읽히는 큰 노트를 메모리 매핑해서 보낸다. (페이지 캐시를 워커 간에 공유, read 호출 없음)
+RAW_MMAP_ENABLED = os.getenv("NOTE_RAW_MMAP", "0") == "1"
+
+CHUNK_SIZE = 64 * 1024
+_MMAP_MIN_SIZE = 1024 * 1024  # 이보다 작은 파일은 일반 읽기로 충분
+_BYTE_RANGE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def parse_byte_range(header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """
+    Range 헤더를 (시작, 끝) 바이트 위치(끝 포함)로. 범위 요청이 아니면 None (전체 응답)
+    - 지원: bytes=a-b, bytes=a-, bytes=-n (마지막 n 바이트)
+    - 여러 구간(bytes=0-1,5-6)이나 형식이 잘못된 헤더는 무시하고 전체를 보낸다. (RFC 9110 허용)
+    - 시작 위치가 파일 크기 이상이면 NoteRangeNotSatisfiableError (416)
+    """
+    if not header:
+        return None
+    match = _BYTE_RANGE.match(header.strip().replace(" ", ""))
+    if not match or match.group(1) == match.group(2) == "":
+        return None
+    first, last = match.groups()
+    if first == "":
+        suffix = int(last)
+        if suffix == 0 or size == 0:
+            raise NoteRangeNotSatisfiableError(size)
+        return max(0, size - suffix), size - 1
+    start = int(first)
+    end = size - 1 if last == "" else min(int(last), size - 1)
+    if start >= size:
+        raise NoteRangeNotSatisfiableError(size)
+    if end < start:
+        return None
+    return start, end
+
+
+class NoteMmapCache:
+    """
+    크고 자주 읽히는 노트 파일의 메모리 매핑 LRU (워커별).
+    - 키에 inode/mtime/크기가 들어가므로 저장(임시 파일 -> rename)으로 파일이 바뀌면 새 매핑을 만든다.
+    - 두 번째 요청부터 매핑한다. (한 번 읽고 마는 파일까지 매핑하지 않도록)
+    - 밀려난 매핑은 닫지 않고 참조만 버린다. 아직 보내는 중인 응답이 끝나면 GC 가 정리한다.
+    """
+
+    def __init__(self, max_maps: int = 16, min_size: int = _MMAP_MIN_SIZE):
+        self.max_maps = max_maps
+        self.min_size = min_size
+        self._maps: "OrderedDict[tuple, mmap.mmap]" = OrderedDict()
+        self._seen: "OrderedDict[tuple, bool]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, fd: int, st: os.stat_result) -> Optional[mmap.mmap]:
+        if st.st_size < self.min_size:
+            return None
+        key = (st.st_dev, st.st_ino, st.st_mtime_ns, st.st_size)
+        with self._lock:
+            mapped = self._maps.get(key)
+            if mapped is not None:
+                self._maps.move_to_end(key)
+            elif key not in self._seen:
+                self._seen[key] = True  # 첫 요청은 기록만
+                while len(self._seen) > self.max_maps * 4:
+                    self._seen.popitem(last=False)
+            else:
+                del self._seen[key]
+                mapped = self._maps[key] = mmap.mmap(fd, 0, access=mmap.ACCESS_READ)
+                while len(self._maps) > self.max_maps:
+                    self._maps.popitem(last=False)
+        NOTE_CACHE_REQUESTS_TOTAL.labels(cache="mmap", result="hit" if mapped else "miss").inc()
+        return mapped
+
+
+class NoteFileDigestCache:
+    """
+    열어 둔 파일 본문의 SHA-256 다이제스트 LRU (워커별). 강한 ETag 를 붙이기 전에 파일이 DB 의 리비전과 같은지 확인하는 용도.
+    - 키는 inode/mtime/크기이므로 저장(임시 파일 -> rename)으로 파일이 바뀌면 다시 계산한다. (같은 파일은 한 번만 읽음)
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._digests: "OrderedDict[tuple, str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    async def digest(self, handle, st: os.stat_result) -> str:
+        key = (st.st_dev, st.st_ino, st.st_mtime_ns, st.st_size)
+        with self._lock:
+            digest = self._digests.get(key)
+            if digest is not None:
+                self._digests.move_to_end(key)
+        NOTE_CACHE_REQUESTS_TOTAL.labels(cache="raw_digest", result="hit" if digest else "miss").inc()
+        if digest is not None:
+            return digest
+
+        sha256 = hashlib.sha256()
+        while True:
+            chunk = await handle.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            sha256.update(chunk)
+        await handle.seek(0)
+        digest = sha256.hexdigest()
+        with self._lock:
+            self._digests[key] = digest
+            while len(self._digests) > self.max_entries:
+                self._digests.popitem(last=False)
+        return digest
+
+
+class NoteRawContent:
+    """
+    열어 둔 노트 파일 하나의 원문 응답. 요청 시점에 연 파일을 끝까지 읽으므로 도중에 저장이 있어도 한 리비전만 보낸다.
+    본문은 청크(64KB) 단위로만 메모리에 올라온다.
+    """
+
+    def __init__(self, handle, size: int, etag: str, mapped: Optional[mmap.mmap] = None):
+        self.handle = handle
+        self.size = size
+        self.etag = etag
+        self.mapped = mapped
+
+    @classmethod
+    async def open(cls, full_path, revision: Optional[str] = None,
+                   content_hash: Optional[str] = None) -> "NoteRawContent":
+        """
+        revision(커밋 해시 등)은 연 파일의 다이제스트가 DB 의 content_hash 와 같을 때만 강한 ETag 로 쓴다.
+        다이제스트가 없거나 다르면 (저장 도중이거나 디스크가 DB 와 어긋난 상태) 파일 mtime/크기로 약한 ETag 를 만든다.
+        """
+        handle = await aiofiles.open(full_path, mode="rb")
+        try:
+            st = os.fstat(handle.fileno())
+            etag = f'W/"{st.st_mtime_ns:x}-{st.st_size:x}"'
+            if revision and content_hash and await note_digest_cache.digest(handle, st) == content_hash:
+                etag = f'"{revision}"'
+        except BaseException:
+            await handle.close()
+            raise
+        mapped = note_mmap_cache.get(handle.fileno(), st) if RAW_MMAP_ENABLED else None
+        return cls(handle, st.st_size, etag, mapped)
+
+    async def iter_bytes(self, start: int = 0, end: Optional[int] = None) -> AsyncIterator[bytes]:
+        """ start ~ end(포함) 구간을 청크 단위로. 다 보내거나 클라이언트가 끊기면 파일을 닫는다. """
+        end = self.size - 1 if end is None else end
+        try:
+            if self.mapped is not None:
+                # 페이지 캐시에 올라온 파일이므로 executor 없이 바로 잘라 보낸다.
+                for offset in range(start, end + 1, CHUNK_SIZE):
+                    yield self.mapped[offset:min(offset + CHUNK_SIZE, end + 1)]
+                return
+            await self.handle.seek(start)
+            remaining = end - start + 1
+            while remaining > 0:
+                chunk = await self.handle.read(min(CHUNK_SIZE, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                yield chunk
+        finally:
+            await self.close()
+
+    async def close(self):
+        await self.handle.close()
+
+
+# 💡 매핑/다이제스트는 워커 프로세스 단위 자원이므로 전역(Global)으로 관리
+note_mmap_cache = NoteMmapCache()
+note_digest_cache = NoteFileDigestCache()
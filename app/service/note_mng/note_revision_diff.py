@@ -0,0 +1,129 @@
+# note_revision_diff.py
+
+import re
+import sys
+import threading
+from collections import OrderedDict
+from difflib import SequenceMatcher
+from typing import List, Optional, Tuple
+
+from app.service.metrics.note_metrics import NOTE_CACHE_REQUESTS_TOTAL
+from app.service.metrics.request_tracer import trace_span
+
+DIFF_MODE_LINE = "line"
+DIFF_MODE_WORD = "word"
+
+_CONTEXT_LINES = 3
+# 단어 diff 토큰: 단어(한글 어절 포함) / 공백 / 문장부호 하나씩. "예산을" -> "예산은" 처럼 어절 단위로 바뀐다.
+_WORD_TOKEN = re.compile(r"\w+|\s+|[^\w\s]", re.UNICODE)
+
+
+def _segments(old_tokens: List[str], new_tokens: List[str]) -> List[dict]:
+    """ 토큰 diff 를 연속된 같은 op 끼리 합친 조각 목록으로 """
+    segments = []
+
+    def push(op: str, text: str):
+        if not text:
+            return
+        if segments and segments[-1]["op"] == op:
+            segments[-1]["text"] += text
+        else:
+            segments.append({"op": op, "text": text})
+
+    matcher = SequenceMatcher(None, old_tokens, new_tokens, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            push("equal", "".join(old_tokens[i1:i2]))
+        else:
+            push("delete", "".join(old_tokens[i1:i2]))
+            push("insert", "".join(new_tokens[j1:j2]))
+    return segments
+
+
+def compute_diff(old_text: str, new_text: str, mode: str = DIFF_MODE_LINE) -> dict:
+    """
+    두 리비전 본문의 구조화된 diff.
+    - hunk 마다 (old_start, old_count, new_start, new_count) 와 줄 단위 변경(equal/delete/insert) 목록
+    - word 모드에서는 바뀐 줄 묶음(replace)을 줄 대신 단어 조각(segments) 으로 표현
+    """
+    with trace_span("diff.compute"):
+        old_lines = old_text.splitlines(keepends=True)
+        new_lines = new_text.splitlines(keepends=True)
+        matcher = SequenceMatcher(None, old_lines, new_lines, autojunk=False)
+
+        hunks = []
+        added = removed = 0
+        for group in matcher.get_grouped_opcodes(_CONTEXT_LINES):
+            changes = []
+            for tag, i1, i2, j1, j2 in group:
+                if tag == "equal":
+                    changes += [{"op": "equal", "text": line} for line in old_lines[i1:i2]]
+                    continue
+                removed += i2 - i1
+                added += j2 - j1
+                if tag == "replace" and mode == DIFF_MODE_WORD:
+                    changes.append({
+                        "op": "replace",
+                        "segments": _segments(_WORD_TOKEN.findall("".join(old_lines[i1:i2])),
+                                              _WORD_TOKEN.findall("".join(new_lines[j1:j2]))),
+                    })
+                else:
+                    changes += [{"op": "delete", "text": line} for line in old_lines[i1:i2]]
+                    changes += [{"op": "insert", "text": line} for line in new_lines[j1:j2]]
+
+            first, last = group[0], group[-1]
+            hunks.append({
+                "old_start": first[1] + 1,
+                "old_count": last[2] - first[1],
+                "new_start": first[3] + 1,
+                "new_count": last[4] - first[3],
+                "changes": changes,
+            })
+
+    return {"mode": mode, "added_lines": added, "removed_lines": removed, "hunks": hunks}
+
+
+class RevisionDiffCache:
+    """
+    리비전 비교 결과 LRU (워커별 메모리). 키는 (from 커밋, to 커밋, 경로, 모드) 로 모두 불변이므로 무효화가 필요 없다.
+    항목 수와 대략적인 본문 크기 합계를 함께 제한한다.
+    """
+
+    def __init__(self, max_items: int = 512, max_bytes: int = 32 * 1024 * 1024):
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self._items: "OrderedDict[Tuple[str, str, str, str], Tuple[dict, int]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: Tuple[str, str, str, str]) -> Optional[dict]:
+        with self._lock:
+            entry = self._items.get(key)
+            if entry is not None:
+                self._items.move_to_end(key)
+        NOTE_CACHE_REQUESTS_TOTAL.labels(cache="diff", result="hit" if entry else "miss").inc()
+        return entry[0] if entry else None
+
+    def put(self, key: Tuple[str, str, str, str], diff: dict, size: int):
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            self._items[key] = (diff, size)
+            self._bytes += size
+            while len(self._items) > self.max_items or self._bytes > self.max_bytes:
+                _, (_, evicted_size) = self._items.popitem(last=False)
+                self._bytes -= evicted_size
+
+    def compute_and_store(self, key: Tuple[str, str, str, str], old_text: str, new_text: str) -> dict:
+        """ 캐시 미스 시 호출 (CPU 작업이므로 executor 에서) """
+        diff = compute_diff(old_text, new_text, key[3])
+        # 구조화된 결과는 본문의 몇 배가 되므로 원문 크기 * 2 를 대략적인 메모리 사용량으로 본다.
+        self.put(key, diff, (sys.getsizeof(old_text) + sys.getsizeof(new_text)) * 2)
+        return diff
+
+
+# 💡 같은 리비전 쌍은 이력/리뷰 화면에서 반복 조회되므로 워커마다 하나의 캐시를 유지
+revision_diff_cache = RevisionDiffCache()
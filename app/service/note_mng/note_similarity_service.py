@@ -0,0 +1,143 @@
+# note_similarity_service.py
+
+import os
+from typing import Iterable, List, Tuple
+
+from sqlalchemy import select, delete, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from app.database.note_mng.model.note_model import NoteMetadata
+from app.database.note_mng.model.note_similarity_model import NoteMinHash, NoteLshBand
+from app.database.note_mng.sql_chunks import in_chunks
+from app.service.lang_analyzer.minhash import minhash_signature, lsh_band_hashes, estimate_similarity, \
+    signature_to_bytes, signature_from_bytes
+from app.service.lang_analyzer.search_manager import KoEnTokenizer, KoBigramTokenizer, SEARCH_ANALYZER, \
+    ANALYZER_NGRAM
+from app.service.metrics.request_tracer import run_in_executor
+from app.spec.constant.ModelEnums import UseStatEnum
+
+# 💡 시그니처 토큰 규칙: 본문 검색이 ngram 모드면 형태소 분석 없이 2-gram 으로 (저장 후 작업에서 Komoran/JVM 을 쓰지 않도록)
+# 규칙마다 시그니처를 서로 비교할 수 없으므로 백필 기록 버전을 나눠, 모드를 바꾸고 재시작하면 전체 노트를 다시 계산한다.
+SIMILARITY_NGRAM = SEARCH_ANALYZER == ANALYZER_NGRAM
+
+# 중복 리포트에서 비교하는 버킷 크기 상한: 템플릿/머리말처럼 많은 노트가 공유하는 버킷은 쌍이 O(N²) 으로 늘어나므로 건너뛴다.
+# (실제로 거의 같은 노트는 대부분의 밴드를 공유하므로 다른 작은 버킷에서 쌍으로 잡힌다)
+SIMILARITY_MAX_BUCKET = int(os.getenv("NOTE_SIMILARITY_MAX_BUCKET", "50"))
+
+
+def compute_signature(content: str):
+    """ 검색 색인과 같은 토큰 규칙(KoEnTokenizer 또는 2-gram)의 토큰 집합으로 MinHash 시그니처 계산 (CPU 작업, executor 에서 호출) """
+    tokenizer = KoBigramTokenizer() if SIMILARITY_NGRAM else KoEnTokenizer()
+    tokens = {token.text.lower() for token in tokenizer(content)}
+    return minhash_signature(tokens), len(tokens)
+
+
+class NoteSimilarityService:
+    """
+    MinHash + LSH 기반 유사/중복 노트 탐색.
+    - 저장 후 작업(JOB_SIMILARITY)에서 해당 노트의 시그니처와 LSH 버킷만 교체합니다. (증분 갱신, 저장 트랜잭션 밖에서 토큰화)
+    - 조회는 같은 버킷에 속한 노트만 후보로 가져와 시그니처로 유사도를 추정합니다. (전체 쌍 비교 X)
+    - 커밋은 호출하는 쪽(NoteService)의 트랜잭션에 맡깁니다.
+    """
+
+    # 백필 완료 기록 (토큰화/시그니처 방식이 바뀌면 버전을 올려서 전체 노트를 다시 계산)
+    DERIVED_NAME = "similarity"
+    DERIVED_VERSION = "ngram-1" if SIMILARITY_NGRAM else "1"
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def replace_signatures(self, notes_with_content: Iterable[Tuple[NoteMetadata, str]]):
+        """ 노트들의 시그니처/버킷 교체 (note.id 가 채워진 상태여야 함) """
+        items = list(notes_with_content)
+        if not items:
+            return
+
+        signatures = await run_in_executor(lambda: [compute_signature(content) for _, content in items])
+
+        for note_ids in in_chunks([note.id for note, _ in items]):
+            await self.db.execute(delete(NoteMinHash).where(NoteMinHash.note_id.in_(note_ids)))
+            await self.db.execute(delete(NoteLshBand).where(NoteLshBand.note_id.in_(note_ids)))
+
+        rows = []
+        for (note, _), (signature, token_count) in zip(items, signatures):
+            if not signature:
+                continue
+            rows.append(NoteMinHash(note_id=note.id, signature=signature_to_bytes(signature),
+                                    token_count=token_count))
+            rows.extend(NoteLshBand(note_id=note.id, band_no=band_no, band_hash=band_hash)
+                        for band_no, band_hash in enumerate(lsh_band_hashes(signature)))
+        self.db.add_all(rows)
+
+    async def find_similar(self, note_id: str, threshold: float = 0.5, limit: int = 20) -> List[dict]:
+        """ note_id 와 같은 LSH 버킷에 속한 노트 중 추정 유사도가 threshold 이상인 노트 """
+        own = await self.db.get(NoteMinHash, note_id)
+        if own is None:
+            return []
+
+        mine, other = aliased(NoteLshBand), aliased(NoteLshBand)
+        candidates = select(other.note_id).join(
+            mine, (mine.band_no == other.band_no) & (mine.band_hash == other.band_hash)
+        ).where(mine.note_id == note_id, other.note_id != note_id).distinct()
+        candidate_ids = list((await self.db.execute(candidates)).scalars())
+
+        signature = signature_from_bytes(own.signature)
+        scored = []
+        for note, candidate in await self._load_with_notes(candidate_ids):
+            similarity = estimate_similarity(signature, signature_from_bytes(candidate.signature))
+            if similarity >= threshold:
+                scored.append({**self._note_summary(note), "similarity": round(similarity, 3)})
+
+        scored.sort(key=lambda item: item["similarity"], reverse=True)
+        return scored[:limit]
+
+    async def duplicate_report(self, threshold: float = 0.8, limit: int = 100) -> List[dict]:
+        """
+        버킷을 공유하는 노트 쌍 중 추정 유사도가 threshold 이상인 쌍 (유사도 내림차순)
+        후보 쌍은 노트 수가 SIMILARITY_MAX_BUCKET 이하인 버킷에서만 만든다. (후보 쌍 수 <= 버킷 수 x 상한²)
+        """
+        small_buckets = select(NoteLshBand.band_no, NoteLshBand.band_hash).group_by(
+            NoteLshBand.band_no, NoteLshBand.band_hash
+        ).having(func.count().between(2, SIMILARITY_MAX_BUCKET)).subquery()
+        left, right = aliased(NoteLshBand), aliased(NoteLshBand)
+        pairs_stmt = select(left.note_id, right.note_id).join(
+            small_buckets, (left.band_no == small_buckets.c.band_no) & (left.band_hash == small_buckets.c.band_hash)
+        ).join(
+            right, (left.band_no == right.band_no) & (left.band_hash == right.band_hash)
+        ).where(left.note_id < right.note_id).distinct()
+        pairs = (await self.db.execute(pairs_stmt)).all()
+        if not pairs:
+            return []
+
+        loaded = {note.id: (note, signature_from_bytes(candidate.signature))
+                  for note, candidate in await self._load_with_notes(list({i for pair in pairs for i in pair}))}
+
+        report = []
+        for a_id, b_id in pairs:
+            if a_id not in loaded or b_id not in loaded:
+                continue
+            (note_a, sig_a), (note_b, sig_b) = loaded[a_id], loaded[b_id]
+            similarity = estimate_similarity(sig_a, sig_b)
+            if similarity >= threshold:
+                report.append({
+                    "similarity": round(similarity, 3),
+                    "a": self._note_summary(note_a),
+                    "b": self._note_summary(note_b),
+                })
+
+        report.sort(key=lambda item: item["similarity"], reverse=True)
+        return report[:limit]
+
+    async def _load_with_notes(self, note_ids: List[str]):
+        rows = []
+        for chunk in in_chunks(note_ids):
+            stmt = select(NoteMetadata, NoteMinHash).join(NoteMinHash, NoteMinHash.note_id == NoteMetadata.id).where(
+                NoteMetadata.id.in_(chunk), NoteMetadata.use_stat_cd == UseStatEnum.USABLE
+            )
+            rows.extend((await self.db.execute(stmt)).all())
+        return rows
+
+    @staticmethod
+    def _note_summary(note: NoteMetadata) -> dict:
+        return {"id": note.id, "title": note.title, "file_path": note.file_path}
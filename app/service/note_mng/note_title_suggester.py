@@ -0,0 +1,157 @@
+# note_title_suggester.py
+
+import re
+import threading
+from bisect import bisect_left, insort
+from typing import Dict, Iterable, List, Set, Tuple
+
+from app.service.lang_analyzer.hangul_jamo import normalize_for_match
+
+# 매칭 종류별 순위 (작을수록 먼저)
+_RANK_TITLE_PREFIX = 0  # 제목 맨 앞에서 일치
+_RANK_WORD_PREFIX = 1  # 제목 중간 단어의 앞에서 일치
+_RANK_PATH_PREFIX = 2  # 폴더/파일명 앞에서 일치
+_RANK_SUBSTRING = 3  # 단어 중간 일치 (n-gram 후보 검증)
+
+_PREFIX_RANKS = (_RANK_TITLE_PREFIX, _RANK_WORD_PREFIX, _RANK_PATH_PREFIX)
+
+_GRAM_SIZE = 3
+_WORD_BOUNDARY = re.compile(r"[\s_\-./()\[\]]+")
+# 짧은 입력("ㄱ")은 일치 범위가 넓으므로 limit 의 이 배수까지만 후보를 모아 정렬 (키 입력당 ~1ms 유지)
+_CANDIDATE_FACTOR = 10
+
+
+def _grams(key: str) -> Set[str]:
+    compact = key.replace(" ", "")
+    return {compact[i:i + _GRAM_SIZE] for i in range(len(compact) - _GRAM_SIZE + 1)}
+
+
+class NoteTitleSuggester:
+    """
+    제목/경로 자동완성용 메모리 색인 (DB 를 조회하지 않음).
+    - 접두어: 순위별 (자모 분해 키, 노트 ID) 정렬 리스트에서 이진 탐색
+    - 단어 중간: 자모 3-gram -> 노트 ID 역색인의 교집합 후 검증
+    기동 시 NoteMetadata 로 한 번 만들고, 이후에는 변경 피드 이벤트(저장/이동/동기화)로 갱신한다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._keys: Dict[int, List[Tuple[str, str]]] = {rank: [] for rank in _PREFIX_RANKS}
+        self._notes: Dict[str, Tuple[str, str]] = {}  # note_id -> (title, file_path)
+        self._note_keys: Dict[str, List[Tuple[int, str]]] = {}
+        self._title_keys: Dict[str, str] = {}  # note_id -> 정규화된 제목 (n-gram 검증용)
+        self._grams: Dict[str, Set[str]] = {}
+
+    def rebuild(self, notes: Iterable[Tuple[str, str, str]]):
+        """ notes: (note_id, title, file_path) 전체로 색인을 새로 만든다. """
+        fresh = NoteTitleSuggester()
+        for note_id, title, file_path in notes:
+            for rank, key in fresh._add(str(note_id), title, file_path):
+                fresh._keys[rank].append((key, str(note_id)))
+        for keys in fresh._keys.values():
+            keys.sort()
+        with self._lock:
+            self._keys, self._notes, self._note_keys = fresh._keys, fresh._notes, fresh._note_keys
+            self._title_keys, self._grams = fresh._title_keys, fresh._grams
+
+    def upsert(self, note_id: str, title: str, file_path: str):
+        with self._lock:
+            note_id = str(note_id)
+            if self._notes.get(note_id) == (title, file_path):
+                return
+            self._remove(note_id)
+            for rank, key in self._add(note_id, title, file_path):
+                insort(self._keys[rank], (key, note_id))
+
+    def remove(self, note_id: str):
+        with self._lock:
+            self._remove(str(note_id))
+
+    def on_change_event(self, payload: dict):
+        """ 변경 피드 리스너: 다른 워커의 저장도 중계 파일을 통해 반영된다. """
+        if payload.get("event") == "note.changed" and payload.get("title"):
+            self.upsert(payload["note_id"], payload["title"], payload["file_path"])
+
+    def suggest(self, query: str, limit: int = 10) -> List[dict]:
+        key = normalize_for_match(query)
+        if not key:
+            return []
+
+        best: Dict[str, int] = {}
+        wanted = limit * _CANDIDATE_FACTOR
+        with self._lock:
+            # 1. 순위가 높은 종류부터 접두어 일치를 모으고, 충분하면 다음 종류는 보지 않음
+            for rank in _PREFIX_RANKS:
+                keys = self._keys[rank]
+                index = bisect_left(keys, (key,))
+                while index < len(keys) and len(best) < wanted:
+                    entry_key, note_id = keys[index]
+                    if not entry_key.startswith(key):
+                        break
+                    best.setdefault(note_id, rank)
+                    index += 1
+                if len(best) >= limit:
+                    break
+
+            # 2. 그래도 모자라면 단어 중간 일치 (n-gram 교집합 후 검증)
+            compact = key.replace(" ", "")
+            if len(best) < limit and len(compact) >= _GRAM_SIZE:
+                candidates = None
+                for gram in sorted(_grams(key), key=lambda g: len(self._grams.get(g, ()))):
+                    ids = self._grams.get(gram, set())
+                    candidates = ids if candidates is None else candidates & ids
+                    if not candidates:
+                        break
+                for note_id in candidates or ():
+                    if len(best) >= wanted:
+                        break
+                    if note_id not in best and compact in self._title_keys[note_id].replace(" ", ""):
+                        best[note_id] = _RANK_SUBSTRING
+
+            ranked = sorted(best.items(), key=lambda item: (item[1], len(self._notes[item[0]][0]),
+                                                             self._notes[item[0]][0]))
+            return [
+                {"id": note_id, "title": self._notes[note_id][0], "file_path": self._notes[note_id][1]}
+                for note_id, _ in ranked[:limit]
+            ]
+
+    def _add(self, note_id: str, title: str, file_path: str) -> List[Tuple[int, str]]:
+        """ 색인 항목 (순위, 키) 생성 (정렬 리스트 삽입은 호출 측에서) """
+        title_key = normalize_for_match(title)
+        entries = {(_RANK_TITLE_PREFIX, title_key)}
+        for match in _WORD_BOUNDARY.finditer(title):
+            rest = normalize_for_match(title[match.end():])
+            if rest:
+                entries.add((_RANK_WORD_PREFIX, rest))
+        for segment in str(file_path).replace("\\", "/").split("/"):
+            segment_key = normalize_for_match(segment)
+            if segment_key:
+                entries.add((_RANK_PATH_PREFIX, segment_key))
+
+        entries = sorted(entries)
+        self._notes[note_id] = (title, file_path)
+        self._note_keys[note_id] = entries
+        self._title_keys[note_id] = title_key
+        for gram in _grams(title_key):
+            self._grams.setdefault(gram, set()).add(note_id)
+        return entries
+
+    def _remove(self, note_id: str):
+        for rank, key in self._note_keys.pop(note_id, []):
+            keys = self._keys[rank]
+            index = bisect_left(keys, (key, note_id))
+            if index < len(keys) and keys[index] == (key, note_id):
+                del keys[index]
+        title_key = self._title_keys.pop(note_id, None)
+        if title_key is not None:
+            for gram in _grams(title_key):
+                ids = self._grams.get(gram)
+                if ids is not None:
+                    ids.discard(note_id)
+                    if not ids:
+                        del self._grams[gram]
+        self._notes.pop(note_id, None)
+
+
+# 💡 워커(프로세스)마다 하나의 색인을 메모리에 유지
+note_title_suggester = NoteTitleSuggester()
@@ -0,0 +1,54 @@
+# note_tree_cache.py
+
+import threading
+import time
+from typing import Optional
+
+from app.service.metrics.note_metrics import NOTE_CACHE_REQUESTS_TOTAL
+from app.spec.endpoint.note_json_response import SerializedJSON
+
+
+class NoteTreeCache:
+    """
+    폴더 트리 응답(직렬화된 JSON + 압축본) 캐시 (워커별 메모리).
+    - 노트 생성/이동/동기화 이벤트(다른 워커 포함)를 받으면 무효화
+    - 서버를 거치지 않은 파일 변경에 대비해 ttl 이 지나도 다시 만든다.
+    """
+
+    def __init__(self, ttl: float = 60.0):
+        self.ttl = ttl
+        self._body: Optional[SerializedJSON] = None
+        self._built_at = 0.0
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    @property
+    def generation(self) -> int:
+        """ 트리를 만들기 전에 읽어 두고 put 에 넘긴다. (만드는 도중 변경이 있었으면 캐시하지 않음) """
+        return self._generation
+
+    def get(self) -> Optional[SerializedJSON]:
+        with self._lock:
+            body = self._body if time.monotonic() - self._built_at < self.ttl else None
+        NOTE_CACHE_REQUESTS_TOTAL.labels(cache="tree", result="hit" if body else "miss").inc()
+        return body
+
+    def put(self, body: SerializedJSON, generation: int):
+        with self._lock:
+            if generation == self._generation:
+                self._body = body
+                self._built_at = time.monotonic()
+
+    def invalidate(self):
+        with self._lock:
+            self._generation += 1
+            self._body = None
+
+    def on_change_event(self, payload: dict):
+        """ 변경 피드 리스너: 기존 노트 본문 수정(updated)은 트리 모양을 바꾸지 않으므로 무시 """
+        if payload.get("event") == "note.changed" and payload.get("action") != "updated":
+            self.invalidate()
+
+
+# 💡 폴더 트리는 모든 사용자가 같은 응답을 받으므로 워커마다 하나의 캐시를 유지
+note_tree_cache = NoteTreeCache()
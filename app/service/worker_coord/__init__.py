@@ -0,0 +1 @@
+""" 멀티 워커(gunicorn/uvicorn --workers) 프로세스 간 조율 """
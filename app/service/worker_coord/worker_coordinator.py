@@ -0,0 +1,153 @@
+# worker_coordinator.py
+
+import asyncio
+import json
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, List, Optional, Tuple
+
+from app.config.app_path import DATA_DIR
+
+if os.name == "nt":
+    import msvcrt
+else:
+    import fcntl
+
+
+def _lock_fd(fd: int, blocking: bool) -> bool:
+    """ OS 파일 락 획득 (프로세스가 죽으면 OS가 자동으로 해제함) """
+    try:
+        if os.name == "nt":
+            os.lseek(fd, 0, os.SEEK_SET)
+            mode = msvcrt.LK_LOCK if blocking else msvcrt.LK_NBLCK
+            msvcrt.locking(fd, mode, 1)
+        else:
+            fcntl.flock(fd, fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB)
+        return True
+    except OSError:
+        return False
+
+
+def _unlock_fd(fd: int):
+    if os.name == "nt":
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+    else:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+
+
+class WorkerCoordinator:
+    """
+    같은 서버의 워커 프로세스들을 파일 락으로 조율합니다.
+    - leader.lock 을 잡은 워커 1개만 리더: 기동 시 동기화 + Whoosh 색인 writer 담당
+    - 팔로워는 색인 작업을 큐 디렉토리에 적재하고, 리더가 주기적으로 모아서 반영
+    - git 쓰기(add/commit)는 저장소(샤드)별 git-write*.lock 으로 모든 워커 간 직렬화 (.git/index.lock 충돌 방지)
+    - 읽기/검색은 모든 워커가 그대로 처리
+    """
+
+    def __init__(self, run_dir: Optional[Path] = None, poll_interval: float = 1.0):
+        self.run_dir = Path(run_dir) if run_dir else DATA_DIR / "run"
+        self.queue_dir = self.run_dir / "index-queue"
+        self.poll_interval = poll_interval
+        self.queue_dir.mkdir(parents=True, exist_ok=True)
+
+        self._leader_fd: Optional[int] = None
+        # 같은 프로세스 안의 스레드끼리도 git 쓰기를 직렬화 (flock 은 fd 단위라 스레드 간에도 동작하지만 명시적으로 보호)
+        self._thread_write_locks = {}
+        self._thread_write_locks_guard = threading.Lock()
+
+    @property
+    def is_leader(self) -> bool:
+        return self._leader_fd is not None
+
+    def try_acquire_leadership(self) -> bool:
+        """ 논블로킹으로 리더 락 획득 시도. 리더가 죽으면 락이 풀려 다른 워커가 승계한다. """
+        if self.is_leader:
+            return True
+
+        fd = os.open(self.run_dir / "leader.lock", os.O_RDWR | os.O_CREAT, 0o644)
+        if not _lock_fd(fd, blocking=False):
+            os.close(fd)
+            return False
+
+        os.ftruncate(fd, 0)
+        os.write(fd, str(os.getpid()).encode())
+        self._leader_fd = fd
+        print(f"👑 [Worker {os.getpid()}] 리더로 선출되었습니다.")
+        return True
+
+    def release(self):
+        if self._leader_fd is not None:
+            _unlock_fd(self._leader_fd)
+            os.close(self._leader_fd)
+            self._leader_fd = None
+
+    @contextmanager
+    def repo_write_lock(self, lock_name: str = "git-write"):
+        """
+        git 작업 디렉토리/인덱스를 변경하는 구간을 모든 워커 간에 직렬화
+        :param lock_name: 저장소별 락 이름 (샤드가 다르면 서로 기다리지 않음)
+        """
+        with self._thread_write_locks_guard:
+            thread_lock = self._thread_write_locks.setdefault(lock_name, threading.Lock())
+        with thread_lock:
+            fd = os.open(self.run_dir / f"{lock_name}.lock", os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                _lock_fd(fd, blocking=True)
+                yield
+            finally:
+                _unlock_fd(fd)
+                os.close(fd)
+
+    def enqueue_index_job(self, job: dict):
+        """ 팔로워용: 색인 작업을 큐 파일로 적재 (임시 파일 작성 후 rename 으로 원자적 공개) """
+        # 파일명 정렬 순서 = 적재 순서 (같은 제목의 갱신이 순서대로 반영되도록)
+        name = f"{time.time_ns():020d}-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        tmp_path = self.queue_dir / f".{name}.tmp"
+        with open(tmp_path, "w", encoding="UTF-8") as f:
+            json.dump(job, f, ensure_ascii=False)
+        os.replace(tmp_path, self.queue_dir / f"{name}.json")
+
+    def pending_index_jobs(self, limit: int = 500) -> List[Tuple[Path, dict]]:
+        """ 리더용: 적재 순서대로 색인 작업을 읽는다. (반영 후 ack_index_jobs 로 삭제) """
+        jobs = []
+        for path in sorted(self.queue_dir.glob("*.json"))[:limit]:
+            try:
+                with open(path, "r", encoding="UTF-8") as f:
+                    jobs.append((path, json.load(f)))
+            except (OSError, ValueError) as e:
+                print(f"[Error] 색인 큐 파일 읽기 실패 ({path.name}): {e}")
+        return jobs
+
+    @staticmethod
+    def ack_index_jobs(paths: List[Path]):
+        for path in paths:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def queue_depth(self) -> int:
+        return sum(1 for _ in self.queue_dir.glob("*.json"))
+
+    async def run(self, on_leader_tick: Callable[[], None]):
+        """
+        워커 수명 동안 실행되는 루프.
+        팔로워는 리더 승계를 계속 시도하고, 리더는 매 주기마다 on_leader_tick(색인 큐 반영)을 실행한다.
+        """
+        loop = asyncio.get_event_loop()
+        while True:
+            try:
+                if self.try_acquire_leadership():
+                    await loop.run_in_executor(None, on_leader_tick)
+            except Exception as e:
+                print(f"[Error] 워커 조율 루프 오류: {e}")
+            await asyncio.sleep(self.poll_interval)
+
+
+# 💡 프로세스당 하나의 조율자만 존재해야 하므로 전역(Global)으로 관리
+worker_coordinator = WorkerCoordinator()
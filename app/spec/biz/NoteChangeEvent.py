@@ -0,0 +1,16 @@
+from datetime import datetime, timezone
+
+from pydantic import BaseModel, Field
+
+
+class NoteChangeEvent(BaseModel):
+    """노트 커밋/동기화 후 변경 피드로 발행되는 이벤트"""
+    event: str = "note.changed"
+    action: str  # created, updated, moved, synced
+    note_id: str
+    file_path: str
+    title: str | None = None
+    commit_hash: str | None = None
+    author: str
+    ts: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    origin_pid: int | None = None  # 워커 간 중계 시 자기 이벤트를 다시 받지 않기 위한 발행 워커 PID
@@ -4,3 +4,10 @@ from enum import Enum
 class UseStatEnum(str, Enum):
     USABLE = "USABLE"
     UNUSABLE = "UNUSABLE"
+
+
+class JobStatusEnum(str, Enum):
+    PENDING = "PENDING"
+    RUNNING = "RUNNING"
+    DONE = "DONE"
+    FAILED = "FAILED"
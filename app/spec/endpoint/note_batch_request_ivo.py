@@ -0,0 +1,22 @@
+# Swagger에서 입력받을 데이터 구조 정의
+from typing import List
+
+from pydantic import BaseModel, Field, model_validator
+
+# 한 번에 조회할 수 있는 노트 수 (폴더/검색 결과 한 페이지 기준)
+BATCH_MAX_ITEMS = 200
+
+
+class NoteBatchRequest(BaseModel):
+    """ 여러 노트를 한 번에 조회. ids 와 paths 를 섞어 보낼 수 있다. """
+    ids: List[str] = Field(default=[])
+    paths: List[str] = Field(default=[])  # 저장소 기준 상대 경로 (예: team_a/회의록.md)
+    include_content: bool = True  # False 면 메타데이터만 (파일을 읽지 않음)
+
+    @model_validator(mode="after")
+    def check_size(self):
+        if not self.ids and not self.paths:
+            raise ValueError("ids 또는 paths 중 하나 이상이 필요합니다.")
+        if len(self.ids) + len(self.paths) > BATCH_MAX_ITEMS:
+            raise ValueError(f"한 번에 최대 {BATCH_MAX_ITEMS}개까지 조회할 수 있습니다.")
+        return self
@@ -0,0 +1,17 @@
+# Swagger에서 입력받을 데이터 구조 정의
+from typing import List, Optional
+
+from pydantic import BaseModel, Field
+
+from app.service.note_mng.note_import_reader import IMPORT_MAX_FILES
+
+
+class NoteImportItem(BaseModel):
+    file_path: str  # 저장소 기준 상대 경로 (예: team_a/회의록.md)
+    content: str
+    title: Optional[str] = None  # 생략 시 파일명(stem)을 제목으로 사용
+
+
+class NoteImportRequest(BaseModel):
+    user_name: str
+    notes: List[NoteImportItem] = Field(max_length=IMPORT_MAX_FILES)  # 아카이브 가져오기와 같은 파일 수 상한
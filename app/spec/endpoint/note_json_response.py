@@ -0,0 +1,116 @@
+# 노트 API JSON 응답 (orjson 직렬화 + 미리 직렬화/압축해 두는 캐시용 본문)
+import gzip
+import hashlib
+import threading
+from decimal import Decimal
+from pathlib import PurePath
+from typing import Any, Dict, Optional
+
+import orjson
+from pydantic import BaseModel
+from starlette.responses import JSONResponse, Response
+
+try:
+    import brotli
+except ImportError:  # 선택 의존성: 없으면 gzip 만 협상
+    brotli = None
+
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5  # 응답마다 압축하므로 최고 압축률보다 속도 우선
+COMPRESS_MIN_SIZE = 1024  # 이보다 작은 응답은 압축 이득보다 헤더/CPU 비용이 큼
+_ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+
+def _default(obj: Any):
+    """ orjson 이 직접 처리하지 못하는 타입 (FastAPI jsonable_encoder 와 같은 결과가 나오도록) """
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode="json")
+    if isinstance(obj, (set, frozenset, tuple)):
+        return list(obj)
+    if isinstance(obj, (Decimal, PurePath)):
+        return str(obj)
+    if isinstance(obj, bytes):
+        return obj.decode("utf-8", "replace")
+    if hasattr(obj, "__dict__"):
+        # SQLAlchemy 모델: 로드된 컬럼만 (_sa_instance_state 제외)
+        return {key: value for key, value in vars(obj).items() if not key.startswith("_sa")}
+    raise TypeError(f"JSON 으로 직렬화할 수 없는 타입: {type(obj).__name__}")
+
+
+def dumps_json(content: Any) -> bytes:
+    if isinstance(content, BaseModel):
+        return content.model_dump_json().encode("utf-8")
+    return orjson.dumps(content, default=_default, option=_ORJSON_OPTIONS)
+
+
+def choose_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """ Accept-Encoding 에서 사용할 압축 방식 선택 (br > gzip, q=0 은 제외). 없으면 None """
+    if not accept_encoding:
+        return None
+    accepted = {}
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.strip().partition(";")
+        quality = 1.0
+        if params.strip().startswith("q="):
+            try:
+                quality = float(params.strip()[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[name.strip()] = quality
+    wildcard = accepted.get("*", 0.0)
+    if brotli is not None and accepted.get("br", wildcard) > 0:
+        return "br"
+    if accepted.get("gzip", wildcard) > 0:
+        return "gzip"
+    return None
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=GZIP_LEVEL)
+
+
+class NoteJSONResponse(JSONResponse):
+    """
+    orjson 으로 직렬화하는 JSON 응답.
+    라우터의 기본 응답 클래스로 쓰고, 응답이 큰 엔드포인트(이력, 리비전 비교 등)는 이 응답을 직접 반환해
+    FastAPI 의 jsonable_encoder 변환 단계까지 건너뛴다.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps_json(content)
+
+
+class SerializedJSON:
+    """
+    미리 직렬화해 둔 JSON 본문. 압축본은 처음 요청된 방식만 한 번 만들어 재사용한다.
+    폴더 트리처럼 여러 요청이 같은 응답을 받는 경우 캐시에 이 객체를 넣어 둔다.
+    """
+
+    def __init__(self, body: bytes):
+        self.body = body
+        self.etag = f'"{hashlib.sha1(body).hexdigest()}"'
+        self._encoded: Dict[str, bytes] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def of(cls, content: Any) -> "SerializedJSON":
+        return cls(dumps_json(content))
+
+    def encoded(self, encoding: str) -> bytes:
+        with self._lock:
+            if encoding not in self._encoded:
+                self._encoded[encoding] = compress(self.body, encoding)
+            return self._encoded[encoding]
+
+    def to_response(self, accept_encoding: Optional[str] = None, if_none_match: Optional[str] = None,
+                    minimum_size: int = COMPRESS_MIN_SIZE) -> Response:
+        headers = {"ETag": self.etag, "Cache-Control": "no-cache", "Vary": "Accept-Encoding"}
+        if if_none_match and self.etag in if_none_match:
+            return Response(status_code=304, headers=headers)
+        encoding = choose_encoding(accept_encoding) if len(self.body) >= minimum_size else None
+        if encoding is None:
+            return Response(self.body, media_type="application/json", headers=headers)
+        headers["Content-Encoding"] = encoding
+        return Response(self.encoded(encoding), media_type="application/json", headers=headers)
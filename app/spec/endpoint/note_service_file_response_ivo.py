@@ -1,5 +1,7 @@
 # Swagger에서 입력받을 데이터 구조 정의
-from pydantic import BaseModel
+from typing import List, Optional
+
+from pydantic import BaseModel, Field
 
 
 class NoteSaveRequest(BaseModel):
@@ -8,3 +10,20 @@ class NoteSaveRequest(BaseModel):
     file_path: str
     user_name: str
     last_hash: str | None = None  # 클라이언트가 알고 있는 마지막 커밋 해시
+
+
+class NotePatchOp(BaseModel):
+    """ 기준 본문의 offset 위치에서 delete_count 만큼 지우고 insert_text 를 넣는다. """
+    offset: int = Field(ge=0)  # 기준 본문 기준 문자(code point) 위치
+    delete_count: int = Field(default=0, ge=0)
+    insert_text: str = ""
+
+
+class NotePatchSaveRequest(BaseModel):
+    """ 변경분(diff/op)만 전송하는 저장 요청. patch 와 ops 중 하나만 보낸다. """
+    title: str
+    file_path: str
+    user_name: str
+    last_hash: str  # 패치의 기준이 되는 커밋 해시 (필수)
+    patch: Optional[str] = None  # unified diff
+    ops: Optional[List[NotePatchOp]] = None
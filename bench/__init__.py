@@ -0,0 +1 @@
+""" 성능 측정 도구 (부하 테스트, 벤치마크) """
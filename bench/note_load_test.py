@@ -0,0 +1,303 @@
+"""
+노트 API 부하 테스트 도구
+
+임시 데이터 폴더(NOTE_DATA_DIR)에 가상의 노트 트리를 만들어 git 저장소/DB/색인을 시드한 뒤,
+저장(동시 충돌 포함)/조회/폴더 트리/검색/이력 요청을 섞어서 보내고 엔드포인트별 지표를 출력합니다.
+
+사용 예:
+    # 앱을 같은 프로세스에서 실행 (httpx ASGITransport)
+    python -m bench.note_load_test --notes 500 --users 20 --duration 30
+
+    # uvicorn 을 별도 프로세스로 띄워 loopback 으로 호출 (멀티 워커 측정)
+    python -m bench.note_load_test --mode loopback --workers 4 --mix save=30,read=40,search=20,tree=5,history=5
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from pathlib import Path
+
+import httpx
+
+WORDS_KO = ["회의록", "프로젝트", "일정", "배포", "장애", "회고", "검색", "노트", "설계", "리뷰", "백엔드", "프론트엔드",
+            "데이터베이스", "성능", "테스트", "요구사항", "스마트폰", "문서", "기록", "결정사항"]
+WORDS_EN = ["fastapi", "git", "whoosh", "sqlite", "deploy", "latency", "index", "commit", "merge", "python"]
+
+DEFAULT_MIX = "save=20,read=40,search=20,tree=10,history=10"
+ENDPOINTS = ("save", "read", "search", "tree", "history")
+
+
+def parse_mix(text: str) -> dict:
+    """ 'save=20,read=40' -> {'save': 20, 'read': 40} """
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in ENDPOINTS:
+            raise ValueError(f"알 수 없는 엔드포인트: {name} (가능: {', '.join(ENDPOINTS)})")
+        mix[name] = float(weight)
+    return mix
+
+
+def make_note_body(rng: random.Random, paragraphs: int) -> str:
+    lines = [f"# {rng.choice(WORDS_KO)} {rng.randint(1, 999)}", ""]
+    for _ in range(paragraphs):
+        words = [rng.choice(WORDS_KO) if rng.random() < 0.7 else rng.choice(WORDS_EN) for _ in range(rng.randint(8, 30))]
+        lines.append(" ".join(words) + ".")
+        lines.append("")
+    return "\n".join(lines)
+
+
+def seed_repository(data_dir: Path, note_count: int, folder_count: int, paragraphs: int, rng: random.Random):
+    """ 가상의 팀/폴더 구조로 노트를 만들고 단일 커밋으로 기록 (DB/색인은 앱 기동 시 동기화로 채워짐) """
+    from app.service.git_manage_service.git_poc import GitService
+
+    git_service = GitService(repo_path=data_dir / "note")
+    notes, files = [], []
+    for i in range(note_count):
+        team = f"team_{i % folder_count:02d}"
+        sub = f"sub_{(i // folder_count) % 3}"
+        title = f"note_{i:05d}"
+        file_path = f"{team}/{sub}/{title}.md"
+        notes.append({"title": title, "file_path": file_path})
+        files.append((file_path, make_note_body(rng, paragraphs)))
+
+    git_service.write_many_and_commit(files, "bench", f"Seed {note_count} notes")
+    return notes
+
+
+def percentile(sorted_values, p: float) -> float:
+    if not sorted_values:
+        return 0.0
+    k = min(len(sorted_values) - 1, max(0, int(round(p / 100 * (len(sorted_values) - 1)))))
+    return sorted_values[k]
+
+
+class LoadStats:
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.status_counts = defaultdict(lambda: defaultdict(int))
+        self.started = time.perf_counter()
+        self.finished = None
+
+    def record(self, endpoint: str, status: int, latency: float):
+        self.latencies[endpoint].append(latency)
+        self.status_counts[endpoint][status] += 1
+
+    def report(self) -> dict:
+        elapsed = (self.finished or time.perf_counter()) - self.started
+        report = {"elapsed_sec": round(elapsed, 2), "endpoints": {}}
+        for endpoint in sorted(self.latencies):
+            values = sorted(self.latencies[endpoint])
+            statuses = self.status_counts[endpoint]
+            count = len(values)
+            errors = sum(c for s, c in statuses.items() if s == 0 or s >= 500)
+            report["endpoints"][endpoint] = {
+                "count": count,
+                "rps": round(count / elapsed, 1),
+                "p50_ms": round(percentile(values, 50) * 1000, 1),
+                "p95_ms": round(percentile(values, 95) * 1000, 1),
+                "p99_ms": round(percentile(values, 99) * 1000, 1),
+                "error_rate": round(errors / count, 4),
+                "conflict_rate": round(statuses.get(409, 0) / count, 4),
+            }
+        total = sum(len(v) for v in self.latencies.values())
+        report["total_rps"] = round(total / elapsed, 1)
+        return report
+
+
+def print_report(report: dict):
+    print(f"\n=== 결과 ({report['elapsed_sec']}s, 전체 {report['total_rps']} req/s) ===")
+    print(f"{'endpoint':<10}{'count':>8}{'rps':>9}{'p50(ms)':>10}{'p95(ms)':>10}{'p99(ms)':>10}{'error':>9}{'409':>9}")
+    for name, r in report["endpoints"].items():
+        print(f"{name:<10}{r['count']:>8}{r['rps']:>9}{r['p50_ms']:>10}{r['p95_ms']:>10}{r['p99_ms']:>10}"
+              f"{r['error_rate']:>9.2%}{r['conflict_rate']:>9.2%}")
+
+
+class Workload:
+    """
+    가상 사용자들이 공유하는 작업 정의.
+    사용자마다 자기가 마지막으로 본 커밋 해시를 따로 들고 있으므로, 핫 노트를 여러 명이 편집하면 자연스럽게 409 가 발생한다.
+    """
+
+    def __init__(self, client: httpx.AsyncClient, notes: list, mix: dict, hot_notes: int, hot_ratio: float,
+                 paragraphs: int, rng: random.Random):
+        self.client = client
+        self.notes = notes
+        self.names = list(mix.keys())
+        self.weights = list(mix.values())
+        self.hot = notes[:max(1, hot_notes)]
+        self.hot_ratio = hot_ratio
+        self.paragraphs = paragraphs
+        self.rng = rng
+
+    def pick_note(self, allow_hot: bool = False) -> dict:
+        if allow_hot and self.rng.random() < self.hot_ratio:
+            return self.rng.choice(self.hot)
+        return self.rng.choice(self.notes)
+
+    async def run_one(self, stats: LoadStats, known_hash: dict):
+        """ known_hash: 이 가상 사용자가 알고 있는 노트별 마지막 커밋 해시 """
+        endpoint = self.rng.choices(self.names, weights=self.weights)[0]
+        started = time.perf_counter()
+        try:
+            status = await getattr(self, f"_{endpoint}")(known_hash)
+        except httpx.HTTPError:
+            status = 0
+        stats.record(endpoint, status, time.perf_counter() - started)
+
+    async def _save(self, known_hash: dict) -> int:
+        note = self.pick_note(allow_hot=True)
+        res = await self.client.post("/notes/save", json={
+            "title": note["title"],
+            "file_path": note["file_path"],
+            "content": make_note_body(self.rng, self.paragraphs),
+            "user_name": f"bench{self.rng.randint(1, 50)}",
+            "last_hash": known_hash.get(note["file_path"]),
+        })
+        if res.status_code == 200:
+            known_hash[note["file_path"]] = res.json()["commit_hash"]
+        elif res.status_code == 409:
+            # 실제 편집기처럼 서버 최신 해시로 재기준(rebase)
+            known_hash[note["file_path"]] = res.json()["detail"]["conflict_data"]["server_last_hash"]
+        return res.status_code
+
+    async def _read(self, known_hash: dict) -> int:
+        note = self.pick_note(allow_hot=True)
+        res = await self.client.get("/notes/by-path", params={"file_path": note["file_path"]})
+        if res.status_code == 200:
+            # 편집기를 열면 그 시점의 해시를 기준으로 편집을 시작
+            known_hash[note["file_path"]] = res.json()["meta"]["last_commit_hash"]
+        return res.status_code
+
+    async def _search(self, known_hash: dict) -> int:
+        res = await self.client.get("/notes", params={"keyword": self.rng.choice(WORDS_KO + WORDS_EN), "size": 20})
+        return res.status_code
+
+    async def _tree(self, known_hash: dict) -> int:
+        res = await self.client.get("/notes/folder-tree")
+        return res.status_code
+
+    async def _history(self, known_hash: dict) -> int:
+        res = await self.client.get(f"/notes/{self.pick_note(allow_hot=True)['title']}/history")
+        return res.status_code
+
+
+async def drive(workload: Workload, users: int, duration: float) -> LoadStats:
+    stats = LoadStats()
+    deadline = time.perf_counter() + duration
+
+    async def virtual_user():
+        known_hash = {}
+        while time.perf_counter() < deadline:
+            await workload.run_one(stats, known_hash)
+
+    await asyncio.gather(*(virtual_user() for _ in range(users)))
+    stats.finished = time.perf_counter()
+    return stats
+
+
+async def run_in_process(args, notes, rng) -> LoadStats:
+    from app.database.note_mng.connection import engine
+    from app.main import app
+
+    # SQL 로그 출력은 측정 대상이 아니므로 기본적으로 끈다.
+    engine.echo = args.sql_echo
+
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=args.timeout) as client:
+            workload = Workload(client, notes, parse_mix(args.mix), args.hot_notes, args.hot_ratio, args.paragraphs, rng)
+            return await drive(workload, args.users, args.duration)
+
+
+async def run_loopback(args, notes, rng) -> LoadStats:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(port),
+         "--workers", str(args.workers), "--log-level", "warning"],
+        env=os.environ.copy(),
+        stdout=subprocess.DEVNULL if not args.server_log else None,
+        stderr=subprocess.DEVNULL if not args.server_log else None,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        async with httpx.AsyncClient(base_url=base_url, timeout=args.timeout) as client:
+            # 기동(동기화/색인) 완료 대기
+            for _ in range(600):
+                try:
+                    if (await client.get("/metrics")).status_code == 200:
+                        break
+                except httpx.HTTPError:
+                    pass
+                await asyncio.sleep(0.2)
+            else:
+                raise RuntimeError("서버가 기동되지 않았습니다.")
+
+            workload = Workload(client, notes, parse_mix(args.mix), args.hot_notes, args.hot_ratio, args.paragraphs, rng)
+            return await drive(workload, args.users, args.duration)
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="노트 API 부하 테스트")
+    parser.add_argument("--mode", choices=["inprocess", "loopback"], default="inprocess")
+    parser.add_argument("--notes", type=int, default=300, help="시드할 노트 수")
+    parser.add_argument("--folders", type=int, default=10, help="최상위(팀) 폴더 수")
+    parser.add_argument("--paragraphs", type=int, default=5, help="노트당 문단 수 (본문 크기)")
+    parser.add_argument("--users", type=int, default=10, help="동시 가상 사용자 수")
+    parser.add_argument("--duration", type=float, default=20, help="측정 시간(초)")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"요청 비율 (기본: {DEFAULT_MIX})")
+    parser.add_argument("--hot-notes", type=int, default=5, help="동시 저장이 몰리는 핫 노트 수")
+    parser.add_argument("--hot-ratio", type=float, default=0.3, help="저장/이력 요청 중 핫 노트 비율")
+    parser.add_argument("--workers", type=int, default=1, help="loopback 모드 uvicorn 워커 수")
+    parser.add_argument("--timeout", type=float, default=60)
+    parser.add_argument("--data-dir", help="시드 데이터 폴더 (기본: 임시 폴더, 종료 시 삭제)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--sql-echo", action="store_true", help="inprocess 모드에서 SQL 로그 유지")
+    parser.add_argument("--server-log", action="store_true", help="loopback 모드에서 서버 로그 출력")
+    parser.add_argument("--json", help="결과를 JSON 파일로 저장")
+    args = parser.parse_args()
+
+    parse_mix(args.mix)  # 인자 오류를 시드 전에 확인
+    rng = random.Random(args.seed)
+
+    data_dir = Path(args.data_dir) if args.data_dir else Path(tempfile.mkdtemp(prefix="note-bench-"))
+    # 💡 앱 모듈(DB 경로 등)이 import 시점에 데이터 경로를 결정하므로 import 전에 설정해야 한다.
+    os.environ["NOTE_DATA_DIR"] = str(data_dir)
+    try:
+        print(f"[bench] 데이터 폴더: {data_dir}")
+        started = time.perf_counter()
+        notes = seed_repository(data_dir, args.notes, args.folders, args.paragraphs, rng)
+        print(f"[bench] 노트 {len(notes)}개 시드 완료 ({time.perf_counter() - started:.1f}s)")
+
+        runner = run_in_process if args.mode == "inprocess" else run_loopback
+        stats = asyncio.run(runner(args, notes, rng))
+
+        report = stats.report()
+        report["config"] = {k: v for k, v in vars(args).items() if k != "json"}
+        print_report(report)
+        if args.json:
+            with open(args.json, "w", encoding="UTF-8") as f:
+                json.dump(report, f, ensure_ascii=False, indent=2)
+    finally:
+        if not args.data_dir:
+            shutil.rmtree(data_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,155 @@
+"""
+노트 API 응답 직렬화/압축 비용 벤치마크
+
+응답이 큰 엔드포인트(이력, 폴더 트리, 리비전 비교, 목록)와 같은 모양의 가상 응답을 만들어
+- before: FastAPI 기본 경로 (jsonable_encoder -> JSONResponse.render)
+- after : NoteJSONResponse (orjson), tree(hit) 은 캐시된 SerializedJSON 의 gzip 응답
+의 요청당 직렬화 시간과 본문 크기, gzip/br 압축 시간과 압축 후 크기를 출력합니다.
+
+사용 예:
+    python -m bench.note_serialization_bench --history-commits 300 --tree-notes 5000 --repeat 20
+"""
+
+import argparse
+import json
+import random
+import statistics
+import time
+from datetime import datetime, timedelta
+
+from fastapi.encoders import jsonable_encoder
+from starlette.responses import JSONResponse
+
+from app.database.note_mng.model.note_model import NoteMetadata
+from app.service.note_mng.note_revision_diff import compute_diff
+from app.spec.constant.ModelEnums import UseStatEnum
+from app.spec.endpoint.note_json_response import NoteJSONResponse, SerializedJSON, compress, brotli
+from app.spec.endpoint.note_service_file_tree_data_response_ivo import NoteServiceFileTreeDataResponseIVO, TreeType
+from app.spec.endpoint.note_service_file_tree_response_ivo import NoteServiceFileTreeResponseIVO
+
+WORDS = ["회의록", "프로젝트", "일정", "배포", "장애", "회고", "검색", "노트", "설계", "리뷰", "fastapi", "git", "latency"]
+
+
+def make_text(rng: random.Random, lines: int) -> str:
+    return "".join(" ".join(rng.choice(WORDS) for _ in range(rng.randint(5, 15))) + "\n" for _ in range(lines))
+
+
+def make_note(rng: random.Random, i: int) -> NoteMetadata:
+    now = datetime(2025, 1, 1) + timedelta(minutes=i)
+    return NoteMetadata(id=f"{i:032x}", title=f"note_{i:05d}", file_path=f"team_{i % 10:02d}/note_{i:05d}.md",
+                        last_commit_hash=f"{rng.getrandbits(160):040x}", use_stat_cd=UseStatEnum.USABLE,
+                        crt_dt=now, mdfy_dt=now)
+
+
+def make_history(rng: random.Random, commits: int) -> dict:
+    """ GET /notes/{title}/history: 메타데이터(ORM) + 커밋별 diff 텍스트 """
+    history = []
+    for i in range(commits):
+        diff = "".join(f"{'+' if rng.random() < 0.5 else '-'}{line}\n" for line in make_text(rng, 30).splitlines())
+        history.append({"hash": f"{rng.getrandbits(160):040x}", "author": f"user{i % 7}",
+                        "date": (datetime(2025, 1, 1) + timedelta(hours=i)).isoformat(),
+                        "message": f"Update note_00001 ({i})", "diff": diff})
+    return {"metadata": make_note(rng, 1), "git_history": history}
+
+
+def make_tree(notes: int) -> NoteServiceFileTreeResponseIVO:
+    """ GET /notes/folder-tree: 팀/하위 폴더 2단계 """
+    teams = []
+    for t in range(10):
+        team_id = f"team_{t:02d}"
+        subs = []
+        for s in range(5):
+            sub_id = f"{team_id}/sub_{s}"
+            children = [NoteServiceFileTreeDataResponseIVO(
+                id=f"{sub_id}/note_{n:05d}.md", name=f"note_{n:05d}", type=TreeType.NOTE, parentId=sub_id,
+                path=f"{sub_id}/note_{n:05d}.md", order=i)
+                for i, n in enumerate(range(t * 5 + s, notes, 50))]
+            subs.append(NoteServiceFileTreeDataResponseIVO(id=sub_id, name=f"sub_{s}", type=TreeType.FOLDER,
+                                                           parentId=team_id, path=sub_id, order=s, expanded=True,
+                                                           children=children))
+        teams.append(NoteServiceFileTreeDataResponseIVO(id=team_id, name=team_id, type=TreeType.FOLDER, parentId=None,
+                                                        path=team_id, order=t, expanded=True, children=subs))
+    return NoteServiceFileTreeResponseIVO(success=True, data=teams, message="Folder tree retrieved successfully")
+
+
+def make_compare(rng: random.Random, lines: int) -> dict:
+    """ GET /notes/{id}/compare?mode=word """
+    old = make_text(rng, lines).splitlines(keepends=True)
+    new = [rng.choice(WORDS) + " " + line if rng.random() < 0.2 else line for line in old]
+    return compute_diff("".join(old), "".join(new), "word")
+
+
+def make_list(rng: random.Random, size: int) -> dict:
+    """ GET /notes?size=N """
+    return {"status": "success", "metadata": {"total_count": 5000, "current_page": 1, "size": size},
+            "items": [make_note(rng, i) for i in range(size)]}
+
+
+def measure(func, repeat: int) -> float:
+    """ 중앙값 (ms) """
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def bench_endpoint(name: str, content, repeat: int, cached: bool = False) -> dict:
+    before_ms = measure(lambda: JSONResponse(jsonable_encoder(content)).body, repeat)
+    if cached:
+        body = SerializedJSON.of(content)
+        after_ms = measure(lambda: body.to_response("gzip").body, repeat)  # 캐시 적중: 직렬화/압축 모두 재사용
+    else:
+        after_ms = measure(lambda: NoteJSONResponse(content).body, repeat)
+
+    raw = NoteJSONResponse(content).body
+    assert json.loads(raw) == json.loads(JSONResponse(jsonable_encoder(content)).body), f"{name}: 결과가 다릅니다."
+    result = {
+        "endpoint": name,
+        "bytes": len(raw),
+        "before_ms": round(before_ms, 2),
+        "after_ms": round(after_ms, 3),
+        "speedup": round(before_ms / after_ms, 1) if after_ms else None,
+    }
+    for encoding in ("gzip", "br") if brotli is not None else ("gzip",):
+        result[f"{encoding}_ms"] = round(measure(lambda: compress(raw, encoding), max(3, repeat // 4)), 2)
+        result[f"{encoding}_bytes"] = len(compress(raw, encoding))
+    return result
+
+
+def print_report(results: list):
+    print(f"\n{'endpoint':<10}{'bytes':>11}{'before(ms)':>12}{'after(ms)':>11}{'speedup':>9}"
+          f"{'gzip(ms)':>10}{'gzip bytes':>12}{'br(ms)':>9}{'br bytes':>11}")
+    for r in results:
+        print(f"{r['endpoint']:<10}{r['bytes']:>11}{r['before_ms']:>12}{r['after_ms']:>11}{r['speedup']:>8}x"
+              f"{r['gzip_ms']:>10}{r['gzip_bytes']:>12}{r.get('br_ms', '-'):>9}{r.get('br_bytes', '-'):>11}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="노트 API 응답 직렬화/압축 벤치마크")
+    parser.add_argument("--history-commits", type=int, default=200, help="이력 응답의 커밋 수")
+    parser.add_argument("--tree-notes", type=int, default=3000, help="폴더 트리의 노트 수")
+    parser.add_argument("--compare-lines", type=int, default=2000, help="리비전 비교 본문 줄 수")
+    parser.add_argument("--list-size", type=int, default=100, help="목록 응답의 노트 수")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", help="결과를 JSON 파일로 저장")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    results = [
+        bench_endpoint("history", make_history(rng, args.history_commits), args.repeat),
+        bench_endpoint("tree", make_tree(args.tree_notes), args.repeat),
+        bench_endpoint("tree(hit)", make_tree(args.tree_notes), args.repeat, cached=True),
+        bench_endpoint("compare", make_compare(rng, args.compare_lines), args.repeat),
+        bench_endpoint("list", make_list(rng, args.list_size), args.repeat),
+    ]
+    print_report(results)
+    if args.json:
+        with open(args.json, "w", encoding="UTF-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,162 @@
+"""
+본문 검색 분석기 모드(komoran / ngram / hybrid) 벤치마크
+
+노트 저장소(기본: data/note)의 .md 파일을 모드별로 임시 디렉토리에 색인해서
+- 색인 처리량 (문서/초, MB/초), 색인 크기
+- 검색 지연 (중앙값)
+- 재현율/정밀도: 본문에서 뽑은 단어를 검색어로 쓰고, 원문에 그 단어가 부분 문자열로 들어 있는 노트를 정답으로 본다.
+  (조사가 붙거나 복합어 안에 있는 경우도 정답에 포함되므로 형태소 분석이 놓치는 노트가 재현율에 드러난다)
+를 출력합니다. komoran/hybrid 는 Java(PyKomoran)가 없으면 건너뜁니다.
+
+사용 예:
+    python -m bench.search_analyzer_bench --corpus data/note --queries 200
+    python -m bench.search_analyzer_bench --synthetic 3000   # 저장소가 비어 있을 때 가상 노트로
+"""
+
+import argparse
+import json
+import random
+import re
+import shutil
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from whoosh.index import create_in
+
+from app.config.app_path import DATA_DIR
+from app.service.lang_analyzer.search_manager import ANALYZER_VERSIONS, ANALYZER_NGRAM, build_schema, \
+    document_fields, query_parser, _komoran
+
+WORDS = ["회의록", "프로젝트", "일정", "배포", "장애", "회고", "검색", "노트", "설계", "리뷰", "서버", "데이터베이스",
+         "성능", "개선", "fastapi", "git", "latency", "whoosh"]
+PARTICLES = ["", "", "", "을", "를", "은", "는", "이", "가", "에서", "으로", "와"]
+_QUERY_WORD = re.compile(r"[가-힣]{2,}|[a-zA-Z]{3,}")
+
+
+def load_corpus(corpus: Path):
+    documents = []
+    for path in sorted(corpus.glob("**/*.md")):
+        try:
+            documents.append((path.stem, path.read_text(encoding="utf-8")))
+        except (OSError, UnicodeDecodeError) as e:
+            print(f"[Error] 파일 읽기 실패 ({path}): {e}")
+    return documents
+
+
+def make_corpus(rng: random.Random, count: int):
+    """ 조사가 붙은 단어와 복합어(띄어쓰기 없이 붙인 단어)가 섞인 가상 노트 """
+    documents = []
+    for i in range(count):
+        lines = []
+        for _ in range(rng.randint(5, 40)):
+            words = []
+            for _ in range(rng.randint(4, 12)):
+                word = rng.choice(WORDS)
+                if rng.random() < 0.15:
+                    word += rng.choice(WORDS)
+                words.append(word + rng.choice(PARTICLES))
+            lines.append(" ".join(words))
+        documents.append((f"note_{i:05d}", "\n".join(lines)))
+    return documents
+
+
+def pick_queries(rng: random.Random, documents, count: int):
+    """ 본문 단어 중 너무 흔하지 않은(문서의 30% 미만에 나오는) 단어를 검색어로 """
+    vocabulary = sorted({word for _, content in documents for word in _QUERY_WORD.findall(content)})
+    rng.shuffle(vocabulary)
+    lowered = [content.lower() for _, content in documents]
+    queries = []
+    for word in vocabulary:
+        truth = {documents[i][0] for i, content in enumerate(lowered) if word.lower() in content}
+        if 0 < len(truth) < max(2, len(documents) * 0.3):
+            queries.append((word, truth))
+            if len(queries) >= count:
+                break
+    return queries
+
+
+def dir_size(path: Path) -> int:
+    return sum(f.stat().st_size for f in path.glob("**/*") if f.is_file())
+
+
+def bench_mode(analyzer: str, documents, queries) -> dict:
+    index_path = Path(tempfile.mkdtemp(prefix=f"note-index-{analyzer}-"))
+    try:
+        schema = build_schema(analyzer)
+        ix = create_in(str(index_path), schema)
+        started = time.perf_counter()
+        writer = ix.writer()
+        for title, content in documents:
+            writer.add_document(title=title, **document_fields(analyzer, content))
+        writer.commit()
+        index_seconds = time.perf_counter() - started
+
+        parser = query_parser(analyzer, schema)
+        latencies, recalls, precisions = [], [], []
+        with ix.searcher() as searcher:
+            for word, truth in queries:
+                started = time.perf_counter()
+                found = {hit["title"] for hit in searcher.search(parser.parse(word), limit=None)}
+                latencies.append((time.perf_counter() - started) * 1000)
+                recalls.append(len(found & truth) / len(truth))
+                precisions.append(len(found & truth) / len(found) if found else 1.0)
+
+        total_bytes = sum(len(content.encode("utf-8")) for _, content in documents)
+        return {
+            "analyzer": f"{analyzer}-v{ANALYZER_VERSIONS[analyzer]}",
+            "docs_per_sec": round(len(documents) / index_seconds, 1),
+            "mb_per_sec": round(total_bytes / index_seconds / 1024 / 1024, 2),
+            "index_bytes": dir_size(index_path),
+            "query_ms": round(statistics.median(latencies), 2) if latencies else None,
+            "recall": round(statistics.mean(recalls), 3) if recalls else None,
+            "precision": round(statistics.mean(precisions), 3) if precisions else None,
+        }
+    finally:
+        shutil.rmtree(index_path, ignore_errors=True)
+
+
+def print_report(results: list, documents):
+    total_mb = sum(len(content.encode("utf-8")) for _, content in documents) / 1024 / 1024
+    print(f"\n문서 {len(documents)}개, 본문 {total_mb:.1f}MB")
+    print(f"{'analyzer':<12}{'docs/s':>10}{'MB/s':>8}{'index bytes':>14}{'query(ms)':>11}{'recall':>8}{'precision':>11}")
+    for r in results:
+        print(f"{r['analyzer']:<12}{r['docs_per_sec']:>10}{r['mb_per_sec']:>8}{r['index_bytes']:>14}"
+              f"{r['query_ms']:>11}{r['recall']:>8}{r['precision']:>11}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="본문 검색 분석기 모드 벤치마크")
+    parser.add_argument("--corpus", default=str(DATA_DIR / "note"), help="노트 저장소 경로")
+    parser.add_argument("--synthetic", type=int, default=0, help="저장소 대신 가상 노트 N개 사용")
+    parser.add_argument("--queries", type=int, default=100, help="검색어 수")
+    parser.add_argument("--modes", default=",".join(ANALYZER_VERSIONS), help="비교할 모드 (쉼표 구분)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", help="결과를 JSON 파일로 저장")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    documents = make_corpus(rng, args.synthetic) if args.synthetic else load_corpus(Path(args.corpus))
+    if not documents:
+        print(f"색인할 노트가 없습니다: {args.corpus} (--synthetic N 으로 가상 노트를 쓸 수 있습니다)")
+        return
+    queries = pick_queries(rng, documents, args.queries)
+
+    results = []
+    for analyzer in args.modes.split(","):
+        if analyzer != ANALYZER_NGRAM:
+            try:
+                _komoran()  # JVM 기동은 색인 시간에서 제외
+            except Exception as e:
+                print(f"[Skip] {analyzer}: Komoran 을 사용할 수 없습니다 ({e})")
+                continue
+        results.append(bench_mode(analyzer, documents, queries))
+    print_report(results, documents)
+    if args.json:
+        with open(args.json, "w", encoding="UTF-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == '__main__':
+    main()
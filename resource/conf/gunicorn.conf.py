@@ -0,0 +1,23 @@
+# gunicorn 멀티 워커 실행 설정
+# 실행: gunicorn -c resource/conf/gunicorn.conf.py app.main:app
+#
+# 워커 간 조율은 app/service/worker_coord/worker_coordinator.py 참고
+# - 리더 워커 1개만 기동 시 동기화 및 Whoosh 색인 writer 를 담당
+# - git 커밋은 파일 락으로 직렬화, 읽기/검색은 모든 워커가 처리
+import multiprocessing
+import os
+
+bind = os.getenv("NOTE_BIND", "127.0.0.1:9900")
+workers = int(os.getenv("NOTE_WORKERS", multiprocessing.cpu_count()))
+worker_class = "uvicorn.workers.UvicornWorker"
+
+# 기동 시 리더가 전체 동기화를 수행하므로 넉넉히 설정
+timeout = 120
+graceful_timeout = 30
+
+
+def child_exit(server, worker):
+    # 멀티 워커 Prometheus 지표(PROMETHEUS_MULTIPROC_DIR) 사용 시 종료된 워커의 지표 파일 정리
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(worker.pid)
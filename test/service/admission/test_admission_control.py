@@ -0,0 +1,51 @@
+import asyncio
+import unittest
+
+from app.service.admission.admission_control import classify, EndpointLimiter, REJECT_QUEUE_FULL, REJECT_TIMEOUT
+
+
+class TestAdmissionControl(unittest.IsolatedAsyncioTestCase):
+
+    def test_classify(self):
+        self.assertEqual(classify("POST", "/notes/save"), "write")
+        self.assertEqual(classify("POST", "/notes/batch"), "read")
+        self.assertEqual(classify("GET", "/notes", b"keyword=%ED%9A%8C%EC%9D%98&page=1"), "search")
+        self.assertEqual(classify("GET", "/notes", b"page=2"), "read")
+        self.assertEqual(classify("GET", "/notes/abc/compare"), "history")
+        self.assertEqual(classify("GET", "/notes/abc/similar"), "search")
+        self.assertEqual(classify("GET", "/notes/abc"), "read")
+        self.assertIsNone(classify("GET", "/notes/changes/sse"))
+        self.assertIsNone(classify("GET", "/admin/admission"))
+
+    async def test_queue_full_is_rejected_immediately(self):
+        limiter = EndpointLimiter("test", max_concurrent=1, max_queue=1, queue_timeout=5.0)
+        self.assertIsNone(await limiter.acquire())
+        waiting = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+        self.assertEqual(limiter.queued, 1)
+        self.assertEqual(await limiter.acquire(), REJECT_QUEUE_FULL)
+
+        limiter.release(0.01)  # 슬롯은 대기 중인 요청으로 넘어감
+        self.assertIsNone(await waiting)
+        self.assertEqual((limiter.in_flight, limiter.queued), (1, 0))
+        limiter.release(0.01)
+        self.assertEqual(limiter.in_flight, 0)
+
+    async def test_wait_times_out(self):
+        limiter = EndpointLimiter("test", max_concurrent=1, max_queue=4, queue_timeout=0.1)
+        await limiter.acquire()
+        self.assertEqual(await limiter.acquire(), REJECT_TIMEOUT)
+        self.assertEqual((limiter.in_flight, limiter.queued), (1, 0))
+
+    async def test_raising_limit_admits_waiters(self):
+        limiter = EndpointLimiter("test", max_concurrent=1, max_queue=4, queue_timeout=5.0)
+        await limiter.acquire()
+        waiting = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+        limiter.configure(2, 4, 5.0)
+        self.assertIsNone(await waiting)
+        self.assertEqual(limiter.in_flight, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
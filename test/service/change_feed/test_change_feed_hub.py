@@ -0,0 +1,57 @@
+import asyncio
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from app.service.change_feed.change_feed_hub import ChangeFeedHub
+from app.spec.biz.NoteChangeEvent import NoteChangeEvent
+
+
+class TestChangeFeedRelayRotation(unittest.IsolatedAsyncioTestCase):
+    """ 두 허브(리더/팔로워 워커)가 같은 relay 파일을 공유할 때 세대 교체 중에도 이벤트가 정확히 한 번 전달되는지 확인 """
+
+    async def asyncSetUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        relay_path = Path(self.tmp_dir) / "change-feed.jsonl"
+        # 이벤트 한 줄이 200 바이트를 넘으므로 중계 주기마다 세대가 바뀐다
+        self.leader = ChangeFeedHub(relay_path, relay_interval=0.01, relay_max_bytes=200)
+        self.follower = ChangeFeedHub(relay_path, relay_interval=0.01, relay_max_bytes=200)
+        self.received = []
+        self.follower.add_listener(lambda payload: self.received.append(payload["note_id"]))
+
+        self.tasks = [asyncio.create_task(self.leader.run_relay(lambda: True))]
+        # 같은 프로세스 안이므로 팔로워 중계 루프는 다른 PID 의 워커인 것처럼 시작 (자기 이벤트로 걸러지지 않게)
+        with patch("os.getpid", return_value=-1):
+            self.tasks.append(asyncio.create_task(self.follower.run_relay()))
+            await asyncio.sleep(0)
+
+    async def asyncTearDown(self):
+        for task in self.tasks:
+            task.cancel()
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    async def test_no_events_lost_or_duplicated_across_rotation(self):
+        expected = [f"note-{i}" for i in range(50)]
+        for note_id in expected:
+            self.leader.publish(NoteChangeEvent(action="updated", note_id=note_id, file_path=f"a/{note_id}.md",
+                                                author="tester"))
+            await asyncio.sleep(0.003)
+
+        for _ in range(200):
+            if len(self.received) >= len(expected):
+                break
+            await asyncio.sleep(0.01)
+        await asyncio.sleep(0.05)  # 늦게 들어오는 중복이 있는지 한 주기 더 기다림
+
+        self.assertEqual(self.received, expected)
+        # 세대가 여러 번 바뀌었고, 직전 세대보다 오래된 파일은 지워졌다
+        current = self.leader._generation
+        self.assertGreaterEqual(current, 3)
+        self.assertTrue(set(self.leader._generations()) <= {current - 1, current})
+
+
+if __name__ == "__main__":
+    unittest.main()
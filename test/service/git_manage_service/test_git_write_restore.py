@@ -0,0 +1,31 @@
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from app.service.git_manage_service.git_poc import GitService
+
+
+class TestGitWriteRestore(unittest.TestCase):
+
+    def setUp(self):
+        self.repo_path = Path(tempfile.mkdtemp())
+        self.service = GitService(self.repo_path, lock_name="git-write-test")
+        self.first_hash = self.service.write_and_commit("a.md", "처음", "tester", "init")
+
+    def test_failed_commit_restores_work_tree_and_index(self):
+        with patch.object(type(self.service.repo.index), "commit", side_effect=OSError("disk full")):
+            with self.assertRaises(OSError):
+                self.service.write_many_and_commit([("a.md", "수정"), ("new/b.md", "새 노트")], "tester", "import")
+
+        self.assertEqual((self.repo_path / "a.md").read_text(encoding="utf-8"), "처음")
+        self.assertFalse((self.repo_path / "new" / "b.md").exists())
+        self.assertEqual(self.service.repo.git.status("--porcelain", "--untracked-files=no"), "")
+
+        # 되돌린 뒤의 커밋에는 실패한 쓰기가 섞이지 않는다.
+        self.service.write_and_commit("c.md", "다른 노트", "tester", "next")
+        self.assertEqual(sorted(self.service.repo.git.ls_files().split()), ["a.md", "c.md"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,170 @@
+import json
+import shutil
+import tempfile
+import unittest
+from datetime import timedelta
+from pathlib import Path
+from unittest.mock import patch
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+
+from app.database.default_model_mixin import Base
+from app.database.note_mng.model.note_job_model import NoteJob
+from app.service.job_queue.note_job_queue import NoteJobQueue, utc_now
+from app.service.job_queue.note_job_worker import NoteJobWorker
+from app.spec.constant.ModelEnums import JobStatusEnum
+
+
+class _TempDbTestCase(unittest.IsolatedAsyncioTestCase):
+    """ 임시 SQLite 파일에 NOTE_JOB 테이블을 만들고 워커의 세션 팩토리를 바꿔 끼운다. """
+
+    async def asyncSetUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.engine = create_async_engine(f"sqlite+aiosqlite:///{Path(self.tmp_dir) / 'jobs.db'}")
+        async with self.engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all, tables=[NoteJob.__table__])
+        self.Session = async_sessionmaker(bind=self.engine, class_=AsyncSession, expire_on_commit=False)
+        patcher = patch("app.service.job_queue.note_job_worker.AsyncSessionLocal", self.Session)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    async def asyncTearDown(self):
+        await self.engine.dispose()
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    async def _enqueue(self, job_type: str, key: str, payload: dict, max_attempts: int = 5):
+        async with self.Session() as session:
+            await NoteJobQueue(session).enqueue(job_type, key, payload, max_attempts=max_attempts)
+            await session.commit()
+
+    async def _jobs(self):
+        async with self.Session() as session:
+            return {job.idempotency_key: job for job in
+                    (await session.execute(select(NoteJob).order_by(NoteJob.id))).scalars()}
+
+
+class TestNoteJobQueue(_TempDbTestCase):
+
+    async def test_enqueue_same_key_is_ignored(self):
+        await self._enqueue("index", "index:n1:c1", {"note_id": "n1"})
+        await self._enqueue("index", "index:n1:c1", {"note_id": "other"})
+        await self._enqueue("index", "index:n1:c2", {"note_id": "n1"})
+
+        jobs = await self._jobs()
+        self.assertEqual(list(jobs), ["index:n1:c1", "index:n1:c2"])
+        self.assertEqual(json.loads(jobs["index:n1:c1"].payload), {"note_id": "n1"})
+
+    async def test_retry_only_resets_failed_jobs(self):
+        await self._enqueue("index", "failed", {})
+        await self._enqueue("index", "pending", {})
+        async with self.Session() as session:
+            await session.execute(update(NoteJob).where(NoteJob.idempotency_key == "failed")
+                                  .values(status=JobStatusEnum.FAILED, attempts=5, last_error="boom"))
+            await session.commit()
+        jobs = await self._jobs()
+
+        async with self.Session() as session:
+            queue = NoteJobQueue(session)
+            self.assertTrue(await queue.retry(jobs["failed"].id))
+            self.assertFalse(await queue.retry(jobs["pending"].id))
+
+        retried = (await self._jobs())["failed"]
+        self.assertEqual(retried.status, JobStatusEnum.PENDING)
+        self.assertEqual(retried.attempts, 0)
+        self.assertIsNone(retried.last_error)
+
+
+class TestNoteJobWorker(_TempDbTestCase):
+
+    async def test_claim_marks_batch_with_one_token(self):
+        for i in range(3):
+            await self._enqueue("index", f"index:{i}", {"i": i})
+        await self._enqueue("html_warm", "html_warm:0", {})
+        worker = NoteJobWorker(batch_size=2)
+
+        claimed = await worker._claim()
+
+        self.assertEqual([job.idempotency_key for job in claimed], ["index:0", "index:1"])
+        self.assertEqual(len({job.claim_token for job in claimed}), 1)
+        jobs = await self._jobs()
+        self.assertEqual(jobs["index:0"].status, JobStatusEnum.RUNNING)
+        self.assertEqual(jobs["index:0"].attempts, 1)
+        self.assertEqual(jobs["index:2"].status, JobStatusEnum.PENDING)
+        # 이미 가져간 작업은 다른 워커가 다시 가져가지 않는다
+        again = await NoteJobWorker(batch_size=10)._claim()
+        self.assertEqual([job.idempotency_key for job in again], ["index:2"])
+
+    async def test_expired_lease_is_reclaimed(self):
+        await self._enqueue("index", "index:0", {})
+        worker = NoteJobWorker(lease_seconds=60)
+        first = await worker._claim()
+        self.assertEqual(len(first), 1)
+        self.assertEqual(await worker._claim(), [])
+
+        async with self.Session() as session:
+            await session.execute(update(NoteJob).values(locked_at=utc_now() - timedelta(seconds=120)))
+            await session.commit()
+        second = await worker._claim()
+
+        self.assertEqual([job.id for job in second], [first[0].id])
+        self.assertNotEqual(second[0].claim_token, first[0].claim_token)
+        self.assertEqual(second[0].attempts, 2)
+
+    async def test_failure_backs_off_then_fails_after_max_attempts(self):
+        await self._enqueue("index", "index:0", {}, max_attempts=2)
+        worker = NoteJobWorker(backoff_base=10.0)
+
+        async def fail(payloads):
+            raise ValueError("boom")
+        worker.register("index", fail)
+
+        self.assertEqual(await worker.run_pending(), 1)
+        job = (await self._jobs())["index:0"]
+        self.assertEqual(job.status, JobStatusEnum.PENDING)
+        self.assertIn("ValueError: boom", job.last_error)
+        self.assertGreater(job.next_run_at, utc_now() + timedelta(seconds=5))
+        # backoff 중에는 실행하지 않는다
+        self.assertEqual(await worker.run_pending(), 0)
+
+        async with self.Session() as session:
+            await session.execute(update(NoteJob).values(next_run_at=utc_now()))
+            await session.commit()
+        self.assertEqual(await worker.run_pending(), 1)
+        job = (await self._jobs())["index:0"]
+        self.assertEqual(job.status, JobStatusEnum.FAILED)
+        self.assertEqual(job.attempts, 2)
+
+    async def test_batch_failure_only_fails_bad_payloads(self):
+        for i in range(3):
+            await self._enqueue("index", f"index:{i}", {"i": i})
+        worker = NoteJobWorker()
+        calls = []
+
+        async def handler(payloads):
+            calls.append([payload["i"] for payload in payloads])
+            if any(payload["i"] == 1 for payload in payloads):
+                raise ValueError("bad payload")
+        worker.register("index", handler)
+
+        self.assertEqual(await worker.run_pending(), 3)
+
+        self.assertEqual(calls, [[0, 1, 2], [0], [1], [2]])
+        jobs = await self._jobs()
+        self.assertEqual(jobs["index:0"].status, JobStatusEnum.DONE)
+        self.assertEqual(jobs["index:2"].status, JobStatusEnum.DONE)
+        self.assertEqual(jobs["index:1"].status, JobStatusEnum.PENDING)
+        self.assertIn("bad payload", jobs["index:1"].last_error)
+
+    async def test_unregistered_job_type_is_retried(self):
+        await self._enqueue("unknown", "unknown:0", {})
+
+        self.assertEqual(await NoteJobWorker().run_pending(), 1)
+
+        job = (await self._jobs())["unknown:0"]
+        self.assertEqual(job.status, JobStatusEnum.PENDING)
+        self.assertIn("등록된 핸들러가 없는", job.last_error)
+
+
+if __name__ == "__main__":
+    unittest.main()
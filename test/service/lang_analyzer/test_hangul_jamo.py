@@ -0,0 +1,24 @@
+import unittest
+
+from app.service.lang_analyzer.hangul_jamo import decompose, normalize_for_match
+
+
+class TestHangulJamo(unittest.TestCase):
+
+    def test_decompose_splits_compound_jamo(self):
+        self.assertEqual(decompose("한글"), "ㅎㅏㄴㄱㅡㄹ")
+        self.assertEqual(decompose("닭"), "ㄷㅏㄹㄱ")
+        self.assertEqual(decompose("과"), "ㄱㅗㅏ")
+
+    def test_partial_syllables_are_prefixes(self):
+        self.assertTrue(normalize_for_match("하나").startswith(normalize_for_match("한")))
+        self.assertTrue(normalize_for_match("회의록").startswith(normalize_for_match("회ㅇ")))
+        self.assertTrue(normalize_for_match("닭갈비").startswith(normalize_for_match("달")))
+
+    def test_width_case_and_conjoining_forms(self):
+        self.assertEqual(normalize_for_match("ＦastAPI  노트"), normalize_for_match("fastapi 노트"))
+        self.assertEqual(normalize_for_match("한"), normalize_for_match("한"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,110 @@
+import unittest
+
+from app.service.lang_analyzer.history_search_manager import parse_commit_deltas, _COMMIT_MARK, \
+    CHANGE_ADDED, CHANGE_REMOVED
+
+
+def _commit(sha: str, author: str, ts: int, *diff_lines: str) -> str:
+    """ `git show --unified=0 --format=<_COMMIT_MARK>%H%x09%an%x09%ct` 출력 한 커밋 분량 """
+    return "\n".join([f"{_COMMIT_MARK}{sha}\t{author}\t{ts}", "", *diff_lines])
+
+
+def _by_key(deltas):
+    return {(d["sha"], d["path"], d["kind"]): d for d in deltas}
+
+
+class TestParseCommitDeltas(unittest.TestCase):
+
+    def test_added_and_deleted_files(self):
+        output = _commit(
+            "c1", "kim", 1700000000,
+            "diff --git a/team/새노트.md b/team/새노트.md",
+            "new file mode 100644",
+            "index 0000000..1111111",
+            "--- /dev/null",
+            "+++ b/team/새노트.md",
+            "@@ -0,0 +1,2 @@",
+            "+# 새 노트",
+            "+본문",
+            "diff --git a/old.md b/old.md",
+            "deleted file mode 100644",
+            "index 2222222..0000000",
+            "--- a/old.md",
+            "+++ /dev/null",
+            "@@ -1 +0,0 @@",
+            "-지운 본문",
+        )
+        deltas = _by_key(parse_commit_deltas(output))
+
+        self.assertEqual(set(deltas), {("c1", "team/새노트.md", CHANGE_ADDED), ("c1", "old.md", CHANGE_REMOVED)})
+        added = deltas[("c1", "team/새노트.md", CHANGE_ADDED)]
+        self.assertEqual(added["lines"], ["# 새 노트", "본문"])
+        self.assertEqual((added["author"], added["committed_at"]), ("kim", 1700000000))
+        self.assertEqual(deltas[("c1", "old.md", CHANGE_REMOVED)]["lines"], ["지운 본문"])
+
+    def test_removed_lines_that_look_like_headers(self):
+        # 본문에서 "-- 서명" 줄을 지우면 diff 에는 "--- 서명" 으로 나온다 (파일 헤더가 아님)
+        output = _commit(
+            "c1", "kim", 1700000000,
+            "diff --git a/a.md b/a.md",
+            "index 1111111..2222222 100644",
+            "--- a/a.md",
+            "+++ b/a.md",
+            "@@ -3,2 +3 @@",
+            "--- 서명",
+            "-++ 표시",
+            "++++ 새 줄",
+            "@@ -9 +8,0 @@",
+            "-마지막 줄",
+        )
+        deltas = _by_key(parse_commit_deltas(output))
+
+        self.assertEqual(deltas[("c1", "a.md", CHANGE_REMOVED)]["lines"], ["-- 서명", "++ 표시", "마지막 줄"])
+        self.assertEqual(deltas[("c1", "a.md", CHANGE_ADDED)]["lines"], ["+++ 새 줄"])
+
+    def test_multiple_commits_and_filters(self):
+        output = "\n".join([
+            _commit(
+                "c1", "kim", 1700000000,
+                "diff --git a/a.md b/a.md",
+                "--- a/a.md",
+                "+++ b/a.md",
+                "@@ -1 +1 @@",
+                "-이전",
+                "+이후",
+                "diff --git a/image.png b/image.png",
+                "--- a/image.png",
+                "+++ b/image.png",
+                "@@ -1 +1 @@",
+                "+binary-ish",
+            ),
+            _commit(
+                "c2", "lee", 1700000100,
+                "diff --git a/a.md b/a.md",
+                "--- a/a.md",
+                "+++ b/a.md",
+                "@@ -1 +1,2 @@",
+                "+   ",
+                "+",
+                "\\ No newline at end of file",
+            ),
+            _commit(
+                "c3", "park", 1700000200,
+                "diff --git a/a.md b/a.md",
+                "--- a/a.md",
+                "+++ b/a.md",
+                "@@ -1 +1 @@",
+                "+세 번째",
+            ),
+        ])
+        deltas = _by_key(parse_commit_deltas(output))
+
+        # .md 가 아닌 파일과 공백 줄만 추가된 커밋(c2)은 빠진다
+        self.assertEqual(set(deltas), {("c1", "a.md", CHANGE_REMOVED), ("c1", "a.md", CHANGE_ADDED),
+                                       ("c3", "a.md", CHANGE_ADDED)})
+        self.assertEqual(deltas[("c3", "a.md", CHANGE_ADDED)]["lines"], ["세 번째"])
+        self.assertEqual(deltas[("c3", "a.md", CHANGE_ADDED)]["author"], "park")
+
+
+if __name__ == "__main__":
+    unittest.main()
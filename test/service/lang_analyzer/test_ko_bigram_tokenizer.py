@@ -0,0 +1,38 @@
+import tempfile
+import unittest
+
+from whoosh.index import create_in
+
+from app.service.lang_analyzer.search_manager import KoBigramTokenizer, build_schema, document_fields, query_parser, \
+    ANALYZER_NGRAM
+
+
+class TestKoBigramTokenizer(unittest.TestCase):
+
+    def test_hangul_bigrams_and_english_words(self):
+        tokens = [t.text for t in KoBigramTokenizer()("배포일정을 FastAPI로, v2 및")]
+        self.assertEqual(tokens, ["배포", "포일", "일정", "정을", "fastapi", "로", "v2", "및"])
+
+    def test_positions_and_synonyms(self):
+        tokenizer = KoBigramTokenizer({"노트": ["문서"]})
+        tokens = [(t.text, t.pos) for t in tokenizer("노트 정리", positions=True, mode="index")]
+        self.assertEqual(tokens, [("노트", 0), ("문서", 0), ("정리", 2)])  # 단어 사이는 한 칸 띄움
+        self.assertEqual([t.text for t in tokenizer("노트", mode="query")], ["노트"])  # 검색어는 확장하지 않음
+
+    def test_ngram_index_matches_substrings_within_words(self):
+        schema = build_schema(ANALYZER_NGRAM)
+        ix = create_in(tempfile.mkdtemp(), schema)
+        writer = ix.writer()
+        writer.add_document(title="a", **document_fields(ANALYZER_NGRAM, "다음주 배포일정 공유"))
+        writer.add_document(title="b", **document_fields(ANALYZER_NGRAM, "일정 배포 취소"))
+        writer.add_document(title="c", **document_fields(ANALYZER_NGRAM, "배포 포일 정리"))
+        writer.commit()
+
+        parser = query_parser(ANALYZER_NGRAM, schema)
+        with ix.searcher() as searcher:
+            self.assertEqual([hit["title"] for hit in searcher.search(parser.parse("배포일정"))], ["a"])
+            self.assertEqual(sorted(hit["title"] for hit in searcher.search(parser.parse("배포"))), ["a", "b", "c"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,31 @@
+import unittest
+
+from app.service.lang_analyzer.minhash import minhash_signature, lsh_band_hashes, estimate_similarity, \
+    signature_to_bytes, signature_from_bytes, NUM_PERM, NUM_BANDS
+
+
+class TestMinHash(unittest.TestCase):
+
+    def test_similarity_tracks_jaccard(self):
+        base = {f"단어{i}" for i in range(200)}
+        near = (base - {f"단어{i}" for i in range(10)}) | {"추가1", "추가2"}
+        far = {f"다른{i}" for i in range(200)}
+
+        sig = minhash_signature(base)
+        self.assertEqual(len(sig), NUM_PERM)
+        self.assertGreater(estimate_similarity(sig, minhash_signature(near)), 0.8)
+        self.assertLess(estimate_similarity(sig, minhash_signature(far)), 0.1)
+
+    def test_identical_sets_share_all_buckets(self):
+        sig = minhash_signature(["fastapi", "노트", "검색"])
+        self.assertEqual(lsh_band_hashes(sig), lsh_band_hashes(minhash_signature(["검색", "노트", "fastapi"])))
+        self.assertEqual(len(lsh_band_hashes(sig)), NUM_BANDS)
+
+    def test_bytes_roundtrip_and_empty(self):
+        sig = minhash_signature(["a", "b"])
+        self.assertEqual(signature_from_bytes(signature_to_bytes(sig)), sig)
+        self.assertEqual(len(minhash_signature([])), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
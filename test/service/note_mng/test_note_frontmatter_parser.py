@@ -0,0 +1,26 @@
+import unittest
+
+from app.service.note_mng.note_frontmatter_parser import parse_frontmatter
+
+
+class TestNoteFrontmatterParser(unittest.TestCase):
+
+    def test_tags_and_attrs(self):
+        content = "---\ntags: [Python, \"#DB\", python]\nowner: 김철수\nstatus: draft\ndue: 2024-01-02\n" \
+                  "reviewers: [a, b]\nnested: {x: 1}\n---\n# 본문\n"
+        frontmatter = parse_frontmatter(content)
+        self.assertEqual(frontmatter.tags, ["python", "db"])
+        self.assertEqual(frontmatter.attrs, {
+            "owner": ["김철수"], "status": ["draft"], "due": ["2024-01-02"], "reviewers": ["a", "b"],
+        })
+
+    def test_tag_string_is_split(self):
+        self.assertEqual(parse_frontmatter("---\ntags: a, b c\n---\n").tags, ["a", "b", "c"])
+
+    def test_missing_or_broken_frontmatter(self):
+        self.assertEqual(parse_frontmatter("본문\n---\nx: 1\n---\n"), ([], {}))
+        self.assertEqual(parse_frontmatter("---\n: [깨짐\n---\n"), ([], {}))
+
+
+if __name__ == '__main__':
+    unittest.main()
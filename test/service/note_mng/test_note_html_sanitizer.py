@@ -0,0 +1,32 @@
+import unittest
+
+from app.service.note_mng.note_html_cache import render_markdown
+from app.service.note_mng.note_html_sanitizer import sanitize_html
+
+
+class TestNoteHtmlSanitizer(unittest.TestCase):
+
+    def test_raw_html_in_note_is_escaped(self):
+        html = render_markdown("<script>alert(1)</script>\n\n<img src=x onerror=alert(1)>")
+        self.assertNotIn("<script", html)
+        self.assertNotIn("<img", html)
+        self.assertIn("&lt;script&gt;", html)
+
+    def test_unsafe_urls_and_attributes_are_dropped(self):
+        self.assertEqual(render_markdown("[x]( JaVa\tscript:alert(1))"), "<p><a>x</a></p>")
+        self.assertEqual(render_markdown('para\n{: onclick="alert(1)" }'), "<p>para</p>")
+        self.assertEqual(sanitize_html('<a href="https://a.b/?q=1&amp;r=2" onclick="x">ok</a>'),
+                         '<a href="https://a.b/?q=1&amp;r=2">ok</a>')
+
+    def test_markdown_features_survive(self):
+        html = render_markdown("# 제목\n\n| a |\n|:-|\n| 1 |\n\n```python\nx<1\n```")
+        self.assertIn('<h1 id="_1">제목</h1>', html)
+        self.assertIn('<th style="text-align: left;">a</th>', html)
+        self.assertIn('<code class="language-python">x&lt;1', html)
+
+    def test_dropped_tags_lose_their_content(self):
+        self.assertEqual(sanitize_html("<p>a<style>p{}</style><iframe src=x>b</iframe>c</p>"), "<p>ac</p>")
+
+
+if __name__ == '__main__':
+    unittest.main()
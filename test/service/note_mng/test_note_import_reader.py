@@ -0,0 +1,66 @@
+import io
+import tarfile
+import unittest
+import zipfile
+
+from pydantic import ValidationError
+
+from app.exception.NoteServiceException import NoteImportLimitError
+from app.service.note_mng.note_import_reader import read_notes_from_archive, IMPORT_MAX_FILES
+from app.spec.endpoint.note_import_request_ivo import NoteImportRequest
+
+
+def _zip(files: dict) -> io.BytesIO:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as zf:
+        for name, data in files.items():
+            zf.writestr(name, data)
+    buffer.seek(0)
+    return buffer
+
+
+def _tar(files: dict) -> io.BytesIO:
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w:gz") as tf:
+        for name, data in files.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            tf.addfile(info, io.BytesIO(data))
+    buffer.seek(0)
+    return buffer
+
+
+class TestNoteImportReader(unittest.TestCase):
+
+    def test_reads_only_visible_md_members(self):
+        files = {"team/회의록.md": "본문".encode("utf-8"), "a.txt": b"x", ".git/x.md": b"x", "__MACOSX/b.md": b"x"}
+        for archive, filename in ((_zip(files), "notes.zip"), (_tar(files), "notes.tar.gz")):
+            self.assertEqual(read_notes_from_archive(archive, filename), [("team/회의록.md", "본문".encode("utf-8"))])
+
+    def test_file_count_limit(self):
+        files = {f"{i}.md": b"x" for i in range(4)}
+        for archive, filename in ((_zip(files), "notes.zip"), (_tar(files), "notes.tar.gz")):
+            with self.assertRaises(NoteImportLimitError):
+                read_notes_from_archive(archive, filename, max_files=3)
+            archive.seek(0)
+            self.assertEqual(len(read_notes_from_archive(archive, filename, max_files=4)), 4)
+
+    def test_total_bytes_limit(self):
+        # 압축률이 높은 본문: 아카이브는 작아도 풀린 크기로 한도를 센다.
+        files = {"a.md": b"a" * 600, "b.md": b"b" * 600}
+        for archive, filename in ((_zip(files), "notes.zip"), (_tar(files), "notes.tar.gz")):
+            with self.assertRaises(NoteImportLimitError):
+                read_notes_from_archive(archive, filename, max_total_bytes=1000)
+            archive.seek(0)
+            self.assertEqual(len(read_notes_from_archive(archive, filename, max_total_bytes=1200)), 2)
+
+    def test_json_request_file_count_limit(self):
+        # JSON 가져오기도 아카이브와 같은 파일 수 상한을 쓴다 (경로/제목 IN 조회 크기 제한)
+        notes = [{"file_path": f"{i}.md", "content": "x"} for i in range(IMPORT_MAX_FILES + 1)]
+        with self.assertRaises(ValidationError):
+            NoteImportRequest(user_name="u", notes=notes)
+        self.assertEqual(len(NoteImportRequest(user_name="u", notes=notes[:-1]).notes), IMPORT_MAX_FILES)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,30 @@
+import unittest
+
+from app.service.note_mng.note_link_extractor import extract_links, LINK_TYPE_WIKI, LINK_TYPE_MARKDOWN
+
+
+class TestNoteLinkExtractor(unittest.TestCase):
+
+    def test_wiki_and_markdown_links(self):
+        content = "[[회의록]] 참고, [[회의록|별칭]] 중복, [[설계#개요|설계 문서]]\n" \
+                  "[상대](../공통/용어.md#정의) [절대](/루트.md) [공백](<새 노트.md>)"
+        links = extract_links(content, "팀/주간/노트.md")
+        self.assertEqual(
+            [(l.link_type, l.target_key) for l in links],
+            [
+                (LINK_TYPE_WIKI, "회의록"),
+                (LINK_TYPE_WIKI, "설계"),
+                (LINK_TYPE_MARKDOWN, "팀/공통/용어.md"),
+                (LINK_TYPE_MARKDOWN, "루트.md"),
+                (LINK_TYPE_MARKDOWN, "팀/주간/새 노트.md"),
+            ],
+        )
+        self.assertEqual(links[1].link_text, "설계 문서")
+
+    def test_ignores_code_urls_images_and_escapes(self):
+        content = "```\n[[코드]]\n```\n`[[인라인]]` ![그림](a.md) [웹](https://x.com/a.md) [첨부](a.png) [밖](../../a.md)"
+        self.assertEqual(extract_links(content, "a/b.md"), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,11 +2,11 @@ import unittest
 from datetime import datetime
 from unittest.mock import AsyncMock, MagicMock, patch
 
-from app.main import git_service
-from app.service.note_mng.note_mng_biz_service import NoteService
+from app.service.note_mng.note_mng_biz_service import NoteService, compute_content_digest
 from app.exception.NoteServiceException import NoteConflictError
 from app.spec.biz.NoteConflictDetail import NoteConflictDetail
 from app.database.note_mng.model.note_model import NoteMetadata
+from app.spec.endpoint.note_import_request_ivo import NoteImportItem
 
 
 class TestNoteConflict(unittest.IsolatedAsyncioTestCase):
@@ -34,9 +34,9 @@ class TestNoteConflict(unittest.IsolatedAsyncioTestCase):
 
         # 2. DB 조회 결과 모킹
         mock_note = NoteMetadata(title=title, last_commit_hash=server_hash, file_path=f"{title}.md",
-                                 updated_at=datetime.now(), last_modified_by="Others")
+                                 mdfy_dt=datetime.now(), last_modified_by="Others")
 
-        service._get_note_by_title_first = AsyncMock(return_value=mock_note)
+        service._get_note_by_path = AsyncMock(return_value=mock_note)
 
         # 3. 내부 git_service의 메소드 결과 설정
         mock_git_instance.read_file_content.return_value = server_content
@@ -45,6 +45,7 @@ class TestNoteConflict(unittest.IsolatedAsyncioTestCase):
         with self.assertRaises(NoteConflictError) as context:
             await service.save_or_update_note(
                 title=title,
+                file_path=f"{title}.md",
                 content="My update",
                 user_name="davidKim",
                 last_hash=client_hash
@@ -67,15 +68,20 @@ class TestNoteConflict(unittest.IsolatedAsyncioTestCase):
 
         # 2. DB 조회 결과 모킹
         mock_note = NoteMetadata(title="Test", last_commit_hash=matching_hash, file_path="Test.md",
-                                 updated_at=datetime.now(), last_modified_by="Others")
+                                 mdfy_dt=datetime.now(), last_modified_by="Others")
 
-        service._get_note_by_title_first = AsyncMock(return_value=mock_note)
+        service._get_note_by_path = AsyncMock(return_value=mock_note)
+        # 저장 흐름만 검증: 링크/태그/유사도/작업 큐 갱신은 DB 가 필요하므로 모킹 (작업 큐는 test/service/job_queue 에서 확인)
+        for name in ("link_service", "frontmatter_service", "similarity_service", "job_queue"):
+            setattr(service, name, AsyncMock())
+        service._publish_changes = MagicMock()
 
         # 정상 커밋 시나리오 모킹
         mock_git_instance.write_and_commit.return_value = "new_hash_789"
 
         result = await service.save_or_update_note(
             title="Test",
+            file_path="Test.md",
             content="Content",
             user_name="user",
             last_hash=matching_hash
@@ -86,6 +92,78 @@ class TestNoteConflict(unittest.IsolatedAsyncioTestCase):
         mock_git_instance.write_and_commit.assert_called_once()
         print("✅ 정상 저장 케이스 테스트 성공")
 
+    @patch("app.service.note_mng.note_mng_biz_service.GitService")
+    async def test_save_note_skipped_when_content_unchanged(self, MockGitClass):
+        """본문 다이제스트가 같으면 커밋 없이 기존 해시를 반환하는지 확인"""
+        mock_git_instance = MockGitClass.return_value
+        service = NoteService(db=self.mock_db)
+
+        content = "같은 내용"
+        mock_note = NoteMetadata(title="Test", last_commit_hash="same_123", file_path="Test.md",
+                                 content_hash=compute_content_digest(content),
+                                 mdfy_dt=datetime.now(), last_modified_by="Others")
+        service._get_note_by_path = AsyncMock(return_value=mock_note)
+
+        result = await service.save_or_update_note(
+            title="Test",
+            file_path="Test.md",
+            content=content,
+            user_name="user",
+            last_hash="same_123"
+        )
+
+        self.assertEqual(result["action"], "unchanged")
+        self.assertEqual(result["commit_hash"], "same_123")
+        mock_git_instance.write_and_commit.assert_not_called()
+        self.mock_db.commit.assert_not_called()
+        print("✅ 변경 없는 저장 생략 테스트 성공")
+
+
+
+class TestNoteImport(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.mock_db = AsyncMock()
+        self.mock_db.add_all = MagicMock()
+        # 기존 메타데이터 조회 결과: 없음
+        self.mock_db.execute.return_value = MagicMock()
+        self.mock_db.execute.return_value.scalars.return_value.all.return_value = []
+
+    @patch("app.service.note_mng.note_mng_biz_service.GitService")
+    async def test_import_rejects_bad_paths_and_duplicates(self, MockGitClass):
+        mock_git_instance = MockGitClass.return_value
+        service = NoteService(db=self.mock_db)
+        for name in ("link_service", "frontmatter_service", "job_queue"):
+            setattr(service, name, AsyncMock())
+        service._publish_changes = MagicMock()
+        mock_git_instance.write_many_and_commit_by_path.return_value = {"team/a.md": "hash_1"}
+
+        results = await service.import_notes([
+            NoteImportItem(file_path="team/a.md", content="A"),
+            NoteImportItem(file_path="../escape.md", content="X"),
+            NoteImportItem(file_path="other/a.md", content="dup title"),
+        ], "user")
+
+        self.assertEqual([r["status"] for r in results], ["created", "failed", "failed"])
+        mock_git_instance.write_many_and_commit_by_path.assert_called_once()
+        self.assertEqual(mock_git_instance.write_many_and_commit_by_path.call_args.args[0], [("team/a.md", "A")])
+
+    @patch("app.service.note_mng.note_mng_biz_service.GitService")
+    async def test_import_commit_failure_marks_notes_failed(self, MockGitClass):
+        mock_git_instance = MockGitClass.return_value
+        service = NoteService(db=self.mock_db)
+        service.job_queue = AsyncMock()
+        mock_git_instance.write_many_and_commit_by_path.side_effect = OSError("disk full")
+
+        results = await service.import_notes([NoteImportItem(file_path="a.md", content="A"),
+                                              NoteImportItem(file_path="b.md", content="B")], "user")
+
+        self.assertEqual([r["status"] for r in results], ["failed", "failed"])
+        self.assertIn("disk full", results[0]["error"])
+        self.mock_db.add_all.assert_not_called()
+        self.mock_db.commit.assert_not_called()
+        service.job_queue.enqueue_post_commit.assert_not_called()
+
 
 if __name__ == '__main__':
     unittest.main()
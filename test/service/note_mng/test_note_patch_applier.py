@@ -0,0 +1,62 @@
+import difflib
+import unittest
+
+from app.exception.NoteServiceException import NotePatchError
+from app.service.note_mng.note_patch_applier import apply_unified_diff, apply_ops
+from app.spec.endpoint.note_service_file_response_ivo import NotePatchOp
+
+
+def _make_diff(base: str, new: str) -> str:
+    return "".join(difflib.unified_diff(
+        base.splitlines(keepends=True), new.splitlines(keepends=True), "a/note.md", "b/note.md"
+    ))
+
+
+class TestNotePatchApplier(unittest.TestCase):
+
+    def test_unified_diff_roundtrip(self):
+        """difflib 으로 만든 diff 를 적용하면 수정본과 같아야 한다"""
+        base = "# 회의록\n\n- 안건 1\n- 안건 2\n- 안건 3\n\n결론: 미정\n"
+        new = "# 회의록\n\n- 안건 1\n- 안건 2 (수정)\n- 안건 3\n\n결론: 다음 주 재논의\n추가 메모\n"
+        self.assertEqual(apply_unified_diff(base, _make_diff(base, new)), new)
+
+    def test_unified_diff_no_newline_at_eof(self):
+        base = "첫 줄\n둘째 줄"
+        new = "첫 줄\n둘째 줄 변경"
+        diff = "--- a/note.md\n+++ b/note.md\n@@ -1,2 +1,2 @@\n 첫 줄\n-둘째 줄\n\\ No newline at end of file\n" \
+               "+둘째 줄 변경\n\\ No newline at end of file\n"
+        self.assertEqual(apply_unified_diff(base, diff), new)
+
+    def test_unified_diff_context_mismatch_raises(self):
+        base = "a\nb\nc\n"
+        diff = _make_diff("a\nX\nc\n", "a\nY\nc\n")
+        with self.assertRaises(NotePatchError):
+            apply_unified_diff(base, diff)
+
+    def test_unified_diff_multiple_files_raises(self):
+        """두 번째 파일의 hunk 가 우연히 기준 본문에 맞더라도 적용하지 않는다"""
+        base = "a\nb\nc\nd\n"
+        diff = "--- a/note.md\n+++ b/note.md\n@@ -1 +1 @@\n-a\n+A\n" \
+               "diff --git a/other.md b/other.md\n--- a/other.md\n+++ b/other.md\n@@ -4 +4 @@\n-d\n+D\n"
+        with self.assertRaises(NotePatchError):
+            apply_unified_diff(base, diff)
+
+    def test_unified_diff_removed_line_like_file_header(self):
+        """본문의 '-- 서명' 줄을 지우면 diff 에는 '--- 서명' 으로 나오지만 파일 헤더가 아니다"""
+        base = "본문\n-- 서명\n"
+        new = "본문\n"
+        self.assertEqual(apply_unified_diff(base, _make_diff(base, new)), new)
+
+    def test_ops(self):
+        base = "오늘 점심은 김치찌개입니다."
+        ops = [NotePatchOp(offset=7, delete_count=2, insert_text="된장"), NotePatchOp(offset=0, insert_text="[메모] ")]
+        self.assertEqual(apply_ops(base, ops), "[메모] 오늘 점심은 된장찌개입니다.")
+
+    def test_ops_overlap_raises(self):
+        ops = [NotePatchOp(offset=0, delete_count=3), NotePatchOp(offset=2, insert_text="x")]
+        with self.assertRaises(NotePatchError):
+            apply_ops("abcdef", ops)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,43 @@
+import hashlib
+import tempfile
+import unittest
+from pathlib import Path
+
+from app.exception.NoteServiceException import NoteRangeNotSatisfiableError
+from app.service.note_mng.note_raw_content import parse_byte_range, NoteRawContent
+
+
+class TestNoteRawContent(unittest.TestCase):
+
+    def test_parse_byte_range(self):
+        self.assertEqual(parse_byte_range("bytes=0-99", 1000), (0, 99))
+        self.assertEqual(parse_byte_range("bytes=900-", 1000), (900, 999))
+        self.assertEqual(parse_byte_range("bytes=-100", 1000), (900, 999))
+        self.assertEqual(parse_byte_range("bytes=-5000", 1000), (0, 999))
+        self.assertEqual(parse_byte_range("bytes=500-5000", 1000), (500, 999))
+
+    def test_ignored_ranges_mean_full_response(self):
+        for header in (None, "", "bytes=0-1,5-6", "items=0-1", "bytes=-", "bytes=10-5"):
+            self.assertIsNone(parse_byte_range(header, 1000), header)
+
+    def test_unsatisfiable(self):
+        for header, size in (("bytes=1000-", 1000), ("bytes=-0", 1000), ("bytes=0-", 0)):
+            with self.assertRaises(NoteRangeNotSatisfiableError):
+                parse_byte_range(header, size)
+
+
+class TestNoteRawContentEtag(unittest.IsolatedAsyncioTestCase):
+
+    async def test_strong_etag_only_when_file_matches_db_digest(self):
+        path = Path(tempfile.mkdtemp()) / "a.md"
+        path.write_bytes("본문".encode("utf-8"))
+        digest = hashlib.sha256("본문".encode("utf-8")).hexdigest()
+
+        for content_hash, strong in ((digest, True), ("stale", False), (None, False)):
+            raw = await NoteRawContent.open(path, "abc123", content_hash)
+            self.assertEqual(raw.etag == '"abc123"', strong)
+            self.assertEqual(b"".join([chunk async for chunk in raw.iter_bytes()]), "본문".encode("utf-8"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,43 @@
+import unittest
+
+from app.service.note_mng.note_revision_diff import compute_diff, RevisionDiffCache
+
+
+class TestNoteRevisionDiff(unittest.TestCase):
+
+    def test_line_hunks(self):
+        old = "".join(f"줄 {i}\n" for i in range(20))
+        new = old.replace("줄 10\n", "바뀐 줄\n")
+        diff = compute_diff(old, new, "line")
+        self.assertEqual((diff["added_lines"], diff["removed_lines"]), (1, 1))
+        self.assertEqual(len(diff["hunks"]), 1)
+        hunk = diff["hunks"][0]
+        self.assertEqual((hunk["old_start"], hunk["old_count"], hunk["new_start"], hunk["new_count"]), (8, 7, 8, 7))
+        self.assertIn({"op": "delete", "text": "줄 10\n"}, hunk["changes"])
+        self.assertIn({"op": "insert", "text": "바뀐 줄\n"}, hunk["changes"])
+
+    def test_word_mode_splits_changed_lines(self):
+        diff = compute_diff("예산을 삭감하기로 했다.\n", "예산은 삭감하기로 했다.\n", "word")
+        change = diff["hunks"][0]["changes"][0]
+        self.assertEqual(change["op"], "replace")
+        self.assertEqual(change["segments"], [
+            {"op": "delete", "text": "예산을"},
+            {"op": "insert", "text": "예산은"},
+            {"op": "equal", "text": " 삭감하기로 했다.\n"},
+        ])
+
+    def test_identical_has_no_hunks(self):
+        self.assertEqual(compute_diff("a\n", "a\n")["hunks"], [])
+
+    def test_cache_evicts_least_recently_used(self):
+        cache = RevisionDiffCache(max_items=2)
+        for name in ("a", "b"):
+            cache.put((name, "x", "p.md", "line"), {"name": name}, 10)
+        cache.get(("a", "x", "p.md", "line"))
+        cache.put(("c", "x", "p.md", "line"), {"name": "c"}, 10)
+        self.assertIsNone(cache.get(("b", "x", "p.md", "line")))
+        self.assertEqual(cache.get(("a", "x", "p.md", "line")), {"name": "a"})
+
+
+if __name__ == '__main__':
+    unittest.main()
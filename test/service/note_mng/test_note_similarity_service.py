@@ -0,0 +1,59 @@
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+
+from app.database.default_model_mixin import Base
+from app.database.note_mng.model.note_model import NoteMetadata
+from app.database.note_mng.model.note_similarity_model import NoteMinHash, NoteLshBand
+from app.service.lang_analyzer.minhash import minhash_signature, lsh_band_hashes, signature_to_bytes
+from app.service.note_mng.note_similarity_service import NoteSimilarityService
+
+
+class TestDuplicateReport(unittest.IsolatedAsyncioTestCase):
+    """ 임시 SQLite 에 시그니처/버킷을 직접 넣고 중복 리포트의 후보 쌍 범위를 확인 """
+
+    async def asyncSetUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.engine = create_async_engine(f"sqlite+aiosqlite:///{Path(self.tmp_dir) / 'similarity.db'}")
+        async with self.engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all, tables=[
+                NoteMetadata.__table__, NoteMinHash.__table__, NoteLshBand.__table__])
+        self.Session = async_sessionmaker(bind=self.engine, class_=AsyncSession, expire_on_commit=False)
+
+        # pair-a/pair-b: 서로만 같은 본문, template-*: 네 노트가 같은 본문 (모든 버킷을 넷이 공유)
+        contents = {"pair-a": "pair", "pair-b": "pair", **{f"template-{i}": "template" for i in range(4)}}
+        async with self.Session() as session:
+            for note_id, content in contents.items():
+                signature = minhash_signature({f"{content}-{i}" for i in range(50)})
+                session.add(NoteMetadata(id=note_id, title=note_id, file_path=f"{note_id}.md",
+                                         last_modified_by="tester"))
+                session.add(NoteMinHash(note_id=note_id, signature=signature_to_bytes(signature), token_count=50))
+                session.add_all(NoteLshBand(note_id=note_id, band_no=band_no, band_hash=band_hash)
+                                for band_no, band_hash in enumerate(lsh_band_hashes(signature)))
+            await session.commit()
+
+    async def asyncTearDown(self):
+        await self.engine.dispose()
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    async def _report_pairs(self):
+        async with self.Session() as session:
+            report = await NoteSimilarityService(session).duplicate_report(threshold=0.8)
+        return sorted((item["a"]["id"], item["b"]["id"]) for item in report)
+
+    async def test_reports_pairs_from_small_buckets(self):
+        pairs = await self._report_pairs()
+        self.assertIn(("pair-a", "pair-b"), pairs)
+        self.assertEqual(len(pairs), 1 + 6)  # pair 1 쌍 + template 4C2
+
+    @patch("app.service.note_mng.note_similarity_service.SIMILARITY_MAX_BUCKET", 3)
+    async def test_skips_oversized_buckets(self):
+        self.assertEqual(await self._report_pairs(), [("pair-a", "pair-b")])
+
+
+if __name__ == "__main__":
+    unittest.main()
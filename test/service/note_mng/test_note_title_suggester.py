@@ -0,0 +1,34 @@
+import unittest
+
+from app.service.note_mng.note_title_suggester import NoteTitleSuggester
+
+
+class TestNoteTitleSuggester(unittest.TestCase):
+
+    def setUp(self):
+        self.suggester = NoteTitleSuggester()
+        self.suggester.rebuild([
+            ("1", "주간 회의록", "팀/회의/주간 회의록.md"),
+            ("2", "하나은행 API", "bank/하나은행 API.md"),
+            ("3", "한국어 형태소 분석", "nlp/한국어.md"),
+        ])
+
+    def _titles(self, query):
+        return [item["title"] for item in self.suggester.suggest(query)]
+
+    def test_prefix_word_path_and_substring(self):
+        self.assertEqual(self._titles("하ㄴ"), ["하나은행 API", "한국어 형태소 분석"])
+        self.assertEqual(self._titles("회ㅇ"), ["주간 회의록"])
+        self.assertEqual(self._titles("nlp"), ["한국어 형태소 분석"])
+        self.assertEqual(self._titles("의록"), ["주간 회의록"])
+
+    def test_upsert_and_remove(self):
+        self.suggester.upsert("3", "한강 산책", "x/한강.md")
+        self.assertEqual(self._titles("형태"), [])
+        self.assertEqual(self._titles("한ㄱ"), ["한강 산책"])
+        self.suggester.remove("2")
+        self.assertEqual(self._titles("하"), ["한강 산책"])
+
+
+if __name__ == '__main__':
+    unittest.main()
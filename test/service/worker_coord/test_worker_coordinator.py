@@ -0,0 +1,88 @@
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+
+from app.service.worker_coord.worker_coordinator import WorkerCoordinator
+
+
+class TestWorkerCoordinator(unittest.TestCase):
+    """ 같은 run 디렉토리를 쓰는 두 조율자 = 두 워커 프로세스 (파일 락은 fd 단위라 한 프로세스 안에서도 서로 배타적) """
+
+    def setUp(self):
+        self.run_dir = Path(tempfile.mkdtemp())
+        self.first = WorkerCoordinator(self.run_dir)
+        self.second = WorkerCoordinator(self.run_dir)
+
+    def tearDown(self):
+        self.first.release()
+        self.second.release()
+        shutil.rmtree(self.run_dir, ignore_errors=True)
+
+    def test_only_one_leader(self):
+        self.assertTrue(self.first.try_acquire_leadership())
+        self.assertFalse(self.second.try_acquire_leadership())
+        self.assertTrue(self.first.is_leader)
+        self.assertFalse(self.second.is_leader)
+        # 리더가 내려가면(프로세스 종료와 같음) 다른 워커가 승계
+        self.first.release()
+        self.assertTrue(self.second.try_acquire_leadership())
+        self.assertFalse(self.first.try_acquire_leadership())
+
+    def test_repo_write_lock_serializes_workers(self):
+        active, overlaps = [], []
+
+        def write(coordinator):
+            for _ in range(5):
+                with coordinator.repo_write_lock():
+                    active.append(1)
+                    if len(active) > 1:
+                        overlaps.append(1)
+                    time.sleep(0.005)
+                    active.pop()
+
+        threads = [threading.Thread(target=write, args=(coordinator,))
+                   for coordinator in (self.first, self.second, self.first, self.second)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(overlaps, [])
+
+    def test_repo_write_lock_is_per_repository(self):
+        # 다른 샤드의 락은 기다리지 않는다
+        entered = threading.Event()
+
+        def other_shard():
+            with self.second.repo_write_lock("git-write-shard1"):
+                entered.set()
+
+        with self.first.repo_write_lock("git-write-shard0"):
+            thread = threading.Thread(target=other_shard)
+            thread.start()
+            self.assertTrue(entered.wait(timeout=2))
+        thread.join()
+
+    def test_index_spool_round_trip(self):
+        jobs = [{"title": f"note-{i}", "op": "update"} for i in range(5)]
+        for job in jobs:
+            self.second.enqueue_index_job(job)
+        # 깨진 큐 파일과 쓰는 중인 임시 파일은 건너뜀
+        (self.first.queue_dir / "99999999999999999999-0-broken.json").write_text("{", encoding="UTF-8")
+        (self.first.queue_dir / ".tmp-in-progress.tmp").write_text("{}", encoding="UTF-8")
+        self.assertEqual(self.first.queue_depth(), 6)
+
+        first_batch = self.first.pending_index_jobs(limit=3)
+        self.assertEqual([job for _, job in first_batch], jobs[:3])
+        self.first.ack_index_jobs([path for path, _ in first_batch])
+
+        rest = self.first.pending_index_jobs()
+        self.assertEqual([job for _, job in rest], jobs[3:])
+        self.first.ack_index_jobs([path for path, _ in rest] + [path for path, _ in rest])  # 중복 ack 는 무시
+        self.assertEqual(self.first.queue_depth(), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()